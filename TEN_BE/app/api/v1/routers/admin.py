@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, Dict, List
+from app.core.security import get_admin_api_key
+from app.core.tracing import get_trace_buffer
+
+router = APIRouter(dependencies=[Depends(get_admin_api_key)])
+
+
+@router.get(
+    "/admin/traces",
+    status_code=status.HTTP_200_OK,
+    summary="List recent traces",
+    description="Returns summaries of the most recent traces held by this process, newest first. Use `min_duration_ms` to find slow requests."
+)
+async def list_traces_route(
+    limit: int = Query(50, ge=1, le=1000),
+    min_duration_ms: float = Query(0, ge=0)
+) -> List[Dict[str, Any]]:
+    return [trace.summary() for trace in get_trace_buffer().recent(limit, min_duration_ms)]
+
+
+@router.get(
+    "/admin/traces/{request_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Get a trace as a span tree",
+    description="Returns the span tree recorded for a request id (the X-Request-ID response header) or job id, if it is still in this process's trace buffer."
+)
+async def get_trace_route(request_id: str) -> Dict[str, Any]:
+    trace = get_trace_buffer().get(request_id)
+    if trace is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Trace '{request_id}' not found or evicted.")
+    return trace.to_tree()
@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from app.models.schemas import BuzzBuilderInput, BuzzBuilderOutput
 from app.services.buzz_builder import BuzzBuilderService
 from app.core.dependencies import get_buzz_builder_service
+from app.core.sse import sse_response
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -17,11 +22,29 @@ async def buzz_builder_route(
     builder_service: BuzzBuilderService = Depends(get_buzz_builder_service)
 ):
     try:
-        result = await builder_service.generate_buzz(input_data)
+        result = await builder_service.generate_buzz(input_data, raw_response=True)
         return result
     except Exception as e:
-        print(f"Error in buzz_builder_route: {e}")
+        logger.error("Error in buzz_builder_route: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during buzz generation: {e}"
-        )
\ No newline at end of file
+        )
+
+@router.post(
+    "/buzz-builder/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Stream content ideas as they are generated",
+    description="Same as /buzz-builder, delivered as Server-Sent Events: a `suggestion` event for each content suggestion as soon as the AI has finished writing it, then `result` with the full output, then `done`. Failures are reported as an `error` event."
+)
+async def buzz_builder_stream_route(
+    input_data: BuzzBuilderInput,
+    builder_service: BuzzBuilderService = Depends(get_buzz_builder_service)
+):
+    return sse_response(
+        builder_service.stream_buzz(input_data),
+        route_name="buzz_builder_stream_route",
+        error_message="An error occurred during buzz generation",
+        done_data={"startup_name": input_data.startup_name}
+    )
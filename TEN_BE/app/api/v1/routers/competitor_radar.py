@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from app.models.schemas import CompetitorRadarInput, CompetitorRadarOutput
 from app.services.competitor_radar import CompetitorRadarService
 from app.core.dependencies import get_competitor_radar_service
+from app.core.sse import sse_response
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -17,11 +22,29 @@ async def competitor_radar_route(
     radar_service: CompetitorRadarService = Depends(get_competitor_radar_service)
 ):
     try:
-        result = await radar_service.track_competitors(input_data)
+        result = await radar_service.track_competitors(input_data, raw_response=True)
         return result
     except Exception as e:
-        print(f"Error in competitor_radar_route: {e}")
+        logger.error("Error in competitor_radar_route: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during competitor tracking: {e}"
-        )
\ No newline at end of file
+        )
+
+@router.post(
+    "/competitor-radar/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Stream competitor tracking results as they complete",
+    description="Same analysis as /competitor-radar, delivered as Server-Sent Events: one `competitor` event per tracked competitor as soon as it is ready, then `market_trends`, then `done`. Failures are reported as an `error` event."
+)
+async def competitor_radar_stream_route(
+    input_data: CompetitorRadarInput,
+    radar_service: CompetitorRadarService = Depends(get_competitor_radar_service)
+):
+    return sse_response(
+        radar_service.stream_competitors(input_data),
+        route_name="competitor_radar_stream_route",
+        error_message="An error occurred during competitor tracking",
+        done_data={"startup_name": input_data.startup_name}
+    )
@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from app.models.schemas import ExitStrategyExplorerInput, ExitStrategyExplorerOutput
 from app.services.exit_strategy_explorer import ExitStrategyExplorerService
 from app.core.dependencies import get_exit_strategy_explorer_service
+from app.core.sse import sse_response
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -17,11 +22,29 @@ async def exit_strategy_explorer_route(
     explorer_service: ExitStrategyExplorerService = Depends(get_exit_strategy_explorer_service)
 ):
     try:
-        result = await explorer_service.explore_exit_strategies(input_data)
+        result = await explorer_service.explore_exit_strategies(input_data, raw_response=True)
         return result
     except Exception as e:
-        print(f"Error in exit_strategy_explorer_route: {e}")
+        logger.error("Error in exit_strategy_explorer_route: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during exit strategy exploration: {e}"
-        )
\ No newline at end of file
+        )
+
+@router.post(
+    "/exit-strategy-explorer/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Stream exit strategies as they are generated",
+    description="Same as /exit-strategy-explorer, delivered as Server-Sent Events: an `exit_strategy` event for each strategy as soon as it is complete, then `result` with the full output, then `done`. Failures are reported as an `error` event."
+)
+async def exit_strategy_explorer_stream_route(
+    input_data: ExitStrategyExplorerInput,
+    explorer_service: ExitStrategyExplorerService = Depends(get_exit_strategy_explorer_service)
+):
+    return sse_response(
+        explorer_service.stream_exit_strategies(input_data),
+        route_name="exit_strategy_explorer_stream_route",
+        error_message="An error occurred during exit strategy exploration",
+        done_data={"startup_name": input_data.startup_name}
+    )
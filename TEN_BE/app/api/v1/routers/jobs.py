@@ -0,0 +1,124 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from typing import Any, Dict
+import json
+from app.models.schemas import JobSubmitResponse, JobStatusResponse
+from app.core.dependencies import get_job_queue_dependency
+from app.core.jobs import JobQueue, JOB_QUEUED, JOB_SUCCEEDED, TERMINAL_JOB_STATUSES
+from app.core.config import settings
+from app.core.sse import format_sse, SSE_HEADERS
+from app.services.job_registry import JOB_TYPES
+
+router = APIRouter()
+
+# Comment line sent while waiting so proxies do not close an idle event stream.
+_KEEPALIVE_INTERVAL_SECONDS = 15.0
+
+
+def _to_status_response(job: Dict[str, str]) -> JobStatusResponse:
+    return JobStatusResponse(
+        job_id=job["job_id"],
+        job_type=job["job_type"],
+        status=job["status"],
+        attempts=int(job.get("attempts", 0)),
+        created_at=float(job["created_at"]),
+        updated_at=float(job["updated_at"]),
+        result=json.loads(job["result"]) if job.get("result") else None,
+        error=job.get("error"),
+    )
+
+
+@router.post(
+    "/jobs/{job_type}",
+    response_model=JobSubmitResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit an analysis as a background job",
+    description=f"Queues any analysis for a worker and returns a job id immediately. The body is the same input as the synchronous endpoint. Job types: {', '.join(JOB_TYPES)}."
+)
+async def submit_job_route(
+    job_type: str,
+    request: Request,
+    payload: Dict[str, Any] = Body(...),
+    job_queue: JobQueue = Depends(get_job_queue_dependency)
+):
+    definition = JOB_TYPES.get(job_type)
+    if definition is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown job type '{job_type}'. Expected one of: {', '.join(JOB_TYPES)}."
+        )
+
+    try:
+        input_data = definition.input_model.model_validate(payload)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+    job_id = await job_queue.submit(job_type, input_data.json())
+    return JobSubmitResponse(
+        job_id=job_id,
+        job_type=job_type,
+        status=JOB_QUEUED,
+        status_url=str(request.url_for("get_job_route", job_id=job_id)),
+        events_url=str(request.url_for("job_events_route", job_id=job_id)),
+    )
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatusResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get job status and result",
+    description="Returns the job status; once it has succeeded, `result` holds the analysis output."
+)
+async def get_job_route(
+    job_id: str,
+    job_queue: JobQueue = Depends(get_job_queue_dependency)
+):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' not found or expired.")
+    return _to_status_response(job)
+
+
+@router.get(
+    "/jobs/{job_id}/events",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Wait for a job over Server-Sent Events",
+    description="Emits a `status` event, then `result` (or `error`) when the job finishes. Emits `timeout` if it is still running after JOB_EVENTS_TIMEOUT_SECONDS."
+)
+async def job_events_route(
+    job_id: str,
+    job_queue: JobQueue = Depends(get_job_queue_dependency)
+):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' not found or expired.")
+
+    async def event_stream():
+        current = job
+        yield format_sse("status", {"job_id": job_id, "status": current["status"]})
+        remaining = settings.JOB_EVENTS_TIMEOUT_SECONDS
+        while current is not None and current["status"] not in TERMINAL_JOB_STATUSES and remaining > 0:
+            wait_seconds = min(_KEEPALIVE_INTERVAL_SECONDS, remaining)
+            current = await job_queue.wait_for_completion(job_id, wait_seconds)
+            remaining -= wait_seconds
+            if current is not None and current["status"] not in TERMINAL_JOB_STATUSES:
+                yield ": keep-alive\n\n"
+
+        if current is None:
+            yield format_sse("error", {"job_id": job_id, "detail": "Job expired."})
+        elif current["status"] == JOB_SUCCEEDED:
+            yield format_sse("result", _to_status_response(current))
+        elif current["status"] in TERMINAL_JOB_STATUSES:
+            yield format_sse("error", {"job_id": job_id, "detail": current.get("error")})
+        else:
+            yield format_sse("timeout", {"job_id": job_id, "status": current["status"]})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
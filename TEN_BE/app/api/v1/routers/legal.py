@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from app.models.schemas import LegalAssistanceInput, LegalAssistanceOutput
 from app.services.legal_advisor import LegalAdvisorService
 from app.core.dependencies import get_legal_advisor_service
+from app.core.sse import sse_response
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -17,11 +22,29 @@ async def get_legal_assistance_route(
     legal_advisor_service: LegalAdvisorService = Depends(get_legal_advisor_service)
 ):
     try:
-        result = await legal_advisor_service.get_legal_assistance(input_data)
+        result = await legal_advisor_service.get_legal_assistance(input_data, raw_response=True)
         return result
     except Exception as e:
-        print(f"Error in get_legal_assistance_route: {e}")
+        logger.error("Error in get_legal_assistance_route: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during legal assistance generation: {e}"
-        )
\ No newline at end of file
+        )
+
+@router.post(
+    "/legal-assistance/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Stream legal guidance as it is generated",
+    description="Same as /legal-assistance, delivered as Server-Sent Events: `legal_document`, `license_certification` and `legal_risk` events as soon as each entry is complete, then `result` with the full output, then `done`. Failures are reported as an `error` event."
+)
+async def get_legal_assistance_stream_route(
+    input_data: LegalAssistanceInput,
+    legal_advisor_service: LegalAdvisorService = Depends(get_legal_advisor_service)
+):
+    return sse_response(
+        legal_advisor_service.stream_legal_assistance(input_data),
+        route_name="get_legal_assistance_stream_route",
+        error_message="An error occurred during legal assistance generation",
+        done_data={"startup_name": input_data.startup_name}
+    )
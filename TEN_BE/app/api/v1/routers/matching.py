@@ -6,6 +6,9 @@ from app.models.schemas import (
 from app.services.investor_matcher import InvestorMatcherService
 from app.services.pitch_feedback_generator import PitchFeedbackGeneratorService
 from app.core.dependencies import get_investor_matcher_service, get_pitch_feedback_generator_service
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -37,10 +40,10 @@ async def match_investors_route(
         - `gaps`: (array of strings) Areas of misalignment.
     """
     try:
-        result = await matcher_service.match_investors(input_data)
+        result = await matcher_service.match_investors(input_data, raw_response=True)
         return result
     except Exception as e:
-        print(f"Error in match_investors_route: {e}")
+        logger.error("Error in match_investors_route: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during investor matching: {e}"
@@ -71,10 +74,10 @@ async def get_pitch_feedback_route(
     - `suggestions_for_improvement`: (array of strings) Concrete actionable steps.
     """
     try:
-        result = await feedback_service.generate_feedback(request)
+        result = await feedback_service.generate_feedback(request, raw_response=True)
         return result
     except Exception as e:
-        print(f"Error in get_pitch_feedback_route: {e}")
+        logger.error("Error in get_pitch_feedback_route: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during pitch feedback generation: {e}"
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from app.models.schemas import NavigatorInput, NavigatorOutput
+from app.services.navigator import NavigatorService
+from app.core.dependencies import get_navigator_service
+from app.core.sse import sse_response
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.post(
+    "/navigator",
+    response_model=NavigatorOutput,
+    status_code=status.HTTP_200_OK,
+    summary="Run the full risk, reputation, investor matching and pitch feedback workflow",
+    description="Runs /analyze-risk and /scan-reputation concurrently, then /match-investors with both results, then /pitch-feedback with all three, and returns every stage's output. Stage results are shared with the individual endpoints' caches."
+)
+async def navigator_route(
+    input_data: NavigatorInput,
+    navigator_service: NavigatorService = Depends(get_navigator_service)
+):
+    """
+    **Request Body (NavigatorInput):**
+    - `risk`: (object) The `RiskInput` startup profile.
+    - `pitch_text`: (string) The full pitch text, used for reputation analysis and pitch feedback.
+    - `founder_twitter_handle`: (string, optional)
+    - `funding_sought_usd`: (integer, optional) Defaults to `risk.initial_funding_needed_usd`.
+
+    **Response (NavigatorOutput):**
+    - `startup_name`: (string)
+    - `risk`, `reputation`, `investor_matches`, `pitch_feedback`: (objects) The stage outputs.
+    """
+    try:
+        result = await navigator_service.run_navigator(input_data, raw_response=True)
+        return result
+    except Exception as e:
+        logger.error("Error in navigator_route: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred during the navigator workflow: {e}"
+        )
+
+@router.post(
+    "/navigator/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Stream the navigator workflow stage by stage",
+    description="Same as /navigator, delivered as Server-Sent Events: `risk` and `reputation` as each finishes, then `investor_matches`, then `pitch_feedback`, then `result` with the combined output, then `done`. Failures are reported as an `error` event."
+)
+async def navigator_stream_route(
+    input_data: NavigatorInput,
+    navigator_service: NavigatorService = Depends(get_navigator_service)
+):
+    return sse_response(
+        navigator_service.stream_navigator(input_data),
+        route_name="navigator_stream_route",
+        error_message="An error occurred during the navigator workflow",
+        done_data={"startup_name": input_data.risk.startup_name}
+    )
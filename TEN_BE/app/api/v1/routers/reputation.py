@@ -2,6 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from app.models.schemas import ReputationInput, ReputationOutput
 from app.services.reputation_scanner import ReputationScannerService
 from app.core.dependencies import get_reputation_scanner_service
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -32,10 +35,10 @@ async def scan_reputation_route(
     - `actionable_insights`: (array of strings) Suggestions for leveraging/managing sentiment.
     """
     try:
-        result = await scanner_service.scan_reputation(input_data)
+        result = await scanner_service.scan_reputation(input_data, raw_response=True)
         return result
     except Exception as e:
-        print(f"Error in scan_reputation_route: {e}")
+        logger.error("Error in scan_reputation_route: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during reputation scanning: {e}"
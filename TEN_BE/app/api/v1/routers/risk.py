@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.models.schemas import RiskInput, RiskOutput
+from app.models.schemas import RiskInput, RiskOutput, RiskBatchInput, RiskBatchOutput
 from app.services.risk_analyzer import RiskAnalyzerService
+from app.core.config import settings
+from app.core.resilience import UpstreamUnavailableError
 from app.core.dependencies import get_risk_analyzer_service
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -31,11 +36,44 @@ async def analyze_risk_route(
     - `recommendations`: (array of strings) General advice.
     """
     try:
-        result = await analyzer_service.analyze_risk(input_data)
+        result = await analyzer_service.analyze_risk(input_data, raw_response=True)
         return result
     except Exception as e:
-        print(f"Error in analyze_risk_route: {e}")
+        logger.error("Error in analyze_risk_route: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during risk analysis: {e}"
         )
+
+
+@router.post(
+    "/analyze-risk/batch",
+    response_model=RiskBatchOutput,
+    status_code=status.HTTP_200_OK,
+    summary="Analyzes the risk profiles of many startups",
+    description="Batch version of /analyze-risk for cohort scoring. Each item is cached like a single /analyze-risk call; uncached items are analyzed several at a time per AI request. Results are returned in input order."
+)
+async def analyze_risk_batch_route(
+    batch: RiskBatchInput,
+    analyzer_service: RiskAnalyzerService = Depends(get_risk_analyzer_service)
+):
+    if len(batch.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {settings.BATCH_MAX_ITEMS} items."
+        )
+    try:
+        results = await analyzer_service.analyze_risk_batch(batch.items)
+        return RiskBatchOutput(results=results)
+    except UpstreamUnavailableError as e:
+        logger.warning("Upstream unavailable in analyze_risk_batch_route: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"The AI service is temporarily unavailable, retry the batch risk analysis later: {e}"
+        )
+    except Exception as e:
+        logger.error("Error in analyze_risk_batch_route: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred during batch risk analysis: {e}"
+        )
@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from app.models.schemas import TalentNavigatorInput, TalentNavigatorOutput
 from app.services.talent_navigator import TalentNavigatorService
 from app.core.dependencies import get_talent_navigator_service
+from app.core.sse import sse_response
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -17,11 +22,29 @@ async def talent_navigator_route(
     talent_service: TalentNavigatorService = Depends(get_talent_navigator_service)
 ):
     try:
-        result = await talent_service.get_talent_guidance(input_data)
+        result = await talent_service.get_talent_guidance(input_data, raw_response=True)
         return result
     except Exception as e:
-        print(f"Error in talent_navigator_route: {e}")
+        logger.error("Error in talent_navigator_route: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during talent guidance generation: {e}"
-        )
\ No newline at end of file
+        )
+
+@router.post(
+    "/talent-navigator/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Stream team building guidance as it is generated",
+    description="Same as /talent-navigator, delivered as Server-Sent Events: a `role` event for each recommended role as soon as it is complete, then `result` with the full output, then `done`. Failures are reported as an `error` event."
+)
+async def talent_navigator_stream_route(
+    input_data: TalentNavigatorInput,
+    talent_service: TalentNavigatorService = Depends(get_talent_navigator_service)
+):
+    return sse_response(
+        talent_service.stream_talent_guidance(input_data),
+        route_name="talent_navigator_stream_route",
+        error_message="An error occurred during talent guidance generation",
+        done_data={"startup_name": input_data.startup_name}
+    )
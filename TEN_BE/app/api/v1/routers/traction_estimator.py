@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.models.schemas import TractionEstimatorInput, TractionEstimatorOutput
+from app.models.schemas import TractionEstimatorInput, TractionEstimatorOutput, TractionEstimatorBatchInput, TractionEstimatorBatchOutput
 from app.services.traction_estimator import TractionEstimatorService
+from app.core.config import settings
+from app.core.resilience import UpstreamUnavailableError
 from app.core.dependencies import get_traction_estimator_service
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -17,11 +22,44 @@ async def traction_estimator_route(
     estimator_service: TractionEstimatorService = Depends(get_traction_estimator_service)
 ):
     try:
-        result = await estimator_service.estimate_traction(input_data)
+        result = await estimator_service.estimate_traction(input_data, raw_response=True)
         return result
     except Exception as e:
-        print(f"Error in traction_estimator_route: {e}")
+        logger.error("Error in traction_estimator_route: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during traction estimation: {e}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post(
+    "/traction-estimator/batch",
+    response_model=TractionEstimatorBatchOutput,
+    status_code=status.HTTP_200_OK,
+    summary="Estimate growth traction for many startups",
+    description="Batch version of /traction-estimator for cohort scoring. Each item is cached like a single /traction-estimator call; insights for uncached items are generated several at a time per AI request. Results are returned in input order."
+)
+async def traction_estimator_batch_route(
+    batch: TractionEstimatorBatchInput,
+    estimator_service: TractionEstimatorService = Depends(get_traction_estimator_service)
+):
+    if len(batch.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {settings.BATCH_MAX_ITEMS} items."
+        )
+    try:
+        results = await estimator_service.estimate_traction_batch(batch.items)
+        return TractionEstimatorBatchOutput(results=results)
+    except UpstreamUnavailableError as e:
+        logger.warning("Upstream unavailable in traction_estimator_batch_route: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"The AI service is temporarily unavailable, retry the batch traction estimation later: {e}"
+        )
+    except Exception as e:
+        logger.error("Error in traction_estimator_batch_route: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred during batch traction estimation: {e}"
+        )
@@ -0,0 +1,108 @@
+from app.core.resilience import UpstreamUnavailableError
+from app.core.result_cache import build_cache_key, get_cached_models, record_fallbacks, store_cached_model
+from pydantic import BaseModel
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Type, TypeVar
+import logging
+
+logger = logging.getLogger(__name__)
+
+InputT = TypeVar("InputT", bound=BaseModel)
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def parse_indexed_results(gemini_data, count: int) -> Dict[int, dict]:
+    """
+    Maps the `index` field of each object in a packed Gemini response to the object.
+    Entries with a missing or out-of-range index are dropped.
+    """
+    results: Dict[int, dict] = {}
+    if not isinstance(gemini_data, list):
+        return results
+    for entry in gemini_data:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("index"))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < count:
+            results[index] = entry
+    return results
+
+
+async def cached_batch(
+    cache,
+    namespace: str,
+    output_model: Type[ModelT],
+    items: Sequence[InputT],
+    compute_chunk: Callable[[List[InputT]], Awaitable[List[Optional[ModelT]]]],
+    compute_single: Callable[[InputT], Awaitable[ModelT]],
+    chunk_size: int,
+    max_parallel: int,
+    ttl: int = 3600,
+) -> List[ModelT]:
+    """
+    Resolves a list of inputs against the same per-item cache entries as the single-item
+    endpoint. Misses are packed `chunk_size` at a time into one `compute_chunk` call;
+    items the response left out or got wrong (None) fall back to `compute_single`.
+    Results are returned in input order; duplicate inputs are computed once.
+
+    A `compute_chunk` call that fails as a whole (timeout, unparsable response) falls back
+    for all of its items. UpstreamUnavailableError (open circuit, full queue) is re-raised
+    instead, as one single call per item would only multiply the load on a failing
+    upstream; the remaining chunks are then cancelled. Chunks that succeeded are still cached.
+    """
+    keys = [build_cache_key(namespace, item) for item in items]
+    results: Dict[str, ModelT] = {}
+    pending: Dict[str, InputT] = {}
+    cached_count = 0
+    for key, item, cached in zip(keys, items, await get_cached_models(cache, namespace, output_model, list(items))):
+        if cached is not None:
+            results[key] = cached
+            cached_count += 1
+        elif key not in pending:
+            pending[key] = item
+
+    pending_keys = list(pending)
+    chunks = [pending_keys[start:start + chunk_size] for start in range(0, len(pending_keys), chunk_size)]
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def run_chunk(chunk_keys: List[str]):
+        chunk_items = [pending[key] for key in chunk_keys]
+        async with semaphore:
+            try:
+                outputs = await compute_chunk(chunk_items)
+            except UpstreamUnavailableError as e:
+                logger.error("Packed %s call for %s items rejected: %s", namespace, len(chunk_items), e)
+                raise
+            except Exception as e:
+                logger.warning("Packed %s call for %s items failed: %s", namespace, len(chunk_items), e)
+                outputs = [None] * len(chunk_items)
+
+        fallback_keys = []
+        stores = []
+        for key, item, output in zip(chunk_keys, chunk_items, outputs):
+            if output is None:
+                fallback_keys.append(key)
+                continue
+            results[key] = output
+            stores.append(store_cached_model(cache, namespace, output_model, item, output, ttl))
+        await asyncio.gather(*stores)
+
+        if fallback_keys:
+            record_fallbacks(namespace, len(fallback_keys))
+            logger.debug("%s of %s %s items fell back to single calls.", len(fallback_keys), len(chunk_items), namespace)
+            fallback_outputs = await asyncio.gather(*[compute_single(pending[key]) for key in fallback_keys])
+            results.update(zip(fallback_keys, fallback_outputs))
+
+    tasks = [asyncio.ensure_future(run_chunk(chunk_keys)) for chunk_keys in chunks]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    logger.debug("%s batch of %s: %s cached, %s distinct inputs computed in %s packed calls.", namespace, len(items), cached_count, len(pending_keys), len(chunks))
+    return [results[key] for key in keys]
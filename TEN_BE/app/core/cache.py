@@ -0,0 +1,339 @@
+import redis.asyncio as redis
+from app.core.config import settings
+from app.core.redis import get_redis_binary_client
+from app.core.cache_codec import CacheCodec, CacheCodecError
+from app.core.degradation import degradation_scope
+from app.core.metrics import track_stage
+from app.core.tracing import span
+import asyncio
+import contextvars
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LocalTTLCache:
+    """
+    Bounded in-process LRU cache where every entry also carries its own expiry
+    and, for stale-while-revalidate keys, the time after which it should be refreshed.
+    """
+
+    def __init__(self, max_entries: int, default_ttl: float):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, str, Optional[float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """
+        Returns (value, refresh_at) for a live entry, or None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value, refresh_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value, refresh_at
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None, refresh_at: Optional[float] = None):
+        if self.max_entries <= 0:
+            return
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        self._entries[key] = (time.monotonic() + ttl, value, refresh_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def postpone_refresh(self, key: str, refresh_at: float):
+        """
+        Moves a live entry's refresh time, keeping its value and expiry.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries[key] = (entry[0], entry[1], refresh_at)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TwoTierCache:
+    """
+    Cache used by all services: a bounded in-process L1 in front of Redis (L2).
+    L1 holds decoded strings; L2 values are encoded with `codec`, so `redis_client`
+    must not decode responses. Optionally broadcasts writes over Redis pub/sub so
+    other workers drop their stale L1 copies of the same key.
+    """
+
+    def __init__(self, redis_client: redis.Redis, local_cache: LocalTTLCache, invalidation_channel: Optional[str] = None, codec: Optional[CacheCodec] = None):
+        self.redis = redis_client
+        self.local = local_cache
+        self.codec = codec or CacheCodec()
+        self.invalidation_channel = invalidation_channel
+        self._origin_id = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
+        self._refreshing: Set[str] = set()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.stale_hits = 0
+        self.background_refreshes = 0
+        # Stale-while-revalidate lookups per key namespace (the key prefix before ":").
+        self.namespace_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "stale": 0})
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        with track_stage("cache.get", "redis"):
+            raw_value = await self.redis.get(key)
+        value = self._decode(key, raw_value)
+        if value is None:
+            self.l2_misses += 1
+            return None
+
+        self.l2_hits += 1
+        self.local.set(key, value)
+        return value
+
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """
+        Batched `get`: L1 first, then a single MGET for everything L1 did not have.
+        """
+        values: List[Optional[str]] = [self.local.get(key) for key in keys]
+        missing = [index for index, value in enumerate(values) if value is None]
+        if not missing:
+            return values
+
+        with track_stage("cache.get_many", "redis"):
+            raw_values = await self.redis.mget([keys[index] for index in missing])
+        for index, raw_value in zip(missing, raw_values):
+            value = self._decode(keys[index], raw_value)
+            if value is None:
+                self.l2_misses += 1
+                continue
+            self.l2_hits += 1
+            self.local.set(keys[index], value)
+            values[index] = value
+        return values
+
+    async def set(self, key: str, value: str, ttl: int, soft_ttl: Optional[int] = None):
+        refresh_at = time.monotonic() + soft_ttl if soft_ttl is not None else None
+        self.local.set(key, value, ttl, refresh_at=refresh_at)
+        encoded = self.codec.encode(value)
+        with track_stage("cache.set", "redis"):
+            await self.redis.setex(key, ttl, encoded)
+        await self._publish_invalidation(key)
+
+    def _decode(self, key: str, raw: Optional[bytes]) -> Optional[str]:
+        try:
+            return self.codec.decode(raw)
+        except (CacheCodecError, UnicodeDecodeError) as e:
+            logger.error("Could not decode cache entry %s: %s. Treating as a miss.", key, e)
+            return None
+
+    async def get_or_revalidate(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[str]]],
+        soft_ttl: int,
+        hard_ttl: int,
+    ) -> Optional[str]:
+        """
+        Stale-while-revalidate read. Entries live for `hard_ttl`; once older than
+        `soft_ttl` they are still returned immediately while a single background
+        refresh (per key, across workers) reloads them. On a miss, `loader` runs
+        inline. Nothing is cached when the loader returns None or ran into a failed
+        upstream call (see app.core.degradation).
+        """
+        now = time.monotonic()
+        namespace = key.partition(":")[0]
+        counts = self.namespace_stats[namespace]
+        with span("cache.lookup", namespace=namespace) as current:
+            entry = self.local.get_entry(key)
+            if entry is None:
+                with track_stage("cache.get", "redis"):
+                    async with self.redis.pipeline(transaction=False) as pipe:
+                        pipe.get(key)
+                        pipe.pttl(key)
+                        raw_value, remaining_ms = await pipe.execute()
+                value = self._decode(key, raw_value)
+                if value is not None:
+                    self.l2_hits += 1
+                    # Age is derived from the remaining Redis TTL; keys without expiry are treated as fresh.
+                    refresh_at = now + remaining_ms / 1000 - (hard_ttl - soft_ttl) if remaining_ms > 0 else None
+                    self.local.set(key, value, hard_ttl, refresh_at=refresh_at)
+                    entry = (value, refresh_at)
+                else:
+                    self.l2_misses += 1
+
+            if entry is None:
+                current.set_attribute("cache", "miss")
+                counts["misses"] += 1
+                with degradation_scope() as scope:
+                    value = await loader()
+                if value is not None and not scope.degraded:
+                    await self.set(key, value, hard_ttl, soft_ttl=soft_ttl)
+                return value
+
+            value, refresh_at = entry
+            if refresh_at is not None and now >= refresh_at:
+                current.set_attribute("cache", "stale")
+                self.stale_hits += 1
+                counts["stale"] += 1
+                self._schedule_refresh(key, loader, soft_ttl, hard_ttl)
+            else:
+                current.set_attribute("cache", "hit")
+                counts["hits"] += 1
+            return value
+
+    def _schedule_refresh(self, key: str, loader: Callable[[], Awaitable[Optional[str]]], soft_ttl: int, hard_ttl: int):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        # Started in an empty context so that the refresh neither marks the triggering
+        # request's degradation scope nor adds its spans to that request's trace.
+        task = contextvars.Context().run(asyncio.create_task, self._refresh(key, loader, soft_ttl, hard_ttl))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, key: str, loader: Callable[[], Awaitable[Optional[str]]], soft_ttl: int, hard_ttl: int):
+        refreshed = False
+        try:
+            # Only one worker refreshes a given key at a time.
+            if not await self.redis.set(f"refresh:{key}", self._origin_id, nx=True, ex=settings.CACHE_REFRESH_LOCK_SECONDS):
+                return
+            with degradation_scope() as scope:
+                value = await loader()
+            if value is not None and not scope.degraded:
+                await self.set(key, value, hard_ttl, soft_ttl=soft_ttl)
+                self.background_refreshes += 1
+                refreshed = True
+        except Exception as e:
+            logger.error("Background refresh failed for %s: %s", key, e)
+        finally:
+            self._refreshing.discard(key)
+            if not refreshed:
+                # Another worker holds the lock, or there was nothing usable to store: serve the
+                # stale entry without retrying on every hit until the lock would expire.
+                self.local.postpone_refresh(key, time.monotonic() + settings.CACHE_REFRESH_LOCK_SECONDS)
+
+    async def delete(self, key: str):
+        self.local.delete(key)
+        await self.redis.delete(key)
+        await self._publish_invalidation(key)
+
+    async def _publish_invalidation(self, key: str):
+        if self.invalidation_channel:
+            await self.redis.publish(self.invalidation_channel, f"{self._origin_id}:{key}")
+
+    async def start_invalidation_listener(self):
+        if self.invalidation_channel and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def stop_invalidation_listener(self):
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    async def _listen_for_invalidations(self):
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.subscribe(self.invalidation_channel)
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if not message or message.get("type") != "message":
+                    continue
+                origin_id, _, key = message["data"].decode("utf-8").partition(":")
+                if origin_id != self._origin_id:
+                    self.local.delete(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Invalidation listener stopped: %s. L1 entries will expire by TTL only.", e)
+        finally:
+            await pubsub.reset()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "l1": self.local.stats(),
+            "l2_hits": self.l2_hits,
+            "l2_misses": self.l2_misses,
+            "stale_hits": self.stale_hits,
+            "background_refreshes": self.background_refreshes,
+            "pending_refreshes": len(self._refresh_tasks),
+            "namespaces": {namespace: dict(counts) for namespace, counts in self.namespace_stats.items()},
+            "invalidation_enabled": self.invalidation_channel is not None,
+        }
+
+
+_cache: Optional[TwoTierCache] = None
+
+async def init_cache():
+    """
+    Builds the shared two-tier cache on top of the connected Redis client.
+    """
+    global _cache
+    if _cache is None:
+        try:
+            redis_client = await get_redis_binary_client()
+        except ConnectionError as e:
+            logger.warning("Cache not initialized: %s", e)
+            return
+        _cache = TwoTierCache(
+            redis_client,
+            LocalTTLCache(max_entries=settings.CACHE_L1_MAX_ENTRIES, default_ttl=settings.CACHE_L1_TTL_SECONDS),
+            invalidation_channel=settings.CACHE_INVALIDATION_CHANNEL if settings.CACHE_INVALIDATION_ENABLED else None,
+            codec=CacheCodec(settings.CACHE_CODEC, min_compress_bytes=settings.CACHE_COMPRESSION_MIN_BYTES),
+        )
+        await _cache.start_invalidation_listener()
+        logger.info("Two-tier cache initialized (L1 max entries: %s, L1 TTL: %ss).", settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_TTL_SECONDS)
+
+async def close_cache():
+    global _cache
+    if _cache is not None:
+        await _cache.stop_invalidation_listener()
+        _cache = None
+
+def get_cache() -> TwoTierCache:
+    if _cache is None:
+        raise ConnectionError("Cache is not initialized. Ensure init_cache() was called after connect_redis().")
+    return _cache
@@ -0,0 +1,95 @@
+import json
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Every encoded entry starts with MAGIC followed by a codec byte. 0xFE can never
+# start a UTF-8 string, so entries written before this format (plain JSON text)
+# are recognised and read as-is.
+MAGIC = 0xFE
+CODEC_IDENTITY = 0x00
+CODEC_ZLIB = 0x01
+CODEC_ZSTD = 0x02
+
+_CODEC_NAMES = {"none": CODEC_IDENTITY, "zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+
+
+class CacheCodecError(ValueError):
+    pass
+
+
+def dumps_compact(data: Any) -> str:
+    """
+    Serializes data to JSON without insignificant whitespace.
+    """
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def project_fields(items: Iterable[Dict[str, Any]], fields: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Keeps only the given fields of each result dict, e.g. title/link/snippet of SerpAPI results.
+    """
+    fields = tuple(fields)
+    return [{field: item[field] for field in fields if field in item} for item in items]
+
+
+class CacheCodec:
+    """
+    Encodes cache values as a 2-byte header (magic + codec id) and a payload that is
+    compressed once it exceeds `min_compress_bytes`.
+    """
+
+    def __init__(self, codec: str = "zlib", min_compress_bytes: int = 256, level: int = 6):
+        codec_id = _CODEC_NAMES.get(codec)
+        if codec_id is None:
+            raise CacheCodecError(f"Unknown cache codec '{codec}'. Expected one of: {', '.join(_CODEC_NAMES)}.")
+        if codec_id == CODEC_ZSTD and zstandard is None:
+            logger.warning("zstandard is not installed. Falling back to zlib cache compression.")
+            codec_id = CODEC_ZLIB
+        self.codec_id = codec_id
+        self.min_compress_bytes = min_compress_bytes
+        self.level = level
+        self._zstd_compressor = zstandard.ZstdCompressor(level=level) if codec_id == CODEC_ZSTD else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    def encode(self, value: str) -> bytes:
+        payload = value.encode("utf-8")
+        codec_id = self.codec_id if len(payload) >= self.min_compress_bytes else CODEC_IDENTITY
+        if codec_id == CODEC_ZLIB:
+            payload = zlib.compress(payload, self.level)
+        elif codec_id == CODEC_ZSTD:
+            payload = self._zstd_compressor.compress(payload)
+        return bytes((MAGIC, codec_id)) + payload
+
+    def decode(self, raw: Optional[bytes]) -> Optional[str]:
+        if raw is None:
+            return None
+        if isinstance(raw, str):
+            return raw
+        if not raw or raw[0] != MAGIC:
+            # Legacy plain-JSON entry.
+            return raw.decode("utf-8")
+
+        codec_id, payload = raw[1], raw[2:]
+        if codec_id == CODEC_IDENTITY:
+            return payload.decode("utf-8")
+        if codec_id == CODEC_ZLIB:
+            try:
+                return zlib.decompress(payload).decode("utf-8")
+            except zlib.error as e:
+                raise CacheCodecError(f"Corrupt zlib cache entry: {e}") from e
+        if codec_id == CODEC_ZSTD:
+            if self._zstd_decompressor is None:
+                raise CacheCodecError("Cache entry is zstd-compressed but zstandard is not installed.")
+            try:
+                return self._zstd_decompressor.decompress(payload).decode("utf-8")
+            except zstandard.ZstdError as e:
+                raise CacheCodecError(f"Corrupt zstd cache entry: {e}") from e
+        raise CacheCodecError(f"Unknown cache codec id {codec_id}.")
@@ -0,0 +1,263 @@
+from app.core.config import settings
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_OFF = "off"
+CASSETTE_RECORD = "record"
+CASSETTE_REPLAY = "replay"
+
+UPSTREAM_GEMINI = "gemini"
+UPSTREAM_SERPAPI = "serpapi"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Never written to a cassette.
+_SECRET_PARAMS = {"api_key"}
+
+
+class CassetteMissError(RuntimeError):
+    """
+    Raised in replay mode for a request that was never recorded.
+    """
+
+
+def normalize_prompt(prompt: str) -> str:
+    # Whitespace-only differences (e.g. prompt compaction) map to the same recording.
+    return _WHITESPACE_RE.sub(" ", prompt).strip()
+
+
+def normalize_search_params(params: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        key: _WHITESPACE_RE.sub(" ", str(value)).strip()
+        for key, value in sorted(params.items())
+        if value is not None and key not in _SECRET_PARAMS
+    }
+
+
+def request_key(upstream: str, request: Dict[str, Any]) -> str:
+    """
+    Hash of a normalized upstream request; recordings are stored and looked up under it.
+    """
+    canonical = json.dumps({"upstream": upstream, "request": request}, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _ReplayResponse:
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class CassetteStore:
+    """
+    Records upstream calls to, or replays them from, a directory of JSON files, one per
+    request key: `<directory>/<upstream>/<key[:2]>/<key>.json`.
+
+    In record mode every successful Gemini generation (streamed or not) and every SerpAPI
+    response is written with its observed latency; failed calls are not recorded, nor are
+    SerpAPI responses carrying an `error` field (HTTP errors, invalid key, exhausted quota,
+    which SearchClient returns rather than raises). In
+    replay mode responses are served from disk after the recorded latency multiplied by
+    `latency_scale` (0 replays instantly), and unrecorded requests raise CassetteMissError.
+    """
+
+    def __init__(self, directory: str, mode: str, latency_scale: float = 1.0):
+        if mode not in (CASSETTE_RECORD, CASSETTE_REPLAY):
+            raise ValueError(f"Unsupported cassette mode '{mode}'. Expected '{CASSETTE_RECORD}' or '{CASSETTE_REPLAY}'.")
+        self.directory = directory
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == CASSETTE_REPLAY
+
+    def _path(self, upstream: str, key: str) -> str:
+        return os.path.join(self.directory, upstream, key[:2], f"{key}.json")
+
+    def _count(self, upstream: str, result: str):
+        counts = self._counts.setdefault(upstream, {"recorded": 0, "replayed": 0, "misses": 0})
+        counts[result] += 1
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write(self, path: str, entry: Dict[str, Any]):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+    async def load(self, upstream: str, key: str, require_complete: bool = False) -> Dict[str, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            try:
+                entry = await asyncio.to_thread(self._read, self._path(upstream, key))
+            except (OSError, ValueError) as e:
+                logger.error("Could not read cassette %s: %s", key, e)
+                entry = None
+            if entry is None:
+                self._count(upstream, "misses")
+                raise CassetteMissError(f"No {upstream} recording for request {key[:12]} in {self.directory}.")
+            self._entries[key] = entry
+        if require_complete and not entry.get("complete", True):
+            self._count(upstream, "misses")
+            raise CassetteMissError(f"The {upstream} recording for request {key[:12]} is a stream that was closed early; record the full response first.")
+        self._count(upstream, "replayed")
+        return entry
+
+    async def save(self, upstream: str, key: str, stage: Optional[str], request: Dict[str, Any], response: Dict[str, Any],
+                   latency_seconds: float, chunks: Optional[List[Dict[str, Any]]] = None, complete: bool = True):
+        entry = {
+            "upstream": upstream,
+            "key": key,
+            "stage": stage,
+            "recorded_at": time.time(),
+            "latency_ms": round(latency_seconds * 1000, 3),
+            "request": request,
+            "response": response,
+            "chunks": chunks,
+            "complete": complete,
+        }
+        try:
+            await asyncio.to_thread(self._write, self._path(upstream, key), entry)
+        except OSError as e:
+            logger.error("Could not write cassette %s: %s", key, e)
+            return
+        self._count(upstream, "recorded")
+
+    async def _sleep_recorded(self, latency_ms: float):
+        if self.latency_scale > 0 and latency_ms > 0:
+            await asyncio.sleep(latency_ms * self.latency_scale / 1000)
+
+    async def generate_content(self, model, prompt: str, stage: Optional[str] = None, stream: bool = False):
+        """
+        Stands in for `model.generate_content_async(prompt, stream=stream)`. A streamed call
+        replays the recorded chunk timings; a recording of the other kind is served too,
+        except that a stream closed early cannot stand in for a full response.
+        """
+        key = request_key(UPSTREAM_GEMINI, {"prompt": normalize_prompt(prompt)})
+        if self.replaying:
+            entry = await self.load(UPSTREAM_GEMINI, key, require_complete=not stream)
+            if stream:
+                return self._replay_stream(entry)
+            await self._sleep_recorded(entry["latency_ms"])
+            return _ReplayResponse(entry["response"]["text"])
+
+        started_at = time.perf_counter()
+        if stream:
+            response = await model.generate_content_async(prompt, stream=True)
+            return self._record_stream(response, key, stage, prompt, started_at)
+        response = await model.generate_content_async(prompt)
+        latency = time.perf_counter() - started_at
+        await self.save(UPSTREAM_GEMINI, key, stage, {"prompt": prompt}, {"text": response.text}, latency)
+        return response
+
+    async def _record_stream(self, response, key: str, stage: Optional[str], prompt: str, started_at: float) -> AsyncIterator[Any]:
+        chunks = []
+        complete = closed_early = False
+        try:
+            async for chunk in response:
+                chunks.append({"offset_ms": round((time.perf_counter() - started_at) * 1000, 3), "text": chunk.text})
+                yield chunk
+            complete = True
+        except GeneratorExit:
+            closed_early = True
+            raise
+        finally:
+            # Consumers may stop reading once they have what they need (e.g. a complete JSON
+            # document); the chunks they received are kept unless a complete recording
+            # already exists. Failed streams are not recorded.
+            if complete or (closed_early and chunks and not await self._has_complete_recording(key)):
+                text = "".join(chunk["text"] or "" for chunk in chunks)
+                await self.save(UPSTREAM_GEMINI, key, stage, {"prompt": prompt}, {"text": text},
+                                time.perf_counter() - started_at, chunks, complete=complete)
+
+    async def _has_complete_recording(self, key: str) -> bool:
+        try:
+            entry = await asyncio.to_thread(self._read, self._path(UPSTREAM_GEMINI, key))
+        except (OSError, ValueError):
+            return False
+        return entry is not None and entry.get("complete", True)
+
+    async def _replay_stream(self, entry: Dict[str, Any]) -> AsyncIterator[_ReplayResponse]:
+        chunks = entry.get("chunks") or [{"offset_ms": entry["latency_ms"], "text": entry["response"]["text"]}]
+        elapsed_ms = 0.0
+        for chunk in chunks:
+            await self._sleep_recorded(chunk["offset_ms"] - elapsed_ms)
+            elapsed_ms = chunk["offset_ms"]
+            yield _ReplayResponse(chunk["text"])
+        if not entry.get("complete", True):
+            # The recording stops where its consumer did; reading past it must not look
+            # like the end of the response.
+            self._count(UPSTREAM_GEMINI, "misses")
+            raise CassetteMissError(f"The Gemini recording for request {entry['key'][:12]} ends where its stream was closed early.")
+
+    async def search(self, params: Dict[str, Any], send: Callable[[], Awaitable[Dict[str, Any]]], stage: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Wraps one SerpAPI search, `send` being the real request (including its retries).
+        """
+        request = normalize_search_params(params)
+        key = request_key(UPSTREAM_SERPAPI, request)
+        if self.replaying:
+            entry = await self.load(UPSTREAM_SERPAPI, key)
+            await self._sleep_recorded(entry["latency_ms"])
+            # Callers may modify the response; the cached entry must stay intact.
+            return json.loads(json.dumps(entry["response"]))
+
+        started_at = time.perf_counter()
+        response = await send()
+        if "error" in response:
+            logger.debug("Not recording SerpAPI error response for request %s: %s", key[:12], response["error"])
+            return response
+        await self.save(UPSTREAM_SERPAPI, key, stage, request, response, time.perf_counter() - started_at)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "directory": self.directory,
+            "latency_scale": self.latency_scale,
+            "upstreams": {upstream: dict(counts) for upstream, counts in self._counts.items()},
+        }
+
+
+_cassette: Optional[CassetteStore] = None
+
+def init_cassette() -> Optional[CassetteStore]:
+    """
+    Creates the cassette store when CASSETTE_MODE is 'record' or 'replay'. Call before
+    the Gemini and search clients are initialized, which pick it up.
+    """
+    global _cassette
+    if _cassette is None and settings.CASSETTE_MODE != CASSETTE_OFF:
+        _cassette = CassetteStore(settings.CASSETTE_DIR, settings.CASSETTE_MODE, settings.CASSETTE_REPLAY_LATENCY_SCALE)
+        logger.warning("Cassette %s mode: upstream calls are %s %s.", _cassette.mode,
+                       "served from" if _cassette.replaying else "recorded to", os.path.abspath(_cassette.directory))
+    return _cassette
+
+def close_cassette():
+    global _cassette
+    _cassette = None
+
+def get_cassette() -> Optional[CassetteStore]:
+    """
+    Returns the cassette store, or None when record/replay is off.
+    """
+    return _cassette
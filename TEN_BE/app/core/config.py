@@ -1,6 +1,6 @@
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     APP_NAME: str = Field("The Entrepreneurial Navigator", description="Name of the FastAPI application.")
@@ -8,6 +8,100 @@ class Settings(BaseSettings):
     GOOGLE_API_KEY: str = Field(..., env="GOOGLE_API_KEY", description="API Key for Google Gemini.")
     SERPAPI_API_KEY: str = Field(None, env="SERPAPI_API_KEY", description="API Key for SerpAPI (Optional).")
 
+    GEMINI_MAX_CONCURRENCY: int = Field(200, env="GEMINI_MAX_CONCURRENCY", description="Maximum number of concurrent Gemini calls per worker process.")
+    GEMINI_CALL_TIMEOUT_SECONDS: float = Field(60.0, env="GEMINI_CALL_TIMEOUT_SECONDS", description="Timeout in seconds for a single Gemini call; the upper bound of its adaptive timeout.")
+    GEMINI_MIN_TIMEOUT_SECONDS: float = Field(5.0, env="GEMINI_MIN_TIMEOUT_SECONDS", description="Lower bound of the adaptive Gemini call timeout.")
+    GEMINI_MAX_QUEUE_SIZE: int = Field(1000, env="GEMINI_MAX_QUEUE_SIZE", description="Gemini calls allowed to wait for a concurrency slot; further calls fail fast.")
+    GEMINI_MAX_QUEUE_WAIT_SECONDS: float = Field(10.0, env="GEMINI_MAX_QUEUE_WAIT_SECONDS", description="How long a Gemini call may wait for a concurrency slot before failing.")
+
+    SEARCH_POOL_SIZE: int = Field(100, env="SEARCH_POOL_SIZE", description="Maximum number of open connections in the shared SerpAPI HTTP session.")
+    SEARCH_TIMEOUT_SECONDS: float = Field(15.0, env="SEARCH_TIMEOUT_SECONDS", description="Timeout in seconds for a single SerpAPI request attempt; the upper bound of its adaptive timeout.")
+    SEARCH_MIN_TIMEOUT_SECONDS: float = Field(2.0, env="SEARCH_MIN_TIMEOUT_SECONDS", description="Lower bound of the adaptive SerpAPI request timeout.")
+    SEARCH_MAX_QUEUE_SIZE: int = Field(500, env="SEARCH_MAX_QUEUE_SIZE", description="SerpAPI searches allowed to wait once SEARCH_POOL_SIZE searches are running; further searches fail fast.")
+    SEARCH_MAX_QUEUE_WAIT_SECONDS: float = Field(5.0, env="SEARCH_MAX_QUEUE_WAIT_SECONDS", description="How long a SerpAPI search may wait for a free slot before failing.")
+    SEARCH_MAX_RETRIES: int = Field(2, env="SEARCH_MAX_RETRIES", description="Retries for a SerpAPI request that failed with 429/5xx, a timeout or a connection error.")
+    SEARCH_RETRY_BACKOFF_SECONDS: float = Field(0.5, env="SEARCH_RETRY_BACKOFF_SECONDS", description="Initial retry delay for SerpAPI requests; doubled on each retry unless the response sets Retry-After.")
+    SEARCH_DNS_CACHE_TTL_SECONDS: int = Field(300, env="SEARCH_DNS_CACHE_TTL_SECONDS", description="How long resolved SerpAPI addresses are reused by the shared HTTP session.")
+
+    INVESTOR_SEARCH_MAX_PARALLEL: int = Field(5, env="INVESTOR_SEARCH_MAX_PARALLEL", description="Maximum number of concurrent SerpAPI searches per investor matching request.")
+    INVESTOR_SEARCH_TIMEOUT_SECONDS: float = Field(15.0, env="INVESTOR_SEARCH_TIMEOUT_SECONDS", description="Timeout in seconds for a single investor SerpAPI request attempt; failed attempts are retried like other searches.")
+
+    COMPETITOR_RADAR_MAX_PARALLEL: int = Field(5, env="COMPETITOR_RADAR_MAX_PARALLEL", description="Maximum number of concurrent searches/competitor analyses per competitor radar request.")
+    COMPETITOR_RADAR_COMBINED_ANALYSIS: bool = Field(False, env="COMPETITOR_RADAR_COMBINED_ANALYSIS", description="Analyze all selected competitors in a single Gemini call, falling back to per-competitor calls for any it does not return.")
+
+    SINGLE_FLIGHT_LOCK_TTL_SECONDS: float = Field(120.0, env="SINGLE_FLIGHT_LOCK_TTL_SECONDS", description="Lifetime of the Redis lock held while one request computes a shared cache entry.")
+    SINGLE_FLIGHT_WAIT_TIMEOUT_SECONDS: float = Field(90.0, env="SINGLE_FLIGHT_WAIT_TIMEOUT_SECONDS", description="How long a coalesced request waits for the computing request before computing itself.")
+
+    CACHE_L1_MAX_ENTRIES: int = Field(2048, env="CACHE_L1_MAX_ENTRIES", description="Maximum number of entries held in the in-process (L1) cache. 0 disables L1.")
+    CACHE_L1_TTL_SECONDS: float = Field(60.0, env="CACHE_L1_TTL_SECONDS", description="Maximum lifetime of an in-process (L1) cache entry.")
+    CACHE_INVALIDATION_ENABLED: bool = Field(False, env="CACHE_INVALIDATION_ENABLED", description="Broadcast cache writes over Redis pub/sub so other workers drop stale L1 entries.")
+    CACHE_INVALIDATION_CHANNEL: str = Field("cache:invalidate", env="CACHE_INVALIDATION_CHANNEL", description="Redis pub/sub channel used for cross-worker L1 invalidation.")
+
+    CACHE_TTL_OVERRIDES: Dict[str, int] = Field(default_factory=dict, env="CACHE_TTL_OVERRIDES", description="Per-namespace result cache TTLs in seconds (e.g. '{\"competitor_radar\": 7200}').")
+    CACHE_KEY_QUANTIZATION: Dict[str, Dict[str, int]] = Field(default_factory=dict, env="CACHE_KEY_QUANTIZATION", description="Per-namespace numeric bucketing for cache keys: field name -> significant digits (e.g. '{\"investor_matching\": {\"funding_sought_usd\": 2}}').")
+    SEARCH_CACHE_HARD_TTL_SECONDS: int = Field(86400, env="SEARCH_CACHE_HARD_TTL_SECONDS", description="Hard expiry for cached SerpAPI results; past their soft TTL they are served stale and refreshed in the background.")
+    CACHE_REFRESH_LOCK_SECONDS: int = Field(30, env="CACHE_REFRESH_LOCK_SECONDS", description="Lifetime of the lock ensuring only one background refresh per key runs across workers.")
+    CACHE_CODEC: str = Field("zlib", env="CACHE_CODEC", description="Compression for Redis cache values: 'zlib', 'zstd' (requires zstandard) or 'none'.")
+    CACHE_COMPRESSION_MIN_BYTES: int = Field(256, env="CACHE_COMPRESSION_MIN_BYTES", description="Cache values smaller than this are stored uncompressed.")
+
+    BATCH_MAX_ITEMS: int = Field(200, env="BATCH_MAX_ITEMS", description="Maximum number of inputs accepted by a batch endpoint.")
+    BATCH_ITEMS_PER_PROMPT: int = Field(10, env="BATCH_ITEMS_PER_PROMPT", description="Number of batch items packed into a single Gemini prompt.")
+    BATCH_MAX_PARALLEL_PROMPTS: int = Field(4, env="BATCH_MAX_PARALLEL_PROMPTS", description="Maximum number of packed Gemini prompts in flight per batch request.")
+
+    JOB_STREAM_KEY: str = Field("jobs:stream", env="JOB_STREAM_KEY", description="Redis stream holding queued analysis jobs.")
+    JOB_CONSUMER_GROUP: str = Field("job-workers", env="JOB_CONSUMER_GROUP", description="Redis consumer group shared by all job worker processes.")
+    JOB_STREAM_MAXLEN: int = Field(10000, env="JOB_STREAM_MAXLEN", description="Approximate maximum number of entries kept in the job stream.")
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = Field(120, env="JOB_VISIBILITY_TIMEOUT_SECONDS", description="A claimed job whose worker stops heartbeating for this long is handed to another worker.")
+    JOB_MAX_ATTEMPTS: int = Field(3, env="JOB_MAX_ATTEMPTS", description="Maximum number of times a job is attempted before it is marked failed.")
+    JOB_RESULT_TTL_SECONDS: int = Field(86400, env="JOB_RESULT_TTL_SECONDS", description="How long job status and results are kept in Redis.")
+    JOB_WORKER_CONCURRENCY: int = Field(8, env="JOB_WORKER_CONCURRENCY", description="Number of jobs a single worker process runs concurrently.")
+    JOB_EVENTS_TIMEOUT_SECONDS: float = Field(300.0, env="JOB_EVENTS_TIMEOUT_SECONDS", description="How long the job events stream waits for a job to finish before closing.")
+
+    PROMPT_TOKEN_BUDGET_DEFAULT: int = Field(6000, env="PROMPT_TOKEN_BUDGET_DEFAULT", description="Estimated input-token budget for a Gemini prompt; variable sections are trimmed to fit.")
+    PROMPT_TOKEN_BUDGETS: Dict[str, int] = Field(default_factory=dict, env="PROMPT_TOKEN_BUDGETS", description="Per-prompt token budgets overriding the default (e.g. '{\"investor_curation\": 4000}').")
+    PROMPT_SNIPPET_MAX_CHARS: int = Field(300, env="PROMPT_SNIPPET_MAX_CHARS", description="Search snippets embedded in prompts are truncated to this many characters.")
+    PROMPT_MAX_SNIPPETS: int = Field(25, env="PROMPT_MAX_SNIPPETS", description="Maximum number of distinct search snippets embedded in a single prompt.")
+    PROMPT_FIELD_MAX_CHARS: int = Field(500, env="PROMPT_FIELD_MAX_CHARS", description="Free-text input fields (e.g. a competitive advantage description) embedded in prompts are truncated to this many characters.")
+
+    RATE_LIMIT_ENABLED: bool = Field(True, env="RATE_LIMIT_ENABLED", description="Enforce per-API-key request quotas.")
+    RATE_LIMIT_REQUESTS: int = Field(100, env="RATE_LIMIT_REQUESTS", description="Cost units each API key may spend per rate limit window (a plain request costs 1).")
+    RATE_LIMIT_WINDOW_SECONDS: float = Field(60.0, env="RATE_LIMIT_WINDOW_SECONDS", description="Time over which an API key's quota is fully refilled.")
+    RATE_LIMIT_SYNC_INTERVAL_SECONDS: float = Field(1.0, env="RATE_LIMIT_SYNC_INTERVAL_SECONDS", description="How often each worker reconciles its local rate limit buckets with Redis.")
+    RATE_LIMIT_ROUTE_COSTS: Dict[str, float] = Field(default_factory=dict, env="RATE_LIMIT_ROUTE_COSTS", description="Per-route cost overrides by route path (e.g. '{\"/api/v1/competitor-radar\": 20}').")
+
+    LOG_LEVEL: str = Field("INFO", env="LOG_LEVEL", description="Minimum level of application log records (DEBUG, INFO, WARNING, ERROR).")
+    LOG_FORMAT: str = Field("text", env="LOG_FORMAT", description="Log output format: 'text' or 'json' (one JSON object per line).")
+    LOG_DEBUG_SAMPLE_RATE: float = Field(1.0, env="LOG_DEBUG_SAMPLE_RATE", description="Fraction of DEBUG records that are emitted when LOG_LEVEL is DEBUG.")
+
+    SERVICE_WARMUP_TIMEOUT_SECONDS: float = Field(5.0, env="SERVICE_WARMUP_TIMEOUT_SECONDS", description="Maximum time spent on service warm-up hooks at startup.")
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = Field(10.0, env="SHUTDOWN_DRAIN_TIMEOUT_SECONDS", description="How long shutdown waits for in-flight Gemini and search calls to finish.")
+
+    METRICS_ENABLED: bool = Field(True, env="METRICS_ENABLED", description="Serve Prometheus metrics at /metrics. The endpoint is unauthenticated; restrict it at the network level.")
+
+    TRACING_ENABLED: bool = Field(True, env="TRACING_ENABLED", description="Record a span tree for every request and job.")
+    TRACE_BUFFER_SIZE: int = Field(1000, env="TRACE_BUFFER_SIZE", description="Number of recent traces kept in memory per process for the admin trace endpoints.")
+    TRACE_MAX_SPANS: int = Field(500, env="TRACE_MAX_SPANS", description="Maximum number of spans recorded per trace; further spans are only counted.")
+    OTLP_ENDPOINT: Optional[str] = Field(None, env="OTLP_ENDPOINT", description="Base URL of an OpenTelemetry collector's OTLP/HTTP receiver (e.g. http://localhost:4318). Traces are exported only when set.")
+    OTLP_SERVICE_NAME: str = Field("ten-backend", env="OTLP_SERVICE_NAME", description="service.name resource attribute of exported traces.")
+    OTLP_EXPORT_INTERVAL_SECONDS: float = Field(5.0, env="OTLP_EXPORT_INTERVAL_SECONDS", description="How often queued traces are sent to the collector.")
+    ADMIN_API_KEYS: List[str] = Field(default_factory=list, env="ADMIN_API_KEYS", description="API keys allowed to call /api/v1/admin endpoints. Admin endpoints are disabled when empty.")
+
+    CASSETTE_MODE: str = Field("off", env="CASSETTE_MODE", description="Record upstream calls to CASSETTE_DIR ('record'), serve them from it without network access ('replay'), or neither ('off').")
+    CASSETTE_DIR: str = Field("cassettes", env="CASSETTE_DIR", description="Directory of recorded Gemini and SerpAPI calls.")
+    CASSETTE_REPLAY_LATENCY_SCALE: float = Field(1.0, env="CASSETTE_REPLAY_LATENCY_SCALE", description="Multiplier for recorded latencies in replay mode; 0 replays without delay.")
+
+    ADAPTIVE_TIMEOUT_ENABLED: bool = Field(True, env="ADAPTIVE_TIMEOUT_ENABLED", description="Derive Gemini and SerpAPI call timeouts from recent latencies per service stage instead of using the static timeouts.")
+    ADAPTIVE_TIMEOUT_PERCENTILE: float = Field(99.0, env="ADAPTIVE_TIMEOUT_PERCENTILE", description="Latency percentile of recent successful calls that adaptive timeouts are based on.")
+    ADAPTIVE_TIMEOUT_MULTIPLIER: float = Field(3.0, env="ADAPTIVE_TIMEOUT_MULTIPLIER", description="Adaptive timeout as a multiple of the observed latency percentile.")
+    ADAPTIVE_TIMEOUT_WINDOW: int = Field(500, env="ADAPTIVE_TIMEOUT_WINDOW", description="Recent successful calls per stage kept for adaptive timeouts.")
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES: int = Field(50, env="ADAPTIVE_TIMEOUT_MIN_SAMPLES", description="Successful calls a stage needs before its timeout adapts; until then the static timeout applies.")
+    CIRCUIT_BREAKER_ENABLED: bool = Field(True, env="CIRCUIT_BREAKER_ENABLED", description="Fail Gemini and SerpAPI calls fast while the upstream's recent failure rate is too high.")
+    CIRCUIT_BREAKER_FAILURE_RATE: float = Field(0.5, env="CIRCUIT_BREAKER_FAILURE_RATE", description="Failure rate (0-1) over the window at which an upstream's circuit opens.")
+    CIRCUIT_BREAKER_MIN_CALLS: int = Field(20, env="CIRCUIT_BREAKER_MIN_CALLS", description="Calls needed within the window before the circuit can open.")
+    CIRCUIT_BREAKER_WINDOW_SECONDS: float = Field(30.0, env="CIRCUIT_BREAKER_WINDOW_SECONDS", description="Sliding window over which call failures are counted.")
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = Field(15.0, env="CIRCUIT_BREAKER_OPEN_SECONDS", description="How long an open circuit rejects calls before letting trial calls through.")
+    CIRCUIT_BREAKER_HALF_OPEN_CALLS: int = Field(3, env="CIRCUIT_BREAKER_HALF_OPEN_CALLS", description="Trial calls that must succeed to close a half-open circuit.")
+
     API_KEY: Optional[str] = Field(None, env="API_KEY")
     VALID_API_KEYS: List[str] = Field(default_factory=list, env="VALID_API_KEYS")
 
@@ -0,0 +1,153 @@
+from app.core.cache import TwoTierCache, get_cache
+from app.core.gemini_client import GeminiClient, get_gemini_client
+from app.core.search_client import SearchClient, get_search_client
+from app.core.config import settings
+from app.services.risk_analyzer import RiskAnalyzerService
+from app.services.reputation_scanner import ReputationScannerService
+from app.services.investor_matcher import InvestorMatcherService
+from app.services.pitch_feedback_generator import PitchFeedbackGeneratorService
+from app.services.competitor_radar import CompetitorRadarService
+from app.services.traction_estimator import TractionEstimatorService
+from app.services.buzz_builder import BuzzBuilderService
+from app.services.legal_advisor import LegalAdvisorService
+from app.services.exit_strategy_explorer import ExitStrategyExplorerService
+from app.services.talent_navigator import TalentNavigatorService
+from app.services.navigator import NavigatorService
+import asyncio
+from typing import Any, Dict, Optional, Type, TypeVar
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Services whose constructor also takes the shared search client.
+_SEARCH_SERVICES = (
+    ReputationScannerService,
+    InvestorMatcherService,
+    CompetitorRadarService,
+    NavigatorService,
+)
+
+SERVICE_CLASSES = (
+    RiskAnalyzerService,
+    ReputationScannerService,
+    InvestorMatcherService,
+    PitchFeedbackGeneratorService,
+    CompetitorRadarService,
+    TractionEstimatorService,
+    BuzzBuilderService,
+    LegalAdvisorService,
+    ExitStrategyExplorerService,
+    TalentNavigatorService,
+    NavigatorService,
+)
+
+_DRAIN_POLL_INTERVAL_SECONDS = 0.05
+
+
+class ServiceContainer:
+    """
+    Holds the shared clients and one instance of each service for the lifetime of the process.
+    Services are built once at startup instead of per request, so they can keep per-process
+    state. A service may define an async `warm_up()` hook, run once by `warm_up()`.
+    """
+
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient, search_client: SearchClient):
+        self.cache = cache
+        self.gemini_client = gemini_client
+        self.search_client = search_client
+        self._services: Dict[type, Any] = {}
+
+    def _build(self, service_class: type) -> Any:
+        if service_class in _SEARCH_SERVICES:
+            return service_class(cache=self.cache, gemini_client=self.gemini_client, search_client=self.search_client)
+        return service_class(cache=self.cache, gemini_client=self.gemini_client)
+
+    def build_all(self):
+        for service_class in SERVICE_CLASSES:
+            self.get(service_class)
+
+    def get(self, service_class: Type[T]) -> T:
+        service = self._services.get(service_class)
+        if service is None:
+            service = self._services[service_class] = self._build(service_class)
+        return service
+
+    async def warm_up(self, timeout: float):
+        """
+        Opens upstream connections and runs the services' warm-up hooks, giving up after `timeout` seconds.
+        """
+        hooks = [self.search_client.warm_up()]
+        hooks.extend(service.warm_up() for service in self._services.values() if hasattr(service, "warm_up"))
+        try:
+            results = await asyncio.wait_for(asyncio.gather(*hooks, return_exceptions=True), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Service warm-up did not finish within %ss.", timeout)
+            return
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Service warm-up hook failed: %s", result)
+
+    def in_flight(self) -> int:
+        """
+        Number of upstream calls and background cache refreshes still running.
+        """
+        return (
+            self.gemini_client.stats()["in_flight"]
+            + self.search_client.stats()["in_flight"]
+            + self.cache.stats()["pending_refreshes"]
+        )
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Waits up to `timeout` seconds for in-flight upstream calls to finish.
+        Returns False if some were still running.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        pending = self.in_flight()
+        if pending:
+            logger.info("Draining %s in-flight upstream call(s)...", pending)
+        while pending and loop.time() < deadline:
+            await asyncio.sleep(_DRAIN_POLL_INTERVAL_SECONDS)
+            pending = self.in_flight()
+        if pending:
+            logger.warning("Shutdown drain timed out with %s upstream call(s) still running.", pending)
+        return not pending
+
+
+_container: Optional[ServiceContainer] = None
+
+async def init_container() -> Optional[ServiceContainer]:
+    """
+    Builds every service once on top of the initialized cache, Gemini and search clients,
+    then warms them up. Call after those clients are initialized.
+    """
+    global _container
+    if _container is None:
+        try:
+            container = ServiceContainer(get_cache(), get_gemini_client(), get_search_client())
+        except (ConnectionError, RuntimeError) as e:
+            logger.warning("Service container not initialized: %s", e)
+            return None
+        container.build_all()
+        await container.warm_up(settings.SERVICE_WARMUP_TIMEOUT_SECONDS)
+        _container = container
+        logger.info("Service container initialized with %s services.", len(SERVICE_CLASSES))
+    return _container
+
+async def close_container():
+    """
+    Waits for in-flight upstream calls (bounded by SHUTDOWN_DRAIN_TIMEOUT_SECONDS), then drops the services.
+    Call before closing the clients they use.
+    """
+    global _container
+    if _container is not None:
+        await _container.drain(settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+        _container = None
+
+def get_container() -> ServiceContainer:
+    if _container is None:
+        raise RuntimeError("Service container not initialized. Call init_container() on startup.")
+    return _container
@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DegradationScope:
+    """
+    Tracks whether a result was computed while an upstream call failed, i.e. whether it
+    may contain fallback output. Marking a scope also marks every enclosing scope.
+    """
+    __slots__ = ("parent", "degraded")
+
+    def __init__(self, parent: Optional["DegradationScope"]):
+        self.parent = parent
+        self.degraded = False
+
+
+_current_scope: ContextVar[Optional[DegradationScope]] = ContextVar("degradation_scope", default=None)
+
+
+@contextmanager
+def degradation_scope() -> Iterator[DegradationScope]:
+    """
+    Opens a scope for one computation:
+
+        with degradation_scope() as scope:
+            result = await compute()
+        if not scope.degraded:
+            await cache.set(...)
+    """
+    scope = DegradationScope(_current_scope.get())
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+def degradation_tracked(func: Callable[..., AsyncIterator[Any]]) -> Callable[..., AsyncIterator[Any]]:
+    """
+    Runs every step of an async generator (e.g. a streaming service method) inside one
+    scope. A context manager cannot span the generator's yields, as each step may run in
+    a different context.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs) -> AsyncIterator[Any]:
+        scope = DegradationScope(_current_scope.get())
+        steps = func(*args, **kwargs)
+        try:
+            while True:
+                token = _current_scope.set(scope)
+                try:
+                    item = await steps.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    _current_scope.reset(token)
+                yield item
+        finally:
+            await steps.aclose()
+    return wrapper
+
+
+def mark_degraded():
+    """
+    Called when an upstream call fails, or a result computed under a failure is reused,
+    so that results depending on it are not cached.
+    """
+    scope = _current_scope.get()
+    while scope is not None and not scope.degraded:
+        scope.degraded = True
+        scope = scope.parent
+
+
+def is_degraded() -> bool:
+    scope = _current_scope.get()
+    return scope is not None and scope.degraded
@@ -1,10 +1,6 @@
-from fastapi import Depends
-from typing import Awaitable
-import redis.asyncio as redis
-import google.generativeai as genai
-
-from app.core.redis import get_redis_client
-from app.core.gemini_client import get_gemini_model
+from app.core.cache import TwoTierCache, get_cache
+from app.core.container import get_container
+from app.core.jobs import JobQueue, get_job_queue
 from app.services.risk_analyzer import RiskAnalyzerService
 from app.services.reputation_scanner import ReputationScannerService
 from app.services.investor_matcher import InvestorMatcherService
@@ -15,67 +11,44 @@ from app.services.buzz_builder import BuzzBuilderService
 from app.services.legal_advisor import LegalAdvisorService
 from app.services.exit_strategy_explorer import ExitStrategyExplorerService
 from app.services.talent_navigator import TalentNavigatorService
+from app.services.navigator import NavigatorService
+
+
+async def get_cache_dependency() -> TwoTierCache:
+    return get_cache()
 
+async def get_job_queue_dependency() -> JobQueue:
+    return get_job_queue()
 
-async def get_redis_dependency() -> redis.Redis:
-    return await get_redis_client()
+async def get_risk_analyzer_service() -> RiskAnalyzerService:
+    return get_container().get(RiskAnalyzerService)
 
-async def get_risk_analyzer_service(
-    redis_client: redis.Redis = Depends(get_redis_dependency),
-    gemini_model: genai.GenerativeModel = Depends(get_gemini_model)
-) -> RiskAnalyzerService:
-    return RiskAnalyzerService(redis_client=redis_client, gemini_model=gemini_model)
+async def get_reputation_scanner_service() -> ReputationScannerService:
+    return get_container().get(ReputationScannerService)
 
-async def get_reputation_scanner_service(
-    redis_client: redis.Redis = Depends(get_redis_dependency),
-    gemini_model: genai.GenerativeModel = Depends(get_gemini_model)
-) -> ReputationScannerService:
-    return ReputationScannerService(redis_client=redis_client, gemini_model=gemini_model)
+async def get_investor_matcher_service() -> InvestorMatcherService:
+    return get_container().get(InvestorMatcherService)
 
-async def get_investor_matcher_service(
-    redis_client: redis.Redis = Depends(get_redis_dependency),
-    gemini_model: genai.GenerativeModel = Depends(get_gemini_model)
-) -> InvestorMatcherService:
-    return InvestorMatcherService(redis_client=redis_client, gemini_model=gemini_model)
+async def get_pitch_feedback_generator_service() -> PitchFeedbackGeneratorService:
+    return get_container().get(PitchFeedbackGeneratorService)
 
-async def get_pitch_feedback_generator_service(
-    redis_client: redis.Redis = Depends(get_redis_dependency),
-    gemini_model: genai.GenerativeModel = Depends(get_gemini_model)
-) -> PitchFeedbackGeneratorService:
-    return PitchFeedbackGeneratorService(redis_client=redis_client, gemini_model=gemini_model)
+async def get_competitor_radar_service() -> CompetitorRadarService:
+    return get_container().get(CompetitorRadarService)
 
-async def get_competitor_radar_service(
-    redis_client: redis.Redis = Depends(get_redis_dependency),
-    gemini_model: genai.GenerativeModel = Depends(get_gemini_model)
-) -> CompetitorRadarService:
-    return CompetitorRadarService(redis_client=redis_client, gemini_model=gemini_model)
+async def get_traction_estimator_service() -> TractionEstimatorService:
+    return get_container().get(TractionEstimatorService)
 
-async def get_traction_estimator_service(
-    redis_client: redis.Redis = Depends(get_redis_dependency),
-    gemini_model: genai.GenerativeModel = Depends(get_gemini_model)
-) -> TractionEstimatorService:
-    return TractionEstimatorService(redis_client=redis_client, gemini_model=gemini_model)
+async def get_buzz_builder_service() -> BuzzBuilderService:
+    return get_container().get(BuzzBuilderService)
 
-async def get_buzz_builder_service(
-    redis_client: redis.Redis = Depends(get_redis_dependency),
-    gemini_model: genai.GenerativeModel = Depends(get_gemini_model)
-) -> BuzzBuilderService:
-    return BuzzBuilderService(redis_client=redis_client, gemini_model=gemini_model)
+async def get_legal_advisor_service() -> LegalAdvisorService:
+    return get_container().get(LegalAdvisorService)
 
-async def get_legal_advisor_service(
-    redis_client: redis.Redis = Depends(get_redis_dependency),
-    gemini_model: genai.GenerativeModel = Depends(get_gemini_model)
-) -> LegalAdvisorService: 
-    return LegalAdvisorService(redis_client=redis_client, gemini_model=gemini_model)
+async def get_exit_strategy_explorer_service() -> ExitStrategyExplorerService:
+    return get_container().get(ExitStrategyExplorerService)
 
-async def get_exit_strategy_explorer_service(
-    redis_client: redis.Redis = Depends(get_redis_dependency),
-    gemini_model: genai.GenerativeModel = Depends(get_gemini_model)
-) -> ExitStrategyExplorerService:
-    return ExitStrategyExplorerService(redis_client=redis_client, gemini_model=gemini_model)
+async def get_talent_navigator_service() -> TalentNavigatorService:
+    return get_container().get(TalentNavigatorService)
 
-async def get_talent_navigator_service(
-    redis_client: redis.Redis = Depends(get_redis_dependency),
-    gemini_model: genai.GenerativeModel = Depends(get_gemini_model)
-) -> TalentNavigatorService:
-    return TalentNavigatorService(redis_client=redis_client, gemini_model=gemini_model)
+async def get_navigator_service() -> NavigatorService:
+    return get_container().get(NavigatorService)
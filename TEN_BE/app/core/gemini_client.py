@@ -1,21 +1,157 @@
 import google.generativeai as genai
 from app.core.config import settings
-from typing import Optional
+from app.core.metrics import track_stage
+from app.core.cassette import UPSTREAM_GEMINI, CassetteMissError, CassetteStore, get_cassette
+from app.core.degradation import mark_degraded
+from app.core.resilience import UpstreamPolicy, build_policy
+from google.generativeai.types import BlockedPromptException, StopCandidateException
+from typing import Optional, Dict, Any, AsyncIterator
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class GeminiClient:
+    """
+    Shared async client for Gemini used by every service.
+    Calls go through the SDK's native async generation path and an upstream policy (see
+    app/core/resilience.py): a bulkhead bounding concurrency and queueing, a circuit breaker
+    that fails fast during outages, and per-stage timeouts adapted to observed latency.
+    With a cassette, generations are recorded to or replayed from disk (see app/core/cassette.py).
+    """
+
+    def __init__(self, model: genai.GenerativeModel, max_concurrency: int, timeout_seconds: float,
+                 cassette: Optional[CassetteStore] = None, policy: Optional[UpstreamPolicy] = None):
+        self.model = model
+        self.cassette = cassette
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.policy = policy or build_policy(
+            UPSTREAM_GEMINI,
+            max_concurrency=max_concurrency,
+            max_waiting=settings.GEMINI_MAX_QUEUE_SIZE,
+            max_wait_seconds=settings.GEMINI_MAX_QUEUE_WAIT_SECONDS,
+            timeout_seconds=timeout_seconds,
+            min_timeout_seconds=settings.GEMINI_MIN_TIMEOUT_SECONDS,
+            # Replay misses and safety blocks say nothing about Gemini's health.
+            ignored_errors=(CassetteMissError, BlockedPromptException, StopCandidateException),
+        )
+        self._total_calls = 0
+        self._timeouts = 0
+        self._errors = 0
+
+    def _generate(self, prompt: str, stage: Optional[str], stream: bool = False):
+        if self.cassette is not None:
+            return self.cassette.generate_content(self.model, prompt, stage=stage, stream=stream)
+        if stream:
+            return self.model.generate_content_async(prompt, stream=True)
+        return self.model.generate_content_async(prompt)
+
+    async def generate_content(self, prompt: str, timeout: Optional[float] = None, stage: Optional[str] = None):
+        """
+        Generates content for a prompt, waiting for a free concurrency slot first.
+        `stage` labels the call's latency metrics (e.g. "investor_matcher.curate") and keys
+        its adaptive timeout; `timeout` replaces the static upper bound of that timeout.
+        Raises asyncio.TimeoutError if the call exceeds its timeout, and an
+        UpstreamUnavailableError without calling Gemini when its circuit is open or too
+        many calls are queued. Failures mark the current degradation scope, so results
+        built from a fallback are not cached.
+        """
+        try:
+            async with self.policy.call(stage, timeout) as call:
+                self._total_calls += 1
+                try:
+                    with track_stage(stage, UPSTREAM_GEMINI):
+                        return await asyncio.wait_for(self._generate(prompt, stage), timeout=call.timeout)
+                except asyncio.TimeoutError:
+                    self._timeouts += 1
+                    raise
+                except Exception:
+                    self._errors += 1
+                    raise
+        except Exception:
+            mark_degraded()
+            raise
+
+    async def stream_content(self, prompt: str, timeout: Optional[float] = None, stage: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Streams the generated text for a prompt chunk by chunk. The concurrency slot is held
+        until the stream is exhausted or closed, and the call's timeout bounds the whole stream.
+        """
+        try:
+            async with self.policy.call(stage, timeout) as call:
+                self._total_calls += 1
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + call.timeout
+                try:
+                    with track_stage(stage, UPSTREAM_GEMINI):
+                        response = await asyncio.wait_for(
+                            self._generate(prompt, stage, stream=True),
+                            timeout=deadline - loop.time(),
+                        )
+                        chunks = response.__aiter__()
+                        while True:
+                            try:
+                                chunk = await asyncio.wait_for(chunks.__anext__(), timeout=deadline - loop.time())
+                            except StopAsyncIteration:
+                                break
+                            if chunk.text:
+                                yield chunk.text
+                except asyncio.TimeoutError:
+                    self._timeouts += 1
+                    raise
+                except Exception:
+                    self._errors += 1
+                    raise
+        except Exception:
+            mark_degraded()
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the client's concurrency, queue-depth and resilience metrics.
+        """
+        resilience = self.policy.stats()
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.policy.bulkhead.in_flight,
+            "queue_depth": self.policy.bulkhead.waiting,
+            "max_queue_depth": resilience["bulkhead"]["max_waiting_seen"],
+            "total_calls": self._total_calls,
+            "timeouts": self._timeouts,
+            "errors": self._errors,
+            "resilience": resilience,
+        }
+
 
 _gemini_model: Optional[genai.GenerativeModel] = None
+_gemini_client: Optional[GeminiClient] = None
 
 def init_gemini_model():
-    global _gemini_model
+    global _gemini_model, _gemini_client
     if _gemini_model is None:
         try:
             genai.configure(api_key=settings.GOOGLE_API_KEY)
             _gemini_model = genai.GenerativeModel('gemini-1.5-flash')
-            print("Gemini 1.5 Flash model initialized successfully.")
+            _gemini_client = GeminiClient(
+                _gemini_model,
+                max_concurrency=settings.GEMINI_MAX_CONCURRENCY,
+                timeout_seconds=settings.GEMINI_CALL_TIMEOUT_SECONDS,
+                cassette=get_cassette(),
+            )
+            logger.info("Gemini 1.5 Flash model initialized successfully (max concurrency: %s).", settings.GEMINI_MAX_CONCURRENCY)
         except Exception as e:
-            print(f"ERROR: Failed to initialize Gemini model. Ensure GOOGLE_API_KEY is correct: {e}")
+            logger.error("Failed to initialize Gemini model. Ensure GOOGLE_API_KEY is correct: %s", e)
             _gemini_model = None
+            _gemini_client = None
 
 def get_gemini_model() -> genai.GenerativeModel:
     if _gemini_model is None:
         raise RuntimeError("Gemini model not initialized. Call init_gemini_model() on startup.")
-    return _gemini_model
\ No newline at end of file
+    return _gemini_model
+
+def get_gemini_client() -> GeminiClient:
+    if _gemini_client is None:
+        raise RuntimeError("Gemini client not initialized. Call init_gemini_model() on startup.")
+    return _gemini_client
@@ -0,0 +1,216 @@
+import redis.asyncio as redis
+from redis import exceptions as redis_exceptions
+from app.core.config import settings
+from app.core.redis import get_redis_client
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+TERMINAL_JOB_STATUSES = {JOB_SUCCEEDED, JOB_FAILED}
+
+
+class JobQueue:
+    """
+    Redis-backed job queue shared by the API (producer) and worker processes (consumers).
+
+    Job state lives in a hash `job:<id>`; the stream only carries job ids. Workers read
+    through a consumer group, so a job stays pending until acknowledged. A job whose
+    worker stops extending its lease for `visibility_timeout` seconds (crash, deploy) is
+    reclaimed by another worker. Failed attempts are left pending as well, so they are
+    retried after the visibility timeout until `max_attempts` is reached.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        stream_key: str,
+        group: str,
+        visibility_timeout: int,
+        max_attempts: int,
+        result_ttl: int,
+        maxlen: int,
+    ):
+        self.redis = redis_client
+        self.stream_key = stream_key
+        self.group = group
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.result_ttl = result_ttl
+        self.maxlen = maxlen
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _done_channel(job_id: str) -> str:
+        return f"job:{job_id}:done"
+
+    async def ensure_group(self):
+        try:
+            await self.redis.xgroup_create(self.stream_key, self.group, id="0", mkstream=True)
+        except redis_exceptions.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def submit(self, job_type: str, payload: str) -> str:
+        """
+        Stores a new job with its serialized input and enqueues it. Returns the job id.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), mapping={
+                "job_id": job_id,
+                "job_type": job_type,
+                "status": JOB_QUEUED,
+                "input": payload,
+                "attempts": 0,
+                "created_at": now,
+                "updated_at": now,
+            })
+            pipe.expire(self._job_key(job_id), self.result_ttl)
+            pipe.xadd(self.stream_key, {"job_id": job_id}, maxlen=self.maxlen, approximate=True)
+            await pipe.execute()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, str]]:
+        job = await self.redis.hgetall(self._job_key(job_id))
+        return job or None
+
+    async def claim(self, consumer: str, count: int, block_ms: int) -> List[Tuple[str, str]]:
+        """
+        Returns up to `count` (message_id, job_id) pairs for this consumer. Jobs abandoned by
+        other workers past the visibility timeout are reclaimed before new ones are read.
+        """
+        _, reclaimed, *_ = await self.redis.xautoclaim(
+            self.stream_key, self.group, consumer,
+            min_idle_time=self.visibility_timeout * 1000, start_id="0-0", count=count,
+        )
+        messages = [(message_id, fields) for message_id, fields in reclaimed if fields]
+        if not messages:
+            response = await self.redis.xreadgroup(self.group, consumer, {self.stream_key: ">"}, count=count, block=block_ms)
+            for _, stream_messages in response or []:
+                messages.extend(stream_messages)
+        return [(message_id, fields["job_id"]) for message_id, fields in messages]
+
+    async def start(self, message_id: str, job_id: str) -> Optional[Dict[str, str]]:
+        """
+        Marks a claimed job as running and returns it, or returns None (and acknowledges the
+        message) if the job expired or has used up its attempts.
+        """
+        job_key = self._job_key(job_id)
+        if not await self.redis.exists(job_key):
+            await self.redis.xack(self.stream_key, self.group, message_id)
+            return None
+
+        attempts = await self.redis.hincrby(job_key, "attempts", 1)
+        if attempts > self.max_attempts:
+            job = await self.get(job_id)
+            await self._finish(message_id, job_id, JOB_FAILED, error=job.get("error") or f"Job abandoned after {self.max_attempts} attempts.")
+            return None
+
+        await self.redis.hset(job_key, mapping={"status": JOB_RUNNING, "updated_at": time.time()})
+        return await self.get(job_id)
+
+    async def extend_lease(self, consumer: str, message_id: str):
+        """
+        Resets the idle time of a pending job so it is not reclaimed while still running.
+        """
+        await self.redis.xclaim(self.stream_key, self.group, consumer, min_idle_time=0, message_ids=[message_id], justid=True)
+
+    async def complete(self, message_id: str, job_id: str, result: str):
+        await self._finish(message_id, job_id, JOB_SUCCEEDED, result=result)
+
+    async def fail(self, message_id: str, job_id: str, error: str, retry: bool = True):
+        """
+        Records a failed attempt. Retryable jobs are left pending and picked up again once
+        the visibility timeout has passed; others are marked failed immediately.
+        """
+        job = await self.get(job_id) or {}
+        if retry and int(job.get("attempts", 0)) < self.max_attempts:
+            await self.redis.hset(self._job_key(job_id), mapping={"status": JOB_QUEUED, "error": error, "updated_at": time.time()})
+            return
+        await self._finish(message_id, job_id, JOB_FAILED, error=error)
+
+    async def _finish(self, message_id: str, job_id: str, status: str, result: Optional[str] = None, error: Optional[str] = None):
+        fields: Dict[str, Any] = {"status": status, "updated_at": time.time()}
+        if result is not None:
+            fields["result"] = result
+        if error is not None:
+            fields["error"] = error
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), mapping=fields)
+            pipe.expire(self._job_key(job_id), self.result_ttl)
+            pipe.xack(self.stream_key, self.group, message_id)
+            pipe.xdel(self.stream_key, message_id)
+            pipe.publish(self._done_channel(job_id), status)
+            await pipe.execute()
+
+    async def wait_for_completion(self, job_id: str, timeout: float) -> Optional[Dict[str, str]]:
+        """
+        Waits up to `timeout` seconds for a job to reach a terminal status and returns it.
+        Returns the job in its current state on timeout, or None if it does not exist.
+        """
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.subscribe(self._done_channel(job_id))
+            deadline = time.monotonic() + timeout
+            while True:
+                # Re-read after subscribing so a completion published in between is not missed.
+                job = await self.get(job_id)
+                if job is None or job.get("status") in TERMINAL_JOB_STATUSES:
+                    return job
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return job
+                await pubsub.get_message(ignore_subscribe_messages=True, timeout=min(remaining, 1.0))
+        finally:
+            await pubsub.reset()
+
+
+_job_queue: Optional[JobQueue] = None
+
+async def init_job_queue() -> Optional[JobQueue]:
+    """
+    Builds the shared job queue on top of the connected Redis client and makes sure the consumer group exists.
+    """
+    global _job_queue
+    if _job_queue is None:
+        try:
+            redis_client = await get_redis_client()
+        except ConnectionError as e:
+            logger.warning("Job queue not initialized: %s", e)
+            return None
+        queue = JobQueue(
+            redis_client,
+            stream_key=settings.JOB_STREAM_KEY,
+            group=settings.JOB_CONSUMER_GROUP,
+            visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            result_ttl=settings.JOB_RESULT_TTL_SECONDS,
+            maxlen=settings.JOB_STREAM_MAXLEN,
+        )
+        try:
+            await queue.ensure_group()
+        except redis_exceptions.RedisError as e:
+            logger.warning("Job queue not initialized: could not create consumer group: %s", e)
+            return None
+        _job_queue = queue
+    return _job_queue
+
+def close_job_queue():
+    global _job_queue
+    _job_queue = None
+
+def get_job_queue() -> JobQueue:
+    if _job_queue is None:
+        raise ConnectionError("Job queue is not initialized. Ensure init_job_queue() was called after connect_redis().")
+    return _job_queue
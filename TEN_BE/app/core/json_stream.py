@@ -0,0 +1,125 @@
+from app.core.gemini_client import GeminiClient
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+
+class _Frame:
+    __slots__ = ("kind", "start", "parent_key", "current_key", "expect_key")
+
+    def __init__(self, kind: str, start: int, parent_key: Optional[str]):
+        self.kind = kind
+        self.start = start
+        self.parent_key = parent_key
+        self.current_key: Optional[str] = None
+        self.expect_key = kind == "{"
+
+
+class IncrementalJSONParser:
+    """
+    Incrementally scans a JSON object as it arrives in chunks and reports every object
+    element of the top-level arrays named in `array_keys` as soon as its closing brace
+    is seen, e.g. each entry of "suggestions" in {"suggestions": [{...}, {...}], ...}.
+
+    Text before the root object (such as a ```json fence) is ignored. Once the root
+    object is closed, `document` holds the fully parsed JSON.
+    """
+
+    def __init__(self, array_keys: Iterable[str]):
+        self.array_keys = set(array_keys)
+        self.document: Optional[Dict[str, Any]] = None
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._root_start: Optional[int] = None
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Adds a chunk of text and returns the (array key, element) pairs completed by it.
+        """
+        self._text += chunk
+        completed: List[Tuple[str, Dict[str, Any]]] = []
+        text = self._text
+        while self._pos < len(text) and self.document is None:
+            char = text[self._pos]
+
+            if self._root_start is None:
+                if char == "{":
+                    self._root_start = self._pos
+                    self._stack.append(_Frame("{", self._pos, None))
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    top = self._stack[-1]
+                    if top.kind == "{" and top.expect_key:
+                        top.current_key = json.loads(text[self._string_start:self._pos + 1])
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif char in "{[":
+                parent = self._stack[-1]
+                self._stack.append(_Frame(char, self._pos, parent.current_key if parent.kind == "{" else None))
+            elif char in "}]":
+                frame = self._stack.pop()
+                if not self._stack:
+                    self.document = json.loads(text[self._root_start:self._pos + 1])
+                elif frame.kind == "{" and len(self._stack) == 2:
+                    array = self._stack[1]
+                    if array.kind == "[" and array.parent_key in self.array_keys:
+                        completed.append((array.parent_key, json.loads(text[frame.start:self._pos + 1])))
+            elif char == ":":
+                self._stack[-1].expect_key = False
+            elif char == ",":
+                top = self._stack[-1]
+                if top.kind == "{":
+                    top.expect_key = True
+            self._pos += 1
+        return completed
+
+
+async def _iter_gemini_json(gemini_client: GeminiClient, prompt: str, array_keys: Iterable[str], stage: Optional[str]) -> AsyncIterator[Tuple[Optional[str], Any]]:
+    parser = IncrementalJSONParser(array_keys)
+    chunks = gemini_client.stream_content(prompt, stage=stage)
+    try:
+        async for chunk in chunks:
+            for array_key, element in parser.feed(chunk):
+                yield array_key, element
+            if parser.document is not None:
+                break
+    finally:
+        await chunks.aclose()
+
+    if parser.document is None:
+        raise ValueError("Gemini stream ended before a complete JSON object was received.")
+    yield None, parser.document
+
+
+@asynccontextmanager
+async def stream_gemini_json(gemini_client: GeminiClient, prompt: str, array_keys: Iterable[str], stage: Optional[str] = None) -> AsyncIterator[AsyncIterator[Tuple[Optional[str], Any]]]:
+    """
+    Streams a Gemini response that is a single JSON object:
+
+        async with stream_gemini_json(client, prompt, ["suggestions"]) as events:
+            async for array_key, data in events:
+                ...
+
+    Yields (array key, element) for each completed element of the watched top-level
+    arrays, then (None, document) with the whole parsed object. Raises ValueError if the
+    response is not a complete JSON object. Leaving the block early closes the Gemini
+    stream and releases its concurrency slot.
+    """
+    events = _iter_gemini_json(gemini_client, prompt, array_keys, stage)
+    try:
+        yield events
+    finally:
+        await events.aclose()
@@ -0,0 +1,157 @@
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import uuid
+from typing import Optional
+
+from app.core.config import settings
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+# Attributes every LogRecord has; anything else was passed through `extra=` and is
+# emitted as a structured field.
+_STANDARD_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "sample_rate"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _ContextFilter(logging.Filter):
+    """
+    Drops sampled-out records and stamps the rest with the current request id.
+
+    Runs on the thread that logs (the event loop), so it sees the request's context
+    variables. A record logged with `extra={"sample_rate": 0.01}` is kept with that
+    probability; DEBUG records default to LOG_DEBUG_SAMPLE_RATE.
+    """
+
+    def __init__(self, debug_sample_rate: float):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        sample_rate = getattr(record, "sample_rate", None)
+        if sample_rate is None and record.levelno <= logging.DEBUG:
+            sample_rate = self.debug_sample_rate
+        if sample_rate is not None and sample_rate < 1.0 and random.random() >= sample_rate:
+            return False
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.request_id:
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _STANDARD_RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not getattr(record, "request_id", None):
+            record.request_id = "-"
+        return super().format(record)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge the message arguments here; formatting happens on the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging():
+    """
+    Routes all `app.*` loggers through a queue so log calls on the event loop never block
+    on stdout; a background listener thread formats and writes the records.
+    Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(_ContextFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JSONFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.LOG_LEVEL.upper())
+    app_logger.handlers = [queue_handler]
+    app_logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """
+    Flushes queued records and stops the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """
+    Assigns every HTTP request an id (a well-formed incoming X-Request-ID header, or a new one),
+    exposes it to log records through `request_id_var` and echoes it in the response.
+    Plain ASGI so streaming responses are passed through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._header = REQUEST_ID_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == self._header:
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not _VALID_REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(self._header, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
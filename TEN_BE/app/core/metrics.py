@@ -0,0 +1,284 @@
+from app.core.tracing import span
+from fastapi import Response
+import asyncio
+import bisect
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+METRIC_PREFIX = "ten"
+
+# Upper bounds in seconds; covers sub-millisecond Redis round trips up to slow Gemini calls.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Counter names used by namespace_stats() and TwoTierCache.stats() -> `result` label values.
+_CACHE_RESULT_LABELS = {"hits": "hit", "misses": "miss", "stale": "stale", "fallbacks": "fallback", "degraded": "degraded"}
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """
+    Cumulative latency histogram in Prometheus layout (per-bucket counts, sum and count).
+    """
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.bounds, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> List[int]:
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+# Keyed by (stage, upstream), e.g. ("competitor_radar.news_search", "serpapi").
+_stage_latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+_stage_errors: Dict[Tuple[str, str], int] = defaultdict(int)
+_stage_in_flight: Dict[Tuple[str, str], int] = defaultdict(int)
+
+# Keyed by (route template, method).
+_request_latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+_request_count: Dict[Tuple[str, str, str], int] = defaultdict(int)
+_requests_in_flight = 0
+
+
+class track_stage:
+    """
+    Times one upstream call and keeps the in-flight gauge for its stage:
+
+        with track_stage("competitor_radar.news_search", "serpapi"):
+            results = await session.get(...)
+
+    Exceptions are counted as errors and re-raised. The call is also recorded as a span
+    of the current trace, if any.
+    """
+    __slots__ = ("key", "started_at", "span")
+
+    def __init__(self, stage: Optional[str], upstream: str):
+        self.key = (stage or "other", upstream)
+        self.span = span(self.key[0], leaf=True, upstream=upstream)
+
+    def __enter__(self):
+        _stage_in_flight[self.key] += 1
+        self.span.__enter__()
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.span.__exit__(exc_type, exc, traceback)
+        _stage_latency[self.key].observe(time.perf_counter() - self.started_at)
+        _stage_in_flight[self.key] -= 1
+        # Closing a stream early or cancelling a caller is not an upstream failure.
+        if exc_type is not None and not issubclass(exc_type, (GeneratorExit, asyncio.CancelledError)):
+            _stage_errors[self.key] += 1
+        return False
+
+
+class MetricsMiddleware:
+    """
+    Records latency and status counts per route template (e.g. `/api/v1/jobs/{job_id}`),
+    so path parameters do not create new series. Plain ASGI; streaming responses are timed
+    until their last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _requests_in_flight
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = "500"
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = str(message["status"])
+            await send(message)
+
+        _requests_in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _requests_in_flight -= 1
+            # The router stores the matched route in the scope; unmatched paths share one series.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            key = (route, scope["method"])
+            _request_latency[key].observe(time.perf_counter() - started_at)
+            _request_count[(route, scope["method"], status_code)] += 1
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class _Exposition:
+    """
+    Builds the Prometheus text format; each metric family gets its HELP/TYPE header once.
+    """
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, metric_type: str, help_text: str, samples: Iterable[Tuple[Dict[str, Any], Any]]):
+        samples = list(samples)
+        if not samples:
+            return
+        full_name = f"{METRIC_PREFIX}_{name}"
+        self.lines.append(f"# HELP {full_name} {help_text}")
+        self.lines.append(f"# TYPE {full_name} {metric_type}")
+        for labels, value in samples:
+            self.lines.append(f"{full_name}{_labels(labels)} {_format_value(value)}")
+
+    def histograms(self, name: str, help_text: str, series: Dict[Tuple, Histogram], label_names: Tuple[str, ...]):
+        if not series:
+            return
+        full_name = f"{METRIC_PREFIX}_{name}"
+        self.lines.append(f"# HELP {full_name} {help_text}")
+        self.lines.append(f"# TYPE {full_name} histogram")
+        for key, histogram in sorted(series.items()):
+            labels = dict(zip(label_names, key))
+            for bound, count in zip(histogram.bounds, histogram.cumulative_counts()):
+                self.lines.append(f"{full_name}_bucket{_labels({**labels, 'le': f'{bound:g}'})} {count}")
+            self.lines.append(f"{full_name}_bucket{_labels({**labels, 'le': '+Inf'})} {histogram.count}")
+            self.lines.append(f"{full_name}_sum{_labels(labels)} {_format_value(histogram.sum)}")
+            self.lines.append(f"{full_name}_count{_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _optional_stats(getter: Callable[[], Any]) -> Optional[Dict[str, Any]]:
+    # Clients that failed to initialize are left out of the scrape rather than failing it.
+    try:
+        return getter().stats()
+    except (ConnectionError, RuntimeError):
+        return None
+
+
+def render_metrics() -> str:
+    """
+    Renders every collected metric in the Prometheus text exposition format. Counters kept
+    by the shared clients (Gemini, search, cache, rate limiter) are read at scrape time.
+    """
+    # Imported here because the clients below import this module for `track_stage`.
+    from app.core.cache import get_cache
+    from app.core.gemini_client import get_gemini_client
+    from app.core.search_client import get_search_client
+    from app.core.rate_limit import get_rate_limiter
+    from app.core.result_cache import namespace_stats
+    from app.core.prompt_builder import prompt_stats
+    from app.core.cassette import get_cassette
+    from app.core.resilience import CIRCUIT_STATES
+
+    out = _Exposition()
+    stage_labels = ("stage", "upstream")
+    out.histograms("upstream_latency_seconds", "Latency of upstream calls by service stage.", _stage_latency, stage_labels)
+    out.family("upstream_errors_total", "counter", "Upstream calls that raised, by service stage.",
+               ((dict(zip(stage_labels, key)), count) for key, count in sorted(_stage_errors.items())))
+    out.family("upstream_in_flight", "gauge", "Upstream calls currently running, by service stage.",
+               ((dict(zip(stage_labels, key)), count) for key, count in sorted(_stage_in_flight.items())))
+
+    out.histograms("http_request_duration_seconds", "HTTP request latency by route.", _request_latency, ("route", "method"))
+    out.family("http_requests_total", "counter", "HTTP requests by route and status code.",
+               (({"route": route, "method": method, "status": status_code}, count) for (route, method, status_code), count in sorted(_request_count.items())))
+    out.family("http_requests_in_flight", "gauge", "HTTP requests currently being served.", [({}, _requests_in_flight)])
+
+    cache = _optional_stats(get_cache)
+    namespaces = {**(cache["namespaces"] if cache is not None else {}), **namespace_stats()}
+    cache_samples = [
+        ({"namespace": namespace, "result": _CACHE_RESULT_LABELS[counter]}, count)
+        for namespace, counts in sorted(namespaces.items())
+        for counter, count in counts.items()
+    ]
+    out.family("cache_requests_total", "counter", "Cache lookups by key namespace and result (hit, miss, stale, fallback, degraded).", cache_samples)
+
+    if cache is not None:
+        l1 = cache["l1"]
+        out.family("cache_l1_entries", "gauge", "Entries in the in-process L1 cache.", [({}, l1["size"])])
+        out.family("cache_l1_requests_total", "counter", "L1 cache lookups by result.", [({"result": "hit"}, l1["hits"]), ({"result": "miss"}, l1["misses"])])
+        out.family("cache_l1_evictions_total", "counter", "L1 entries evicted to stay within the size limit.", [({}, l1["evictions"])])
+        out.family("cache_l2_requests_total", "counter", "Redis cache lookups by result.", [({"result": "hit"}, cache["l2_hits"]), ({"result": "miss"}, cache["l2_misses"])])
+        out.family("cache_background_refreshes_total", "counter", "Stale entries refreshed in the background.", [({}, cache["background_refreshes"])])
+
+    gemini = _optional_stats(get_gemini_client)
+    if gemini is not None:
+        out.family("gemini_in_flight", "gauge", "Gemini calls holding a concurrency slot.", [({}, gemini["in_flight"])])
+        out.family("gemini_queue_depth", "gauge", "Gemini calls waiting for a concurrency slot.", [({}, gemini["queue_depth"])])
+        out.family("gemini_calls_total", "counter", "Gemini calls started.", [({}, gemini["total_calls"])])
+        out.family("gemini_timeouts_total", "counter", "Gemini calls cancelled by their timeout.", [({}, gemini["timeouts"])])
+        out.family("gemini_errors_total", "counter", "Gemini calls that failed.", [({}, gemini["errors"])])
+
+    search = _optional_stats(get_search_client)
+    if search is not None:
+        out.family("search_in_flight", "gauge", "SerpAPI searches currently running.", [({}, search["in_flight"])])
+        out.family("search_requests_total", "counter", "SerpAPI HTTP requests, including retries.", [({}, search["total_requests"])])
+        out.family("search_retries_total", "counter", "SerpAPI requests retried.", [({}, search["retries"])])
+        out.family("search_timeouts_total", "counter", "SerpAPI requests that timed out.", [({}, search["timeouts"])])
+        out.family("search_errors_total", "counter", "SerpAPI requests that failed after retries.", [({}, search["errors"])])
+
+    policies = [(upstream, stats["resilience"]) for upstream, stats in (("gemini", gemini), ("serpapi", search)) if stats is not None]
+    if policies:
+        out.family("upstream_circuit_state", "gauge", "Circuit breaker state per upstream (1 for the current state).",
+                   (({"upstream": upstream, "state": state}, int(policy["circuit"]["state"] == state)) for upstream, policy in policies for state in CIRCUIT_STATES))
+        out.family("upstream_circuit_opened_total", "counter", "Times an upstream's circuit breaker opened.",
+                   (({"upstream": upstream}, policy["circuit"]["times_opened"]) for upstream, policy in policies))
+        out.family("upstream_rejected_total", "counter", "Upstream calls failed fast without being sent, by reason.",
+                   (sample for upstream, policy in policies for sample in (({"upstream": upstream, "reason": "circuit_open"}, policy["circuit"]["rejected"]),
+                                                                            ({"upstream": upstream, "reason": "bulkhead_full"}, policy["bulkhead"]["rejected"]))))
+        out.family("upstream_bulkhead_waiting", "gauge", "Upstream calls waiting for a bulkhead slot.",
+                   (({"upstream": upstream}, policy["bulkhead"]["waiting"]) for upstream, policy in policies))
+        out.family("upstream_timeout_seconds", "gauge", "Current adaptive call timeout by service stage.",
+                   (({"stage": stage, "upstream": upstream}, seconds) for upstream, policy in policies for stage, seconds in policy["timeouts"].items()))
+
+    limiter = _optional_stats(get_rate_limiter)
+    if limiter is not None:
+        out.family("rate_limit_decisions_total", "counter", "Rate limit decisions by result.", [({"result": "allowed"}, limiter["allowed"]), ({"result": "rejected"}, limiter["rejected"])])
+        out.family("rate_limit_sync_errors_total", "counter", "Failed rate limit reconciliations with Redis.", [({}, limiter["sync_errors"])])
+
+    cassette = get_cassette()
+    if cassette is not None:
+        out.family("cassette_requests_total", "counter", "Upstream calls recorded or replayed by the cassette, by result (recorded, replayed, misses).",
+                   (({"upstream": upstream, "result": result}, count) for upstream, counts in sorted(cassette.stats()["upstreams"].items()) for result, count in counts.items()))
+
+    prompts = sorted(prompt_stats().items())
+    out.family("prompts_total", "counter", "Gemini prompts built, by prompt namespace.", (({"namespace": namespace}, counts["prompts"]) for namespace, counts in prompts))
+    out.family("prompt_estimated_tokens_total", "counter", "Estimated tokens sent, by prompt namespace.", (({"namespace": namespace}, counts["estimated_tokens"]) for namespace, counts in prompts))
+    out.family("prompts_over_budget_total", "counter", "Prompts trimmed to fit their token budget.", (({"namespace": namespace}, counts["over_budget"]) for namespace, counts in prompts))
+
+    return out.render()
+
+
+async def metrics_endpoint() -> Response:
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
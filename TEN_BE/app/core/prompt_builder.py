@@ -0,0 +1,194 @@
+from app.core.config import settings
+from app.core.cache_codec import dumps_compact
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_INLINE_WHITESPACE_RE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n{2,}")
+_ANY_WHITESPACE_RE = re.compile(r"\s+")
+
+_TRUNCATION_MARKER = "…"
+
+_prompt_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {
+    "prompts": 0,
+    "estimated_tokens": 0,
+    "max_estimated_tokens": 0,
+    "raw_estimated_tokens": 0,
+    "over_budget": 0,
+})
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap local estimate of the Gemini token count (about four characters per token).
+    """
+    return (len(text) + 3) // 4
+
+
+def compact_text(text: str) -> str:
+    """
+    Strips indentation and trailing spaces, collapses runs of spaces and blank lines.
+    Used on prompt templates written as indented triple-quoted strings.
+    """
+    lines = (_INLINE_WHITESPACE_RE.sub(" ", line).strip() for line in text.strip().splitlines())
+    return _BLANK_LINES_RE.sub("\n", "\n".join(lines))
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """
+    Shortens text to at most `max_chars` characters, cutting at a word boundary where possible.
+    """
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= len(_TRUNCATION_MARKER):
+        return text[:max_chars]
+    cut = text[:max_chars - len(_TRUNCATION_MARKER)]
+    boundary = cut.rfind(" ")
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + _TRUNCATION_MARKER
+
+
+def clean_snippets(snippets: Iterable[Optional[str]], max_chars: Optional[int] = None, max_items: Optional[int] = None) -> List[str]:
+    """
+    Normalizes whitespace, drops empty and duplicate snippets (ignoring case) and
+    truncates each to `max_chars`. Keeps the first `max_items` in input order.
+    Defaults come from PROMPT_SNIPPET_MAX_CHARS and PROMPT_MAX_SNIPPETS.
+    """
+    max_chars = max_chars or settings.PROMPT_SNIPPET_MAX_CHARS
+    max_items = max_items or settings.PROMPT_MAX_SNIPPETS
+    cleaned: List[str] = []
+    seen = set()
+    for snippet in snippets:
+        if not snippet:
+            continue
+        text = _ANY_WHITESPACE_RE.sub(" ", snippet).strip()
+        key = text.casefold()
+        if not text or key in seen:
+            continue
+        seen.add(key)
+        cleaned.append(truncate_text(text, max_chars))
+        if len(cleaned) >= max_items:
+            break
+    return cleaned
+
+
+def get_prompt_budget(namespace: str) -> int:
+    return settings.PROMPT_TOKEN_BUDGETS.get(namespace, settings.PROMPT_TOKEN_BUDGET_DEFAULT)
+
+
+class _ItemsPart:
+    __slots__ = ("items", "separator", "prefix", "suffix", "min_items")
+
+    def __init__(self, items: List[str], separator: str, prefix: str, suffix: str, min_items: int):
+        self.items = items
+        self.separator = separator
+        self.prefix = prefix
+        self.suffix = suffix
+        self.min_items = min_items
+
+    def render(self) -> str:
+        return self.prefix + self.separator.join(self.items) + self.suffix
+
+    def items_tokens(self) -> int:
+        return estimate_tokens(self.separator.join(self.items))
+
+
+class PromptBuilder:
+    """
+    Assembles a Gemini prompt from fixed instruction text and variable-size item lists
+    (search snippets, serialized profiles), keeping it within the token budget of its
+    namespace (PROMPT_TOKEN_BUDGETS, else PROMPT_TOKEN_BUDGET_DEFAULT):
+
+        builder = PromptBuilder("competitor_trends")
+        builder.add_text(instructions)
+        builder.add_items(snippets, separator="; ", prefix="Snippets: ")
+        prompt = builder.build()
+
+    Text parts are whitespace-compacted and never trimmed. When the prompt is over budget,
+    items are dropped from the end of the largest list first, then the largest remaining
+    item is truncated.
+    """
+
+    def __init__(self, namespace: str, budget: Optional[int] = None):
+        self.namespace = namespace
+        self.budget = budget or get_prompt_budget(namespace)
+        self._parts: List[Any] = []
+        self._raw_chars = 0
+
+    def add_text(self, text: str) -> "PromptBuilder":
+        self._raw_chars += len(text)
+        self._parts.append(compact_text(text))
+        return self
+
+    def add_items(self, items: Iterable[str], separator: str = "\n", prefix: str = "", suffix: str = "", min_items: int = 0) -> "PromptBuilder":
+        """
+        Adds a list part rendered as prefix + separator.join(items) + suffix. At least
+        `min_items` items are kept (truncated if needed) when trimming to the budget.
+        """
+        items = [item for item in items if item]
+        self._raw_chars += len(prefix) + len(suffix) + len(separator.join(items))
+        self._parts.append(_ItemsPart(items, separator, prefix, suffix, min_items))
+        return self
+
+    def add_json_items(self, items: Iterable[Any], prefix: str = "[", suffix: str = "]", min_items: int = 0) -> "PromptBuilder":
+        """
+        Adds a JSON array part with each element serialized compactly.
+        """
+        return self.add_items((dumps_compact(item) for item in items), separator=",", prefix=prefix, suffix=suffix, min_items=min_items)
+
+    def _render(self) -> str:
+        return "\n".join(part.render() if isinstance(part, _ItemsPart) else part for part in self._parts)
+
+    def _trim(self, excess_tokens: int):
+        item_parts = [part for part in self._parts if isinstance(part, _ItemsPart)]
+        while excess_tokens > 0:
+            droppable = [part for part in item_parts if len(part.items) > part.min_items]
+            if not droppable:
+                break
+            part = max(droppable, key=lambda p: p.items_tokens())
+            dropped = part.items.pop()
+            excess_tokens -= estimate_tokens(dropped + part.separator)
+
+        while excess_tokens > 0:
+            candidates = [(part, index) for part in item_parts for index in range(len(part.items)) if part.items[index]]
+            if not candidates:
+                break
+            part, index = max(candidates, key=lambda c: len(c[0].items[c[1]]))
+            item = part.items[index]
+            keep_chars = max(len(item) - excess_tokens * 4, len(item) // 2)
+            if keep_chars >= len(item):
+                break
+            part.items[index] = truncate_text(item, keep_chars)
+            excess_tokens -= estimate_tokens(item) - estimate_tokens(part.items[index])
+
+    def build(self) -> str:
+        prompt = self._render()
+        tokens = estimate_tokens(prompt)
+        over_budget = tokens > self.budget
+        if over_budget:
+            self._trim(tokens - self.budget)
+            prompt = self._render()
+            logger.debug("%s prompt trimmed from ~%s to ~%s tokens (budget %s).", self.namespace, tokens, estimate_tokens(prompt), self.budget)
+            tokens = estimate_tokens(prompt)
+
+        stats = _prompt_stats[self.namespace]
+        stats["prompts"] += 1
+        stats["estimated_tokens"] += tokens
+        stats["raw_estimated_tokens"] += (self._raw_chars + 3) // 4
+        stats["max_estimated_tokens"] = max(stats["max_estimated_tokens"], tokens)
+        if over_budget:
+            stats["over_budget"] += 1
+        return prompt
+
+
+def prompt_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Returns prompt-size counters per prompt namespace. `raw_estimated_tokens` is the size
+    before compaction and trimming, for comparison with `estimated_tokens`.
+    """
+    return {namespace: dict(counts) for namespace, counts in _prompt_stats.items()}
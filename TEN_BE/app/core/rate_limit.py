@@ -0,0 +1,230 @@
+import redis.asyncio as redis
+from redis import exceptions as redis_exceptions
+from fastapi import Depends, HTTPException, Request, status
+from app.core.config import settings
+from app.core.redis import get_redis_client
+from app.core.security import get_api_key
+import asyncio
+import hashlib
+import math
+import time
+from typing import Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Relative cost of one request, roughly the number of upstream (Gemini + SerpAPI) calls it
+# can trigger. Unlisted routes cost 1. `/stream` variants cost the same as their route and
+# job submissions cost the same as the analysis they queue. Overridden by RATE_LIMIT_ROUTE_COSTS.
+DEFAULT_ROUTE_COSTS: Dict[str, float] = {
+    "/api/v1/scan-reputation": 4,
+    "/api/v1/match-investors": 8,
+    "/api/v1/competitor-radar": 13,
+    "/api/v1/navigator": 14,
+    "/api/v1/analyze-risk/batch": 20,
+    "/api/v1/traction-estimator/batch": 20,
+}
+
+_STREAM_SUFFIX = "/stream"
+_JOB_SUBMIT_PATH = "/api/v1/jobs/{job_type}"
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated_at", "pending", "last_total")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated_at = now
+        self.pending = 0.0
+        self.last_total: Optional[float] = None
+
+
+class RateLimiter:
+    """
+    Per-API-key token buckets held in process memory, so admitting a request never waits
+    on the network. Each key may spend `capacity` cost units, refilled continuously over
+    `window_seconds`.
+
+    Buckets are reconciled with Redis in the background every `sync_interval` seconds:
+    each worker adds what it spent to a shared per-key counter and deducts what the other
+    workers spent since the last sync from its own bucket. Limits are therefore enforced
+    across workers with at most one sync interval of lag. Without Redis, each worker
+    enforces the limit on its own.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis], capacity: float, window_seconds: float, sync_interval: float, route_costs: Dict[str, float]):
+        self.redis = redis_client
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.refill_rate = capacity / window_seconds
+        self.sync_interval = sync_interval
+        self.route_costs = route_costs
+        self._buckets: Dict[str, _Bucket] = {}
+        self._sync_task: Optional[asyncio.Task] = None
+        self._allowed = 0
+        self._rejected = 0
+        self._sync_errors = 0
+
+    @staticmethod
+    def _client_id(api_key: str) -> str:
+        # Raw API keys are never used as Redis keys.
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+    def _counter_key(self, client_id: str) -> str:
+        return f"ratelimit:{client_id}"
+
+    def route_cost(self, route_path: str, job_type: Optional[str] = None) -> float:
+        if route_path == _JOB_SUBMIT_PATH and job_type:
+            route_path = f"/api/v1/{job_type}"
+        if route_path.endswith(_STREAM_SUFFIX):
+            route_path = route_path[:-len(_STREAM_SUFFIX)]
+        return self.route_costs.get(route_path, 1)
+
+    def _refill(self, bucket: _Bucket, now: float):
+        bucket.tokens = min(self.capacity, bucket.tokens + (now - bucket.updated_at) * self.refill_rate)
+        bucket.updated_at = now
+
+    def acquire(self, api_key: str, cost: float) -> Tuple[bool, float]:
+        """
+        Spends `cost` units from the key's bucket. Returns (allowed, seconds until the
+        request would be allowed).
+        """
+        now = time.monotonic()
+        client_id = self._client_id(api_key)
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = self._buckets[client_id] = _Bucket(self.capacity, now)
+        else:
+            self._refill(bucket, now)
+
+        # A request costing more than the whole bucket is admitted once the bucket is full.
+        cost = min(cost, self.capacity)
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            bucket.pending += cost
+            self._allowed += 1
+            return True, 0.0
+        self._rejected += 1
+        return False, (cost - bucket.tokens) / self.refill_rate
+
+    async def sync(self):
+        """
+        Publishes local spending to Redis and applies the other workers' spending locally.
+        """
+        if self.redis is None or not self._buckets:
+            return
+        items = list(self._buckets.items())
+        pushed = {client_id: bucket.pending for client_id, bucket in items}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for client_id, _ in items:
+                pipe.incrbyfloat(self._counter_key(client_id), pushed[client_id])
+                pipe.expire(self._counter_key(client_id), int(self.window_seconds * 2))
+            results = await pipe.execute()
+
+        now = time.monotonic()
+        for index, (client_id, bucket) in enumerate(items):
+            total = float(results[index * 2])
+            bucket.pending -= pushed[client_id]
+            if bucket.last_total is not None:
+                remote_spent = max(total - bucket.last_total - pushed[client_id], 0.0)
+                if remote_spent:
+                    self._refill(bucket, now)
+                    bucket.tokens = max(bucket.tokens - remote_spent, -self.capacity)
+            bucket.last_total = total
+
+        # Forget keys that have been idle long enough to be full again.
+        idle_cutoff = now - self.window_seconds * 2
+        for client_id, bucket in items:
+            if bucket.updated_at < idle_cutoff and not bucket.pending:
+                self._buckets.pop(client_id, None)
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except redis_exceptions.RedisError as e:
+                self._sync_errors += 1
+                logger.error("Could not reconcile rate limits with Redis: %s", e)
+
+    def start(self):
+        if self.redis is not None and self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self):
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+        try:
+            await self.sync()
+        except redis_exceptions.RedisError:
+            pass
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "window_seconds": self.window_seconds,
+            "tracked_keys": len(self._buckets),
+            "allowed": self._allowed,
+            "rejected": self._rejected,
+            "sync_errors": self._sync_errors,
+        }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+async def init_rate_limiter() -> RateLimiter:
+    """
+    Creates the process-wide rate limiter and starts its Redis reconciliation, if Redis is connected.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        try:
+            redis_client = await get_redis_client()
+        except ConnectionError as e:
+            logger.warning("Rate limits will be enforced per worker only: %s", e)
+            redis_client = None
+        _rate_limiter = RateLimiter(
+            redis_client,
+            capacity=settings.RATE_LIMIT_REQUESTS,
+            window_seconds=settings.RATE_LIMIT_WINDOW_SECONDS,
+            sync_interval=settings.RATE_LIMIT_SYNC_INTERVAL_SECONDS,
+            route_costs={**DEFAULT_ROUTE_COSTS, **settings.RATE_LIMIT_ROUTE_COSTS},
+        )
+        _rate_limiter.start()
+    return _rate_limiter
+
+async def close_rate_limiter():
+    global _rate_limiter
+    if _rate_limiter is not None:
+        await _rate_limiter.stop()
+        _rate_limiter = None
+
+def get_rate_limiter() -> RateLimiter:
+    if _rate_limiter is None:
+        raise RuntimeError("Rate limiter not initialized. Call init_rate_limiter() on startup.")
+    return _rate_limiter
+
+
+async def enforce_rate_limit(request: Request, api_key: str = Depends(get_api_key)) -> str:
+    """
+    Route dependency: authenticates the API key and charges the route's cost to its quota.
+    Raises 429 with Retry-After when the quota is exhausted.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return api_key
+    limiter = get_rate_limiter()
+    route = request.scope.get("route")
+    cost = limiter.route_cost(getattr(route, "path", request.url.path), request.path_params.get("job_type"))
+    allowed, retry_after = limiter.acquire(api_key, cost)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded. Try again later.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    return api_key
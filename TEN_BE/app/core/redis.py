@@ -3,8 +3,12 @@ from redis import exceptions as redis_exceptions
 from app.core.config import settings
 import asyncio
 from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 _redis_client: Optional[redis.Redis] = None
+_redis_binary_client: Optional[redis.Redis] = None
 _lock = asyncio.Lock()
 
 async def connect_redis():
@@ -12,7 +16,7 @@ async def connect_redis():
     Establishes a connection to the Redis server.
     Ensures only one connection attempt at a time.
     """
-    global _redis_client
+    global _redis_client, _redis_binary_client
     async with _lock:
         if _redis_client is None:
             try:
@@ -21,26 +25,36 @@ async def connect_redis():
                     decode_responses=True,
                 )
                 await _redis_client.ping()
-                print("Successfully connected to Upstash Redis!")
+                # Cache values are stored in a compact binary encoding, so the cache gets its own raw client.
+                _redis_binary_client = redis.from_url(
+                    settings.REDIS_URL,
+                    decode_responses=False,
+                )
+                logger.info("Successfully connected to Upstash Redis!")
             except redis_exceptions.ConnectionError as e:
-                print(f"ERROR: Could not connect to Redis at {settings.REDIS_URL}: {e}. Check URL, credentials, and network.")
+                logger.error("Could not connect to Redis at %s: %s. Check URL, credentials, and network.", settings.REDIS_URL, e)
                 _redis_client = None
+                _redis_binary_client = None
             except Exception as e:
-                print(f"An unexpected error occurred during Redis connection: {e}")
+                logger.error("An unexpected error occurred during Redis connection: %s", e)
                 _redis_client = None
+                _redis_binary_client = None
 
 
 async def disconnect_redis():
     """
     Closes the connection to the Redis server.
     """
-    global _redis_client
+    global _redis_client, _redis_binary_client
     async with _lock:
         if _redis_client:
-            print("Disconnecting from Redis...")
+            logger.info("Disconnecting from Redis...")
             await _redis_client.close()
             _redis_client = None
-            print("Redis disconnected.")
+            if _redis_binary_client:
+                await _redis_binary_client.close()
+                _redis_binary_client = None
+            logger.info("Redis disconnected.")
 
 
 async def get_redis_client() -> redis.Redis:
@@ -51,3 +65,13 @@ async def get_redis_client() -> redis.Redis:
     if _redis_client is None:
         raise ConnectionError("Redis client is not initialized. Ensure connect_redis() was called successfully.")
     return _redis_client
+
+
+async def get_redis_binary_client() -> redis.Redis:
+    """
+    Returns the global Redis client that does not decode responses (used for binary cache values).
+    Raises an error if the client has not been initialized.
+    """
+    if _redis_binary_client is None:
+        raise ConnectionError("Redis client is not initialized. Ensure connect_redis() was called successfully.")
+    return _redis_binary_client
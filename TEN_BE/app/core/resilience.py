@@ -0,0 +1,377 @@
+from app.core.config import settings
+import asyncio
+import contextlib
+import math
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple, Type
+import logging
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+CIRCUIT_STATES = (CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN)
+
+
+class UpstreamUnavailableError(RuntimeError):
+    """
+    Raised without calling the upstream, so callers fall back immediately.
+    """
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """
+    Raised while an upstream's circuit breaker is open.
+    """
+
+
+class BulkheadFullError(UpstreamUnavailableError):
+    """
+    Raised when all of an upstream's concurrency slots are taken and its wait queue is
+    full, or a slot did not free up within the allowed wait.
+    """
+
+
+def _percentile(samples: Deque[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(percentile / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class AdaptiveTimeout:
+    """
+    Per-stage call deadlines derived from recent successful latencies: the configured
+    percentile of the last `window` calls times `multiplier`, clamped to [floor, ceiling].
+    A stage with fewer than `min_samples` successful calls uses the ceiling, which is the
+    configured static timeout unless the caller passes its own.
+    """
+
+    def __init__(self, ceiling: float, floor: float, percentile: float, multiplier: float,
+                 window: int, min_samples: int, enabled: bool = True):
+        self.ceiling = ceiling
+        self.floor = floor
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.window = window
+        self.min_samples = min_samples
+        self.enabled = enabled
+        self._samples: Dict[str, Deque[float]] = {}
+        self._adaptive: Dict[str, float] = {}
+
+    def observe(self, stage: Optional[str], seconds: float):
+        if not self.enabled:
+            return
+        key = stage or "other"
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+        # Recomputed on the next lookup.
+        self._adaptive.pop(key, None)
+
+    def timeout(self, stage: Optional[str], ceiling: Optional[float] = None) -> float:
+        ceiling = ceiling or self.ceiling
+        if not self.enabled:
+            return ceiling
+        key = stage or "other"
+        adaptive = self._adaptive.get(key)
+        if adaptive is None:
+            samples = self._samples.get(key)
+            if samples is None or len(samples) < self.min_samples:
+                return ceiling
+            adaptive = self._adaptive[key] = _percentile(samples, self.percentile) * self.multiplier
+        return min(ceiling, max(self.floor, adaptive))
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the current deadline per stage that has recorded latencies.
+        """
+        return {stage: round(self.timeout(stage), 3) for stage in sorted(self._samples)}
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast while an upstream is unhealthy. The circuit opens when at least
+    `failure_rate` of the calls finished in the last `window_seconds` failed (and there
+    were at least `min_calls`), rejects every call for `open_seconds`, then lets
+    `half_open_calls` trial calls through: if they all succeed it closes again, and the
+    first failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_rate: float, min_calls: int, window_seconds: float,
+                 open_seconds: float, half_open_calls: int, enabled: bool = True):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.enabled = enabled
+        self._state = CIRCUIT_CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = CIRCUIT_HALF_OPEN
+            self._trial_successes = 0
+            logger.info("%s circuit half-open; letting %s trial call(s) through.", self.name, self.half_open_calls)
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Admits a call or raises CircuitOpenError. Returns True for half-open trial calls,
+        which must be passed back to `record` or `release`.
+        """
+        if not self.enabled:
+            return False
+        state = self.state
+        if state == CIRCUIT_CLOSED:
+            return False
+        if state == CIRCUIT_HALF_OPEN and self._trials < self.half_open_calls:
+            self._trials += 1
+            return True
+        self._rejected += 1
+        raise CircuitOpenError(f"{self.name} circuit is open; failing fast.")
+
+    def release(self, trial: bool):
+        """
+        Ends a call without an outcome (e.g. cancelled by its caller).
+        """
+        if trial:
+            self._trials -= 1
+
+    def record(self, success: bool, trial: bool):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if trial:
+            self._trials -= 1
+            if self._state != CIRCUIT_HALF_OPEN:
+                return
+            if not success:
+                self._open(now, "trial call failed")
+                return
+            self._trial_successes += 1
+            if self._trial_successes >= self.half_open_calls:
+                self._close()
+            return
+
+        # Calls admitted before the circuit opened do not count once it has.
+        if self._state != CIRCUIT_CLOSED:
+            return
+        self._outcomes.append((now, success))
+        if not success:
+            self._failures += 1
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            if not self._outcomes.popleft()[1]:
+                self._failures -= 1
+        calls = len(self._outcomes)
+        if not success and calls >= self.min_calls and self._failures / calls >= self.failure_rate:
+            self._open(now, f"{self._failures} of the last {calls} calls failed")
+
+    def _open(self, now: float, reason: str):
+        self._state = CIRCUIT_OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self._failures = 0
+        self._times_opened += 1
+        logger.warning("%s circuit opened (%s); failing fast for %.1fs.", self.name, reason, self.open_seconds)
+
+    def _close(self):
+        self._state = CIRCUIT_CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+        logger.info("%s circuit closed.", self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = len(self._outcomes)
+        return {
+            "state": self.state,
+            "window_calls": calls,
+            "window_failure_rate": round(self._failures / calls, 3) if calls else 0.0,
+            "times_opened": self._times_opened,
+            "rejected": self._rejected,
+        }
+
+
+class Bulkhead:
+    """
+    Caps the concurrent calls to one upstream, so a slow dependency holds at most
+    `max_concurrency` calls and `max_waiting` queued callers instead of every request.
+    Callers beyond the queue, or waiting longer than `max_wait_seconds`, get
+    BulkheadFullError.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_waiting: int, max_wait_seconds: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_waiting
+        self.max_wait_seconds = max_wait_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._max_waiting_seen = 0
+        self._in_flight = 0
+        self._rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    async def acquire(self):
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            self._in_flight += 1
+            return
+        if self._waiting >= self.max_waiting:
+            self._rejected += 1
+            raise BulkheadFullError(f"{self.name} bulkhead is full ({self.max_concurrency} running, {self._waiting} waiting).")
+
+        self._waiting += 1
+        self._max_waiting_seen = max(self._max_waiting_seen, self._waiting)
+        # A separate task rather than wait_for(), which can drop a permit acquired just as
+        # the wait times out on Python < 3.12.
+        acquiring = asyncio.ensure_future(self._semaphore.acquire())
+        try:
+            await asyncio.wait((acquiring,), timeout=self.max_wait_seconds)
+        except BaseException:
+            if acquiring.done() and not acquiring.cancelled():
+                self._semaphore.release()
+            else:
+                acquiring.cancel()
+            raise
+        finally:
+            self._waiting -= 1
+        if not acquiring.done():
+            acquiring.cancel()
+            self._rejected += 1
+            raise BulkheadFullError(f"{self.name} bulkhead: no free slot within {self.max_wait_seconds}s.")
+        self._in_flight += 1
+
+    def release(self):
+        self._in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "max_waiting_seen": self._max_waiting_seen,
+            "rejected": self._rejected,
+        }
+
+
+class UpstreamCall:
+    """
+    Handle for one guarded call: its deadline, and a flag for calls that returned but
+    should still count as failures (e.g. a 5xx response after the last retry).
+    """
+    __slots__ = ("timeout", "failed")
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.failed = False
+
+    def mark_failed(self):
+        self.failed = True
+
+
+class UpstreamPolicy:
+    """
+    Circuit breaker, bulkhead and adaptive deadlines for one upstream:
+
+        async with policy.call(stage, timeout) as call:
+            return await asyncio.wait_for(send(), timeout=call.timeout)
+
+    Timeouts and other exceptions count as failures, except `ignored_errors`;
+    cancellations count as neither. Successful calls feed the stage's deadline.
+    """
+
+    def __init__(self, upstream: str, breaker: CircuitBreaker, bulkhead: Bulkhead, deadlines: AdaptiveTimeout,
+                 ignored_errors: Tuple[Type[BaseException], ...] = ()):
+        self.upstream = upstream
+        self.breaker = breaker
+        self.bulkhead = bulkhead
+        self.deadlines = deadlines
+        self.ignored_errors = ignored_errors
+
+    @contextlib.asynccontextmanager
+    async def call(self, stage: Optional[str], timeout: Optional[float] = None) -> AsyncIterator[UpstreamCall]:
+        trial = self.breaker.allow()
+        try:
+            await self.bulkhead.acquire()
+        except BaseException:
+            self.breaker.release(trial)
+            raise
+
+        call = UpstreamCall(self.deadlines.timeout(stage, timeout))
+        started_at = time.perf_counter()
+        try:
+            yield call
+        except GeneratorExit:
+            # A stream closed early by its consumer; the upstream answered.
+            self.breaker.record(True, trial)
+            raise
+        except self.ignored_errors:
+            self.breaker.release(trial)
+            raise
+        except Exception:
+            self.breaker.record(False, trial)
+            raise
+        except BaseException:
+            self.breaker.release(trial)
+            raise
+        else:
+            self.breaker.record(not call.failed, trial)
+            if not call.failed:
+                self.deadlines.observe(stage, time.perf_counter() - started_at)
+        finally:
+            self.bulkhead.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.stats(),
+            "bulkhead": self.bulkhead.stats(),
+            "timeouts": self.deadlines.stats(),
+        }
+
+
+def build_policy(upstream: str, max_concurrency: int, max_waiting: int, max_wait_seconds: float,
+                 timeout_seconds: float, min_timeout_seconds: float,
+                 ignored_errors: Tuple[Type[BaseException], ...] = ()) -> UpstreamPolicy:
+    """
+    Builds an upstream's policy with the shared CIRCUIT_BREAKER_* and ADAPTIVE_TIMEOUT_* settings.
+    """
+    breaker = CircuitBreaker(
+        upstream,
+        failure_rate=settings.CIRCUIT_BREAKER_FAILURE_RATE,
+        min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+        window_seconds=settings.CIRCUIT_BREAKER_WINDOW_SECONDS,
+        open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS,
+        half_open_calls=settings.CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+        enabled=settings.CIRCUIT_BREAKER_ENABLED,
+    )
+    deadlines = AdaptiveTimeout(
+        ceiling=timeout_seconds,
+        floor=min_timeout_seconds,
+        percentile=settings.ADAPTIVE_TIMEOUT_PERCENTILE,
+        multiplier=settings.ADAPTIVE_TIMEOUT_MULTIPLIER,
+        window=settings.ADAPTIVE_TIMEOUT_WINDOW,
+        min_samples=settings.ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+        enabled=settings.ADAPTIVE_TIMEOUT_ENABLED,
+    )
+    bulkhead = Bulkhead(upstream, max_concurrency, max_waiting, max_wait_seconds)
+    return UpstreamPolicy(upstream, breaker, bulkhead, deadlines, ignored_errors)
@@ -0,0 +1,197 @@
+from app.core.config import settings
+from app.core.degradation import degradation_scope, is_degraded
+from app.core.single_flight import single_flight
+from app.core.tracing import span
+from app.models.canonical import canonical_json, canonical_text
+from fastapi import Response
+from pydantic import BaseModel
+import functools
+import hashlib
+import json
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type, TypeVar, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Result cache entries are stored as "<schema version>\n<model JSON>".
+_ENTRY_SEPARATOR = "\n"
+
+_namespace_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "fallbacks": 0, "degraded": 0})
+
+
+def build_cache_key(namespace: str, input_data: BaseModel) -> str:
+    """
+    Derives the cache key for a service input: `<namespace>:<sha256 of the canonical input JSON>`.
+    Numeric quantization is applied when configured for the namespace in CACHE_KEY_QUANTIZATION.
+    """
+    canonical = canonical_json(input_data, quantize=settings.CACHE_KEY_QUANTIZATION.get(namespace))
+    input_hash = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    return f"{namespace}:{input_hash}"
+
+
+def build_query_cache_key(namespace: str, query: str) -> str:
+    """
+    Derives the cache key for a search query; queries differing only in casing or whitespace share a key.
+    """
+    query_hash = hashlib.sha256(canonical_text(query).casefold().encode('utf-8')).hexdigest()
+    return f"{namespace}:{query_hash}"
+
+
+def get_ttl(namespace: str, default_ttl: int) -> int:
+    return settings.CACHE_TTL_OVERRIDES.get(namespace, default_ttl)
+
+
+@functools.lru_cache(maxsize=None)
+def schema_version(output_model: Type[BaseModel]) -> str:
+    """
+    Short fingerprint of an output model's JSON schema. Cached entries written under a
+    different schema are treated as misses.
+    """
+    schema_json = json.dumps(output_model.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(schema_json.encode('utf-8')).hexdigest()[:12]
+
+
+class CachedJSONResponse(Response):
+    """
+    Response carrying an already-serialized, trusted cache payload. Returning it from a route
+    skips FastAPI's response_model validation and re-serialization.
+    """
+    media_type = "application/json"
+
+
+def _wrap_entry(version: str, payload: str) -> str:
+    return f"{version}{_ENTRY_SEPARATOR}{payload}"
+
+
+def _unwrap_entry(version: str, entry: Optional[str]) -> Optional[str]:
+    if not entry:
+        return None
+    entry_version, separator, payload = entry.partition(_ENTRY_SEPARATOR)
+    if not separator or entry_version != version:
+        return None
+    return payload
+
+
+def cached_result(namespace: str, output_model: Type[ModelT], ttl: int = 3600, coalesce: bool = False):
+    """
+    Caches the output of a service method that takes a single Pydantic input model.
+    The method's instance must expose the shared cache as `self.cache`.
+
+    Entries are tagged with the output model's schema version. Callers passing
+    `raw_response=True` get a CachedJSONResponse with the stored bytes on a hit,
+    so Pydantic is only involved on the miss path.
+
+    With `coalesce`, concurrent misses for the same key are computed once across
+    all workers (see app.core.single_flight).
+
+    Results computed while a Gemini or SerpAPI call failed (see app.core.degradation)
+    are returned but not cached, so fallback output is not served once the upstream
+    has recovered.
+    """
+    version = schema_version(output_model)
+
+    def decorator(func: Callable[[Any, BaseModel], Awaitable[ModelT]]):
+        @functools.wraps(func)
+        async def wrapper(self, input_data: BaseModel, raw_response: bool = False) -> Union[ModelT, CachedJSONResponse]:
+            cache_key = build_cache_key(namespace, input_data)
+            effective_ttl = get_ttl(namespace, ttl)
+
+            def from_payload(payload: Optional[str]) -> Optional[Union[ModelT, CachedJSONResponse]]:
+                if payload is None:
+                    return None
+                if raw_response:
+                    return CachedJSONResponse(content=payload.encode('utf-8'))
+                return output_model.parse_raw(payload)
+
+            with span(namespace) as current:
+                cached_payload = _unwrap_entry(version, await self.cache.get(cache_key))
+                if cached_payload is not None:
+                    current.set_attribute("cache", "hit")
+                    _namespace_stats[namespace]["hits"] += 1
+                    logger.debug("Cache hit for %s: %s", namespace, cache_key)
+                    return from_payload(cached_payload)
+
+                current.set_attribute("cache", "miss")
+                _namespace_stats[namespace]["misses"] += 1
+
+                with degradation_scope() as scope:
+                    if coalesce:
+                        result = await single_flight(
+                            self.cache,
+                            cache_key,
+                            compute=lambda: func(self, input_data),
+                            dumps=lambda result: _wrap_entry(version, result.json()),
+                            loads=lambda entry: from_payload(_unwrap_entry(version, entry)),
+                            ttl=effective_ttl,
+                        )
+                    else:
+                        result = await func(self, input_data)
+                        if not scope.degraded:
+                            await self.cache.set(cache_key, _wrap_entry(version, result.json()), effective_ttl)
+                            logger.debug("Cached %s result: %s", namespace, cache_key)
+                if scope.degraded:
+                    current.set_attribute("cache", "degraded")
+                    _namespace_stats[namespace]["degraded"] += 1
+                    logger.debug("Not caching %s result computed with a failed upstream call: %s", namespace, cache_key)
+                return result
+
+        return wrapper
+    return decorator
+
+
+async def get_cached_model(cache: Any, namespace: str, output_model: Type[ModelT], input_data: BaseModel) -> Optional[ModelT]:
+    """
+    Reads the entry `cached_result` would serve for this input, for code paths that
+    produce the same output outside the decorated method (e.g. streaming endpoints).
+    """
+    cached_payload = _unwrap_entry(schema_version(output_model), await cache.get(build_cache_key(namespace, input_data)))
+    if cached_payload is None:
+        _namespace_stats[namespace]["misses"] += 1
+        return None
+    _namespace_stats[namespace]["hits"] += 1
+    return output_model.parse_raw(cached_payload)
+
+
+async def get_cached_models(cache: Any, namespace: str, output_model: Type[ModelT], inputs: List[BaseModel]) -> List[Optional[ModelT]]:
+    """
+    Batched `get_cached_model`; returns None for every input without a usable entry.
+    """
+    version = schema_version(output_model)
+    entries = await cache.get_many([build_cache_key(namespace, input_data) for input_data in inputs])
+    results: List[Optional[ModelT]] = []
+    for entry in entries:
+        cached_payload = _unwrap_entry(version, entry)
+        _namespace_stats[namespace]["hits" if cached_payload is not None else "misses"] += 1
+        results.append(output_model.parse_raw(cached_payload) if cached_payload is not None else None)
+    return results
+
+
+async def store_cached_model(cache: Any, namespace: str, output_model: Type[ModelT], input_data: BaseModel, result: ModelT, ttl: int = 3600):
+    """
+    Stores a result under the same key and format as `cached_result`, unless it was
+    computed in a degraded scope (see app.core.degradation).
+    """
+    cache_key = build_cache_key(namespace, input_data)
+    if is_degraded():
+        _namespace_stats[namespace]["degraded"] += 1
+        logger.debug("Not caching %s result computed with a failed upstream call: %s", namespace, cache_key)
+        return
+    await cache.set(cache_key, _wrap_entry(schema_version(output_model), result.json()), get_ttl(namespace, ttl))
+    logger.debug("Cached %s result: %s", namespace, cache_key)
+
+
+def record_fallbacks(namespace: str, count: int = 1):
+    """
+    Counts misses that could not be computed the usual way (e.g. batch items that fell back to single calls).
+    """
+    _namespace_stats[namespace]["fallbacks"] += count
+
+
+def namespace_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Returns cache hit/miss/fallback counters per service cache namespace.
+    """
+    return {namespace: dict(counts) for namespace, counts in _namespace_stats.items()}
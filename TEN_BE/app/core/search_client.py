@@ -0,0 +1,220 @@
+import aiohttp
+from app.core.config import settings
+from app.core.metrics import track_stage
+from app.core.cassette import UPSTREAM_SERPAPI, CassetteMissError, CassetteStore, get_cassette
+from app.core.degradation import mark_degraded
+from app.core.resilience import UpstreamCall, UpstreamPolicy, build_policy
+import asyncio
+from typing import Any, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
+
+# Rate limiting and transient upstream failures; other statuses carry a final answer
+# (SerpAPI reports bad keys and invalid queries as 4xx with an "error" field).
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class SearchClient:
+    """
+    Shared async SerpAPI client used by every service.
+    Requests go through one pooled keep-alive session with DNS caching, are cancelled after
+    a per-attempt timeout adapted to observed latency, and are retried with exponential
+    backoff on 429/5xx responses and connection errors. A circuit breaker fails searches
+    fast while SerpAPI is failing, and a bulkhead caps searches queued for the pool (see
+    app/core/resilience.py). With a cassette, searches are recorded to or replayed from disk.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        pool_size: int,
+        timeout_seconds: float,
+        max_retries: int,
+        retry_backoff_seconds: float,
+        dns_cache_ttl_seconds: int,
+        base_url: str = SERPAPI_SEARCH_URL,
+        cassette: Optional[CassetteStore] = None,
+        policy: Optional[UpstreamPolicy] = None,
+    ):
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.dns_cache_ttl_seconds = dns_cache_ttl_seconds
+        self.base_url = base_url
+        self.cassette = cassette
+        self.policy = policy or build_policy(
+            UPSTREAM_SERPAPI,
+            max_concurrency=pool_size,
+            max_waiting=settings.SEARCH_MAX_QUEUE_SIZE,
+            max_wait_seconds=settings.SEARCH_MAX_QUEUE_WAIT_SECONDS,
+            timeout_seconds=timeout_seconds,
+            min_timeout_seconds=settings.SEARCH_MIN_TIMEOUT_SECONDS,
+            ignored_errors=(CassetteMissError,),
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._total_requests = 0
+        self._retries = 0
+        self._timeouts = 0
+        self._errors = 0
+        self._in_flight = 0
+
+    async def start(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                ttl_dns_cache=self.dns_cache_ttl_seconds,
+                keepalive_timeout=60,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+            )
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def warm_up(self):
+        """
+        Opens a pooled connection to the SerpAPI host (DNS lookup and TLS handshake) so the
+        first search does not pay for it.
+        """
+        if self._session is None or self._session.closed or not self.api_key:
+            return
+        if self.cassette is not None and self.cassette.replaying:
+            return
+        try:
+            async with self._session.head(self.base_url, timeout=aiohttp.ClientTimeout(total=self.timeout_seconds)):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("Search client warm-up failed: %s", e)
+
+    def _retry_delay(self, attempt: int, response: Optional[aiohttp.ClientResponse] = None) -> float:
+        if response is not None:
+            try:
+                return min(float(response.headers.get("Retry-After", "")), self.timeout_seconds)
+            except ValueError:
+                pass
+        return self.retry_backoff_seconds * (2 ** attempt)
+
+    async def search(self, params: Dict[str, Any], timeout: Optional[float] = None, stage: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Runs a SerpAPI search and returns the decoded JSON response, in the same shape as
+        serpapi's GoogleSearch(params).get_dict(). The API key is added by the client.
+        `stage` labels the call's latency metrics (e.g. "competitor_radar.news_search") and
+        keys its adaptive timeout; `timeout` replaces the static upper bound of that timeout.
+        Raises aiohttp.ClientError or asyncio.TimeoutError once retries are exhausted,
+        CassetteMissError for unrecorded searches in replay mode, and an
+        UpstreamUnavailableError without sending the request when the circuit is open or
+        too many searches are queued. Failures and error responses mark the current
+        degradation scope, so results built without the search are not cached.
+        """
+        if self._session is None or self._session.closed:
+            raise RuntimeError("Search client session is not started. Call init_search_client() on startup.")
+
+        query = {key: value for key, value in params.items() if value is not None}
+        query["api_key"] = self.api_key
+        self._in_flight += 1
+        try:
+            async with self.policy.call(stage, timeout) as call:
+                with track_stage(stage, UPSTREAM_SERPAPI):
+                    if self.cassette is not None:
+                        return await self.cassette.search(query, lambda: self._search_with_retries(query, call), stage=stage)
+                    return await self._search_with_retries(query, call)
+        except Exception:
+            mark_degraded()
+            raise
+        finally:
+            self._in_flight -= 1
+
+    async def _search_with_retries(self, query: Dict[str, Any], call: UpstreamCall) -> Dict[str, Any]:
+        request_timeout = aiohttp.ClientTimeout(total=call.timeout)
+        attempt = 0
+        while True:
+            self._total_requests += 1
+            try:
+                async with self._session.get(self.base_url, params=query, timeout=request_timeout) as response:
+                    if response.status in RETRYABLE_STATUSES and attempt < self.max_retries:
+                        delay = self._retry_delay(attempt, response)
+                        logger.debug("SerpAPI returned %s, retrying in %.2fs (attempt %s of %s).", response.status, delay, attempt + 1, self.max_retries)
+                    else:
+                        data = await response.json(content_type=None)
+                        if not isinstance(data, dict):
+                            raise aiohttp.ContentTypeError(response.request_info, response.history, message="Expected a JSON object from SerpAPI.")
+                        if response.status >= 400:
+                            data.setdefault("error", f"SerpAPI returned HTTP {response.status}.")
+                            mark_degraded()
+                        if response.status in RETRYABLE_STATUSES:
+                            call.mark_failed()
+                        return data
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+            except aiohttp.ClientConnectionError as e:
+                if attempt >= self.max_retries:
+                    self._errors += 1
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.debug("SerpAPI connection error (%s), retrying in %.2fs.", e, delay)
+            except aiohttp.ClientError:
+                self._errors += 1
+                raise
+
+            self._retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the client's request, retry and resilience counters.
+        """
+        return {
+            "pool_size": self.pool_size,
+            "in_flight": self._in_flight,
+            "total_requests": self._total_requests,
+            "retries": self._retries,
+            "timeouts": self._timeouts,
+            "errors": self._errors,
+            "resilience": self.policy.stats(),
+        }
+
+
+_search_client: Optional[SearchClient] = None
+
+async def init_search_client() -> SearchClient:
+    """
+    Opens the shared search session. Must run inside the event loop that serves requests.
+    """
+    global _search_client
+    if _search_client is None:
+        _search_client = SearchClient(
+            api_key=settings.SERPAPI_API_KEY,
+            pool_size=settings.SEARCH_POOL_SIZE,
+            timeout_seconds=settings.SEARCH_TIMEOUT_SECONDS,
+            max_retries=settings.SEARCH_MAX_RETRIES,
+            retry_backoff_seconds=settings.SEARCH_RETRY_BACKOFF_SECONDS,
+            dns_cache_ttl_seconds=settings.SEARCH_DNS_CACHE_TTL_SECONDS,
+            cassette=get_cassette(),
+        )
+        await _search_client.start()
+        logger.info("Search client initialized (pool size: %s).", settings.SEARCH_POOL_SIZE)
+    return _search_client
+
+async def close_search_client():
+    global _search_client
+    if _search_client is not None:
+        await _search_client.close()
+        _search_client = None
+
+def get_search_client() -> SearchClient:
+    if _search_client is None:
+        raise RuntimeError("Search client not initialized. Call init_search_client() on startup.")
+    return _search_client
@@ -25,4 +25,12 @@ async def get_api_key(api_key: str = Security(api_key_header)):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API Key"
         )
+    return api_key
+
+async def get_admin_api_key(api_key: str = Security(get_api_key)):
+    if api_key not in settings.ADMIN_API_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
     return api_key
\ No newline at end of file
@@ -0,0 +1,111 @@
+from app.core.config import settings
+from app.core.cache import TwoTierCache
+from app.core.degradation import is_degraded, mark_degraded
+import time
+import uuid
+from typing import Awaitable, Callable, Optional, TypeVar
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Deletes the lock only if it is still held by the caller's token.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Prefixes a published result that was not cached (computed with a failed upstream call).
+_UNCACHED_PREFIX = "uncached:"
+
+
+async def _wait_for_leader(cache: TwoTierCache, cache_key: str, lock_key: str, channel: str) -> Optional[str]:
+    """
+    Waits for the worker holding the lock to publish the result for cache_key.
+    Returns None if the lock disappears without a result or the wait times out,
+    in which case the caller should compute the value itself.
+    """
+    pubsub = cache.redis.pubsub()
+    try:
+        await pubsub.subscribe(channel)
+
+        # The leader may have finished between our cache miss and the subscription.
+        cached = await cache.get(cache_key)
+        if cached:
+            return cached
+
+        deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.5)
+            if message and message.get("type") == "message":
+                data = message["data"]
+                return data.decode("utf-8") if isinstance(data, bytes) else data
+
+            if not await cache.redis.exists(lock_key):
+                return await cache.get(cache_key)
+
+        logger.warning("Timed out waiting for result of %s. Computing locally.", cache_key)
+        return None
+    finally:
+        await pubsub.reset()
+
+
+async def single_flight(
+    cache: TwoTierCache,
+    cache_key: str,
+    compute: Callable[[], Awaitable[T]],
+    dumps: Callable[[T], str],
+    loads: Callable[[str], Optional[T]],
+    ttl: int,
+) -> T:
+    """
+    Computes the value for a cache key at most once across all workers and nodes.
+
+    The first caller takes a short-lived Redis lock on the key, runs `compute`,
+    caches the serialized result with `ttl` and publishes it. Concurrent callers
+    for the same key wait for that publication instead of recomputing.
+    `loads` may return None to reject a stored value (e.g. an outdated format),
+    in which case the value is recomputed. A result computed in a degraded scope (see
+    app.core.degradation) is published to the waiting callers, whose scopes are marked
+    degraded in turn, but not cached.
+    """
+    lock_key = f"lock:{cache_key}"
+    channel = f"ready:{cache_key}"
+    token = uuid.uuid4().hex
+
+    acquired = await cache.redis.set(
+        lock_key, token, nx=True, px=int(settings.SINGLE_FLIGHT_LOCK_TTL_SECONDS * 1000)
+    )
+    if not acquired:
+        published = await _wait_for_leader(cache, cache_key, lock_key, channel)
+        if published and published.startswith(_UNCACHED_PREFIX):
+            published = published[len(_UNCACHED_PREFIX):]
+            mark_degraded()
+        result = loads(published) if published else None
+        if result is not None:
+            logger.debug("Reused result computed by another request for: %s", cache_key)
+            return result
+
+    try:
+        if acquired:
+            cached = await cache.get(cache_key)
+            result = loads(cached) if cached else None
+            if result is not None:
+                return result
+
+        result = await compute()
+        payload = dumps(result)
+        if is_degraded():
+            await cache.redis.publish(channel, _UNCACHED_PREFIX + payload)
+            logger.debug("Published uncached result for: %s", cache_key)
+            return result
+        await cache.set(cache_key, payload, ttl)
+        await cache.redis.publish(channel, payload)
+        logger.debug("Cached and published result for: %s", cache_key)
+        return result
+    finally:
+        if acquired:
+            await cache.redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
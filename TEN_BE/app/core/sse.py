@@ -0,0 +1,39 @@
+import json
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Disables proxy buffering (nginx) so events reach the client as they are produced.
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Formats one Server-Sent Events message. `data` may be a Pydantic model or any JSON-serializable value.
+    """
+    payload = json.dumps(jsonable_encoder(data), separators=(",", ":"), ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def sse_response(events: AsyncIterator[Tuple[str, Any]], route_name: str, error_message: str, done_data: Optional[Any] = None) -> StreamingResponse:
+    """
+    Streams (event, payload) pairs from a service as Server-Sent Events, followed by a
+    `done` event. A failure mid-stream is reported as an `error` event, since the
+    response status has already been sent.
+    """
+    async def event_stream():
+        try:
+            async for event, payload in events:
+                yield format_sse(event, payload)
+            yield format_sse("done", done_data if done_data is not None else {})
+        except Exception as e:
+            logger.error("Error in %s: %s", route_name, e)
+            yield format_sse("error", {"detail": f"{error_message}: {e}"})
+        finally:
+            # Stops upstream work (e.g. a Gemini stream) when the client disconnects.
+            await events.aclose()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
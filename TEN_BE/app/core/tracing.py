@@ -0,0 +1,385 @@
+import aiohttp
+from app.core.config import settings
+from app.core.logging import request_id_var
+import asyncio
+import contextvars
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_CANCELLED = "cancelled"
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "start_time", "end_time", "status", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.status = STATUS_OK
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_time is None:
+            return None
+        return round((self.end_time - self.start_time) * 1000, 3)
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def finish(self, exc_type=None, exc=None):
+        self.end_time = time.time()
+        if exc_type is not None:
+            if issubclass(exc_type, (GeneratorExit, asyncio.CancelledError)):
+                self.status = STATUS_CANCELLED
+            else:
+                self.status = STATUS_ERROR
+                self.error = f"{exc_type.__name__}: {exc}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """
+    All spans recorded while handling one request or job. Keeps at most `max_spans`
+    spans; later ones are counted in `dropped_spans` instead.
+    """
+
+    def __init__(self, request_id: str, max_spans: int):
+        self.trace_id = os.urandom(16).hex()
+        self.request_id = request_id
+        self.max_spans = max_spans
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+        self.root: Optional[Span] = None
+
+    def start_span(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]) -> Optional[Span]:
+        if len(self.spans) >= self.max_spans:
+            self.dropped_spans += 1
+            return None
+        new_span = Span(self, name, parent_id, attributes)
+        self.spans.append(new_span)
+        return new_span
+
+    def to_tree(self) -> Dict[str, Any]:
+        """
+        Returns the trace as nested spans; spans still open when the trace finished
+        (e.g. background cache refreshes) have `duration_ms` None.
+        """
+        nodes = {span.span_id: {**span.to_dict(), "children": []} for span in self.spans}
+        roots = []
+        for span in self.spans:
+            parent = nodes.get(span.parent_id) if span.parent_id else None
+            (parent["children"] if parent is not None else roots).append(nodes[span.span_id])
+        return {
+            "trace_id": self.trace_id,
+            "request_id": self.request_id,
+            "name": self.root.name if self.root else None,
+            "duration_ms": self.root.duration_ms if self.root else None,
+            "status": self.root.status if self.root else None,
+            "span_count": len(self.spans),
+            "dropped_spans": self.dropped_spans,
+            "spans": roots,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "request_id": self.request_id,
+            "name": self.root.name if self.root else None,
+            "start_time": self.root.start_time if self.root else None,
+            "duration_ms": self.root.duration_ms if self.root else None,
+            "status": self.root.status if self.root else None,
+            "span_count": len(self.spans),
+        }
+
+
+class span:
+    """
+    Records a span under the current one, if a trace is active; otherwise does nothing.
+
+        with span("investor_matcher.search", query=query) as current:
+            ...
+            current.set_attribute("cache", "hit")
+
+    Nested spans opened inside the block (including in tasks it creates) become its
+    children. `leaf=True` spans never become the parent of other spans, which is what
+    upstream calls that hold the span across yields (streams) need.
+    """
+    __slots__ = ("name", "attributes", "leaf", "span", "_token")
+
+    def __init__(self, name: str, leaf: bool = False, **attributes: Any):
+        self.name = name
+        self.attributes = attributes
+        self.leaf = leaf
+        self.span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> "span":
+        parent = _current_span.get()
+        if parent is not None:
+            self.span = parent.trace.start_span(self.name, parent.span_id, self.attributes)
+            if self.span is not None and not self.leaf:
+                self._token = _current_span.set(self.span)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self.span is not None:
+            self.span.finish(exc_type, exc)
+        if self._token is not None:
+            _current_span.reset(self._token)
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        if self.span is not None:
+            self.span.set_attribute(key, value)
+
+
+class TraceBuffer:
+    """
+    Ring buffer of the most recent finished traces, looked up by request id.
+    """
+
+    def __init__(self, max_traces: int):
+        self.max_traces = max_traces
+        self._traces: "OrderedDict[str, Trace]" = OrderedDict()
+
+    def add(self, trace: Trace):
+        self._traces[trace.request_id] = trace
+        self._traces.move_to_end(trace.request_id)
+        while len(self._traces) > self.max_traces:
+            self._traces.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Trace]:
+        return self._traces.get(request_id)
+
+    def recent(self, limit: int, min_duration_ms: float = 0) -> List[Trace]:
+        traces = []
+        for trace in reversed(self._traces.values()):
+            duration_ms = trace.root.duration_ms if trace.root else None
+            if duration_ms is not None and duration_ms >= min_duration_ms:
+                traces.append(trace)
+                if len(traces) >= limit:
+                    break
+        return traces
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(trace: Trace, span: Span) -> Dict[str, Any]:
+    attributes = [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()]
+    attributes.append({"key": "request_id", "value": {"stringValue": trace.request_id}})
+    otlp_span = {
+        "traceId": trace.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(int(span.start_time * 1e9)),
+        "endTimeUnixNano": str(int((span.end_time or span.start_time) * 1e9)),
+        "attributes": attributes,
+        # STATUS_CODE_OK / STATUS_CODE_ERROR
+        "status": {"code": 2, "message": span.error or ""} if span.status == STATUS_ERROR else {"code": 1},
+    }
+    if span.parent_id:
+        otlp_span["parentSpanId"] = span.parent_id
+    return otlp_span
+
+
+class OTLPExporter:
+    """
+    Sends finished traces to an OpenTelemetry collector over OTLP/HTTP (JSON encoding),
+    batched every `interval` seconds. Traces queued while the queue is full are dropped
+    rather than slowing down requests.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, interval: float, max_queue_size: int):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.interval = interval
+        self._queue: "asyncio.Queue[Trace]" = asyncio.Queue(maxsize=max_queue_size)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+        self.exported = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def submit(self, trace: Trace):
+        try:
+            self._queue.put_nowait(trace)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _payload(self, traces: List[Trace]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{
+                    "scope": {"name": "app.core.tracing"},
+                    "spans": [_otlp_span(trace, span) for trace in traces for span in trace.spans],
+                }],
+            }],
+        }
+
+    async def flush(self):
+        traces = []
+        while not self._queue.empty():
+            traces.append(self._queue.get_nowait())
+        if not traces:
+            return
+        try:
+            async with self._session.post(self.url, json=self._payload(traces)) as response:
+                if response.status >= 400:
+                    self.errors += 1
+                    logger.warning("OTLP collector rejected %s traces: HTTP %s", len(traces), response.status)
+                    return
+            self.exported += len(traces)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.errors += 1
+            logger.warning("Could not export %s traces to %s: %s", len(traces), self.url, e)
+
+    async def _export_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def start(self):
+        self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        self._task = asyncio.create_task(self._export_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._session is not None:
+            await self.flush()
+            await self._session.close()
+            self._session = None
+
+
+_trace_buffer = TraceBuffer(settings.TRACE_BUFFER_SIZE)
+_exporter: Optional[OTLPExporter] = None
+
+
+class start_trace:
+    """
+    Opens the root span of a new trace for the current request or job. When it closes the
+    trace is stored in the ring buffer and queued for OTLP export.
+    """
+    __slots__ = ("trace", "_token")
+
+    def __init__(self, name: str, request_id: Optional[str] = None, **attributes: Any):
+        self.trace: Optional[Trace] = None
+        self._token = None
+        if settings.TRACING_ENABLED:
+            self.trace = Trace(request_id or request_id_var.get() or os.urandom(16).hex(), settings.TRACE_MAX_SPANS)
+            self.trace.root = self.trace.start_span(name, None, attributes)
+
+    def __enter__(self) -> "start_trace":
+        if self.trace is not None:
+            self._token = _current_span.set(self.trace.root)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self.trace is None:
+            return False
+        self.trace.root.finish(exc_type, exc)
+        _current_span.reset(self._token)
+        _trace_buffer.add(self.trace)
+        if _exporter is not None:
+            _exporter.submit(self.trace)
+        return False
+
+
+class TracingMiddleware:
+    """
+    Traces every HTTP request under its request id (set by RequestIdMiddleware, which
+    must wrap this one). The root span is named after the route template.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with start_trace(f"{scope['method']} {scope['path']}", method=scope["method"], path=scope["path"]) as trace:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                root = trace.trace.root
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    root.name = f"{scope['method']} {route}"
+                if status_code is not None:
+                    root.set_attribute("status_code", status_code)
+
+
+async def init_tracing():
+    """
+    Starts the OTLP exporter when OTLP_ENDPOINT is configured. Traces are kept in the
+    in-memory buffer either way.
+    """
+    global _exporter
+    if settings.TRACING_ENABLED and settings.OTLP_ENDPOINT and _exporter is None:
+        _exporter = OTLPExporter(
+            settings.OTLP_ENDPOINT,
+            service_name=settings.OTLP_SERVICE_NAME,
+            interval=settings.OTLP_EXPORT_INTERVAL_SECONDS,
+            max_queue_size=settings.TRACE_BUFFER_SIZE,
+        )
+        await _exporter.start()
+        logger.info("Exporting traces to %s.", _exporter.url)
+
+async def close_tracing():
+    global _exporter
+    if _exporter is not None:
+        await _exporter.stop()
+        _exporter = None
+
+def get_trace_buffer() -> TraceBuffer:
+    return _trace_buffer
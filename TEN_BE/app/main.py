@@ -12,25 +12,62 @@ from app.api.v1.routers import (
     legal,
     exit_strategy_explorer,
     talent_navigator,
+    navigator,
+    jobs,
+    admin,
 )
 from app.core.config import settings
-from app.core.redis import connect_redis, disconnect_redis, get_redis_client
+from app.core.redis import connect_redis, disconnect_redis
+from app.core.cassette import init_cassette, close_cassette
 from app.core.gemini_client import init_gemini_model
+from app.core.search_client import init_search_client, close_search_client
+from app.core.cache import init_cache, close_cache
+from app.core.jobs import init_job_queue, close_job_queue
+from app.core.container import init_container, close_container
+from app.core.logging import setup_logging, shutdown_logging, RequestIdMiddleware, REQUEST_ID_HEADER
+from app.core.metrics import MetricsMiddleware, metrics_endpoint
+from app.core.tracing import TracingMiddleware, init_tracing, close_tracing
+from contextlib import asynccontextmanager
 import uvicorn
 
-from fastapi_limiter import FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
+from app.core.rate_limit import init_rate_limiter, close_rate_limiter, enforce_rate_limit
 
-from app.core.security import get_api_key
+GLOBAL_DEFAULT_RATE_LIMIT = Depends(enforce_rate_limit)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    await init_tracing()
+    await connect_redis()
+    await init_rate_limiter()
+    await init_cache()
+    await init_job_queue()
+    init_cassette()
+    init_gemini_model()
+    await init_search_client()
+    await init_container()
+    try:
+        yield
+    finally:
+        await close_container()
+        close_job_queue()
+        await close_search_client()
+        close_cassette()
+        await close_cache()
+        await close_rate_limiter()
+        await disconnect_redis()
+        await close_tracing()
+        shutdown_logging()
 
-GLOBAL_DEFAULT_RATE_LIMIT = Depends(RateLimiter(times=100, seconds=60))
 
 app = FastAPI(
     title=settings.APP_NAME,
     version="1.0.0",
     description="An AI-powered platform to assist first-time entrepreneurs with risk assessment, reputation analysis, and investor matching.",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -39,25 +76,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[REQUEST_ID_HEADER],
 )
-
-@app.on_event("startup")
-async def startup_event():
-    await connect_redis()
-
-    try:
-        redis_client = await get_redis_client()
-        await FastAPILimiter.init(redis=redis_client)
-    except ConnectionError as e:
-        print(f"WARNING: Could not initialize FastAPI-Limiter: {e}. Rate limiting will not be active.")
-    except Exception as e:
-        print(f"An unexpected error occurred during FastAPI-Limiter initialization: {e}")
-
-    init_gemini_model()
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    await disconnect_redis()
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
+# Tracing reads the request id, so RequestIdMiddleware is added last (outermost).
+app.add_middleware(TracingMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 routers_config = [
     (risk, "/api/v1", ["Risk Assessment"]),
@@ -69,6 +95,9 @@ routers_config = [
     (legal, "/api/v1", ["Legal Assistance"]),
     (exit_strategy_explorer, "/api/v1", ["Exit Strategy Explorer"]),
     (talent_navigator, "/api/v1", ["Talent Navigator"]),
+    (navigator, "/api/v1", ["Navigator Workflow"]),
+    (jobs, "/api/v1", ["Async Jobs"]),
+    (admin, "/api/v1", ["Admin"]),
 ]
 
 for router_module, prefix, tags in routers_config:
@@ -76,10 +105,10 @@ for router_module, prefix, tags in routers_config:
         router_module.router,
         prefix=prefix,
         tags=tags,
-        dependencies=[GLOBAL_DEFAULT_RATE_LIMIT, Depends(get_api_key)]
+        dependencies=[GLOBAL_DEFAULT_RATE_LIMIT]
     )
 
-@app.get("/", summary="Health Check", tags=["System"], dependencies=[GLOBAL_DEFAULT_RATE_LIMIT, Depends(get_api_key)])
+@app.get("/", summary="Health Check", tags=["System"], dependencies=[GLOBAL_DEFAULT_RATE_LIMIT])
 async def read_root():
     return {"message": f"Welcome to {settings.APP_NAME} API! Visit /docs for API documentation."}
 
@@ -0,0 +1,55 @@
+import json
+import math
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+
+
+def canonical_text(value: str) -> str:
+    """
+    Trims a string and collapses all internal whitespace runs to a single space.
+    """
+    return " ".join(value.split())
+
+
+def quantize_number(value: float, significant_digits: int) -> float:
+    """
+    Rounds a number to the given count of significant digits (e.g. 1_234_567 -> 1_200_000 for 2),
+    so nearby amounts fall into the same bucket.
+    """
+    if value == 0 or significant_digits <= 0:
+        return value
+    magnitude = math.floor(math.log10(abs(value)))
+    factor = 10 ** (magnitude - significant_digits + 1)
+    quantized = round(value / factor) * factor
+    return int(quantized) if isinstance(value, int) else float(quantized)
+
+
+def _canonicalize(value: Any, field_name: Optional[str], quantize: Dict[str, int]) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _canonicalize(item, key, quantize)
+            for key, item in value.items()
+            if item is not None
+        }
+    if isinstance(value, list):
+        return [_canonicalize(item, field_name, quantize) for item in value]
+    if isinstance(value, str):
+        return canonical_text(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and field_name in quantize:
+        return quantize_number(value, quantize[field_name])
+    return value
+
+
+def canonical_json(model: BaseModel, quantize: Optional[Dict[str, int]] = None) -> str:
+    """
+    Serializes an input model into a canonical JSON string for cache key derivation.
+
+    Whitespace is trimmed and collapsed, fields left at their defaults (including nulls)
+    are dropped and keys are sorted. Casing is kept: services read fields such as the
+    industry case-sensitively, so any case-insensitive field is normalized on the input
+    model instead (e.g. the founder's Twitter handle).
+    `quantize` maps field names to significant digits for numeric bucketing.
+    """
+    data = model.model_dump(mode="json", exclude_defaults=True)
+    canonical = _canonicalize(data, None, quantize or {})
+    return json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
@@ -41,14 +41,31 @@ class RiskOutput(BaseModel):
     risk_factors: List[RiskFactor] = Field(..., description="Detailed breakdown of identified risk factors.")
     recommendations: List[str] = Field(..., description="General recommendations based on the overall risk profile.")
 
+class RiskBatchInput(BaseModel):
+    items: List[RiskInput] = Field(..., min_length=1, description="Startup profiles to analyze.")
+
+class RiskBatchOutput(BaseModel):
+    results: List[RiskOutput] = Field(..., description="Risk assessments in the same order as the submitted items.")
+
 
 # --- 2. Reputation Analysis Models ---
 
+def normalize_twitter_handle(handle: Optional[str]) -> Optional[str]:
+    """
+    Handles are case-insensitive and commonly written with a leading '@'; "@Foo" and "foo"
+    name the same account, run the same searches and share a result cache entry.
+    """
+    if handle is None:
+        return None
+    return handle.strip().lstrip("@").casefold() or None
+
 class ReputationInput(BaseModel):
     startup_name: str = Field(..., description="Name of the startup.")
     founder_twitter_handle: Optional[str] = Field(None, description="Optional Twitter handle of a key founder (e.g., 'elonmusk').")
     initial_pitch_text: str = Field(..., min_length=50, description="The initial pitch summary or description of the startup/idea. This will be the primary source for sentiment analysis.")
 
+    _normalize_handle = validator('founder_twitter_handle', allow_reuse=True)(normalize_twitter_handle)
+
 class ReputationOutput(BaseModel):
     startup_name: str = Field(..., description="Name of the analyzed startup.")
     overall_sentiment_score: float = Field(..., ge=-1.0, le=1.0, description="A compound sentiment score (-1.0 to 1.0, where 1.0 is most positive).")
@@ -144,6 +161,12 @@ class TractionEstimatorOutput(BaseModel):
     benchmarks: List[TractionBenchmark] = Field(..., description="Comparison of your metrics against simulated industry benchmarks.")
     ai_insights: List[str] = Field(..., description="AI-generated insights and tips for improving traction.")
 
+class TractionEstimatorBatchInput(BaseModel):
+    items: List[TractionEstimatorInput] = Field(..., min_length=1, description="Startup metrics to benchmark.")
+
+class TractionEstimatorBatchOutput(BaseModel):
+    results: List[TractionEstimatorOutput] = Field(..., description="Traction estimates in the same order as the submitted items.")
+
 # --- 6. Buzz Builder Models ---
 class BuzzBuilderInput(BaseModel):
     startup_name: str = Field(..., description="Your startup's name.")
@@ -259,3 +282,41 @@ class TalentNavigatorOutput(BaseModel):
     startup_name: str = Field(..., description="Name of the startup analyzed.")
     recommended_roles: List[RecommendedRole] = Field(..., description="List of recommended roles with candidate profiles and interview questions.")
     team_building_tips: List[TalentTip] = Field(..., description="General AI coaching tips for building a strong early-stage team.")
+
+
+
+# --- Navigator Workflow Models ---
+
+class NavigatorInput(BaseModel):
+    risk: RiskInput = Field(..., description="Startup profile for the risk assessment. Its startup name and industry are used by every stage.")
+    pitch_text: str = Field(..., min_length=100, description="The full text of the startup's pitch. Analyzed for reputation and used for pitch feedback.")
+    founder_twitter_handle: Optional[str] = Field(None, description="Optional Twitter handle of a key founder for the reputation analysis.")
+    funding_sought_usd: Optional[int] = Field(None, gt=0, description="Funding sought for investor matching. Defaults to risk.initial_funding_needed_usd.")
+
+    _normalize_handle = validator('founder_twitter_handle', allow_reuse=True)(normalize_twitter_handle)
+
+class NavigatorOutput(BaseModel):
+    startup_name: str = Field(..., description="Name of the analyzed startup.")
+    risk: RiskOutput = Field(..., description="Output of /analyze-risk.")
+    reputation: ReputationOutput = Field(..., description="Output of /scan-reputation.")
+    investor_matches: InvestorMatchOutput = Field(..., description="Output of /match-investors, based on the risk and reputation results.")
+    pitch_feedback: PitchFeedbackResponse = Field(..., description="Output of /pitch-feedback, informed by all previous stages.")
+
+# --- Async Job Models ---
+
+class JobSubmitResponse(BaseModel):
+    job_id: str = Field(..., description="Identifier of the queued job.")
+    job_type: str = Field(..., description="Type of analysis the job runs (e.g., 'competitor-radar').")
+    status: str = Field(..., description="Current job status ('queued', 'running', 'succeeded', 'failed').")
+    status_url: str = Field(..., description="URL to poll for the job status and result.")
+    events_url: str = Field(..., description="Server-Sent Events URL that emits the result once the job finishes.")
+
+class JobStatusResponse(BaseModel):
+    job_id: str = Field(..., description="Identifier of the job.")
+    job_type: str = Field(..., description="Type of analysis the job runs.")
+    status: str = Field(..., description="Current job status ('queued', 'running', 'succeeded', 'failed').")
+    attempts: int = Field(..., ge=0, description="Number of times a worker has started the job.")
+    created_at: float = Field(..., description="Submission time (Unix timestamp).")
+    updated_at: float = Field(..., description="Time of the last status change (Unix timestamp).")
+    result: Optional[Dict[str, Any]] = Field(None, description="Output of the analysis, same shape as the synchronous endpoint's response. Set once the job succeeded.")
+    error: Optional[str] = Field(None, description="Error message of the last failed attempt.")
@@ -1,19 +1,23 @@
 import json
-import redis.asyncio as redis
-import google.generativeai as genai
-import asyncio
-import hashlib
-from typing import List, Dict, Any, Optional
+from app.core.cache import TwoTierCache
+from app.core.degradation import degradation_tracked
+from app.core.result_cache import cached_result, get_cached_model, store_cached_model
+from app.core.gemini_client import GeminiClient
+from app.core.json_stream import stream_gemini_json
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 
 from app.models.schemas import BuzzBuilderInput, BuzzBuilderOutput, SocialPostSuggestion
+import logging
+
+logger = logging.getLogger(__name__)
 
 class BuzzBuilderService:
-    def __init__(self, redis_client: redis.Redis, gemini_model: genai.GenerativeModel):
-        self.redis_client = redis_client
-        self.gemini_model = gemini_model
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient):
+        self.cache = cache
+        self.gemini_client = gemini_client
 
-    async def generate_buzz(self, input_data: BuzzBuilderInput) -> BuzzBuilderOutput:
-        prompt = f"""
+    def _build_prompt(self, input_data: BuzzBuilderInput) -> str:
+        return f"""
         You are an AI content strategist specializing in startup growth and public relations.
         Generate compelling content suggestions for '{input_data.startup_name}' in the '{input_data.your_industry}' industry.
 
@@ -60,11 +64,15 @@ class BuzzBuilderService:
         }}
         """
 
+    @cached_result("buzz_builder", BuzzBuilderOutput, ttl=3600)
+    async def generate_buzz(self, input_data: BuzzBuilderInput) -> BuzzBuilderOutput:
+        prompt = self._build_prompt(input_data)
+
         suggestions: List[SocialPostSuggestion] = []
         ai_tips: List[str] = []
 
         try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            response = await self.gemini_client.generate_content(prompt, stage="buzz_builder.generate")
             gemini_output_text = response.text.strip()
             if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
                 gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
@@ -78,7 +86,7 @@ class BuzzBuilderService:
             ai_tips = gemini_data.get("ai_tips", [])
 
         except Exception as e:
-            print(f"ERROR(Gemini): Buzz Builder analysis failed: {e}")
+            logger.error("Buzz Builder analysis failed: %s", e)
             suggestions = [
                 SocialPostSuggestion(
                     platform="Error",
@@ -94,4 +102,32 @@ class BuzzBuilderService:
             startup_name=input_data.startup_name,
             suggestions=suggestions,
             ai_tips=ai_tips
-        )
\ No newline at end of file
+        )
+
+    @degradation_tracked
+    async def stream_buzz(self, input_data: BuzzBuilderInput) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of generate_buzz. Yields ("suggestion", SocialPostSuggestion) as soon as
+        each suggestion is complete in the Gemini output, then ("result", BuzzBuilderOutput).
+        Shares the buzz_builder result cache with generate_buzz.
+        """
+        cached_output = await get_cached_model(self.cache, "buzz_builder", BuzzBuilderOutput, input_data)
+        if cached_output is not None:
+            for suggestion in cached_output.suggestions:
+                yield "suggestion", suggestion
+            yield "result", cached_output
+            return
+
+        async with stream_gemini_json(self.gemini_client, self._build_prompt(input_data), ["suggestions"], stage="buzz_builder.generate") as events:
+            async for array_key, gemini_data in events:
+                if array_key is not None:
+                    yield "suggestion", SocialPostSuggestion(**gemini_data)
+                    continue
+                output = BuzzBuilderOutput(
+                    startup_name=input_data.startup_name,
+                    suggestions=[SocialPostSuggestion(**s) for s in gemini_data.get("suggestions", [])],
+                    ai_tips=gemini_data.get("ai_tips", [])
+                )
+
+        await store_cached_model(self.cache, "buzz_builder", BuzzBuilderOutput, input_data, output)
+        yield "result", output
@@ -1,37 +1,60 @@
 import json
-import redis.asyncio as redis
-import google.generativeai as genai
-from serpapi import GoogleSearch
+from app.core.cache import TwoTierCache
+from app.core.degradation import degradation_tracked
+from app.core.result_cache import cached_result, build_query_cache_key, get_cached_model, store_cached_model
+from app.core.cache_codec import dumps_compact, project_fields
+from app.core.prompt_builder import PromptBuilder, clean_snippets, truncate_text
+from app.core.gemini_client import GeminiClient
+from app.core.search_client import SearchClient, get_search_client
 import asyncio
-import hashlib
 import re
 from pydantic import HttpUrl
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple, AsyncIterator
 
 from app.models.schemas import CompetitorRadarInput, CompetitorRadarOutput, CompetitorInfo
 from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_COMPETITOR_INFO_SCHEMA = """{
+            "name": "Competitor Name",
+            "website": "Optional Website URL (extract from links if prominent, otherwise null)",
+            "product_description": "Brief description of their product/service.",
+            "value_proposition": "Key value proposition they offer.",
+            "target_market": "Their primary target market.",
+            "funding_rounds": ["Round X: $Y from Z"],
+            "press_mentions_summary": ["Summary of key news mentions"],
+            "hiring_surge_indication": "High|Medium|Low|No indication" (based on mentions of growth, hiring, expansion),
+            "overall_summary": "Concise overview of recent activity."
+        }"""
 
 class CompetitorRadarService:
-    def __init__(self, redis_client: redis.Redis, gemini_model: genai.GenerativeModel):
-        self.redis_client = redis_client
-        self.gemini_model = gemini_model
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient, search_client: Optional[SearchClient] = None):
+        self.cache = cache
+        self.gemini_client = gemini_client
+        self.search_client = search_client or get_search_client()
         self.serpapi_key = settings.SERPAPI_API_KEY
-        print(f"DEBUG(SerpAPI): Competitor Radar Key loaded status: {bool(self.serpapi_key)}")
-        if self.serpapi_key:
-            print(f"DEBUG(SerpAPI): Competitor Radar Key prefix: {self.serpapi_key[:5]}...")
+        if not self.serpapi_key:
+            logger.warning("SerpAPI key not configured for CompetitorRadar. News search will be skipped.")
 
     async def _search_google_news(self, query: str) -> List[Dict[str, Any]]:
         if not self.serpapi_key:
             return []
 
-        cache_key = f"news_search:{hashlib.sha256(query.encode('utf-8')).hexdigest()}"
-        cached_results = await self.redis_client.get(cache_key)
-        if cached_results:
-            print(f"DEBUG(SerpAPI): News cache hit for '{query}'.")
-            return json.loads(cached_results)
+        cached_results = await self.cache.get_or_revalidate(
+            build_query_cache_key("news_search", query),
+            loader=lambda: self._load_google_news(query),
+            soft_ttl=7200,
+            hard_ttl=settings.SEARCH_CACHE_HARD_TTL_SECONDS,
+        )
+        return json.loads(cached_results) if cached_results else []
 
+    async def _load_google_news(self, query: str) -> Optional[str]:
+        """
+        Fetches news results from SerpAPI, serialized for caching. Returns None on failure.
+        """
         params = {
-            "api_key": self.serpapi_key,
             "engine": "google",
             "q": query,
             "tbm": "nws",
@@ -39,16 +62,35 @@ class CompetitorRadarService:
             "hl": "en"
         }
         try:
-            search = GoogleSearch(params)
-            results = await asyncio.to_thread(search.get_dict)
-            news_results = results.get("news_results", [])
-            
-            await self.redis_client.setex(cache_key, 7200, json.dumps(news_results))
-            print(f"DEBUG(SerpAPI): Fetched and cached {len(news_results)} news results for '{query}'.")
-            return news_results
+            results = await self.search_client.search(params, stage="competitor_radar.news_search")
+            # Only the fields read by the analysis and trend prompts are cached.
+            news_results = project_fields(results.get("news_results", []), ("title", "link", "snippet"))
+            logger.debug("Fetched %s news results for '%s'.", len(news_results), query)
+            return dumps_compact(news_results)
         except Exception as e:
-            print(f"ERROR(SerpAPI): News search failed for '{query}': {e}")
-            return []
+            logger.error("News search failed for '%s': %s", query, e)
+            return None
+
+    def _format_news_data(self, news_data: List[Dict[str, Any]]) -> List[str]:
+        if not news_data:
+            return ["No specific news found. Synthesize general info."]
+        return [
+            f"- Title: {item.get('title', 'N/A')}\n  Snippet: {truncate_text(item.get('snippet') or 'N/A', settings.PROMPT_SNIPPET_MAX_CHARS)}\n  Link: {item.get('link', 'N/A')}\n"
+            for item in news_data[:5]
+        ]
+
+    def _parse_competitor_info(self, competitor_name: str, gemini_data: Dict[str, Any]) -> CompetitorInfo:
+        return CompetitorInfo(
+            name=gemini_data.get("name", competitor_name),
+            website=gemini_data.get("website"),
+            product_description=gemini_data.get("product_description"),
+            value_proposition=gemini_data.get("value_proposition"),
+            target_market=gemini_data.get("target_market"),
+            funding_rounds=gemini_data.get("funding_rounds", []),
+            press_mentions_summary=gemini_data.get("press_mentions_summary", []),
+            hiring_surge_indication=gemini_data.get("hiring_surge_indication", "No indication"),
+            overall_summary=gemini_data.get("overall_summary", "Could not generate detailed summary.")
+        )
 
     async def _analyze_competitor_with_gemini(self, competitor_name: str, industry: str, news_data: List[Dict[str, Any]]) -> CompetitorInfo:
         prompt_parts = [
@@ -57,49 +99,25 @@ class CompetitorRadarService:
             "Provide a concise overall summary of their recent activity.",
             "\n\nNews Data:\n"
         ]
-        if news_data:
-            for item in news_data[:5]:
-                prompt_parts.append(f"- Title: {item.get('title', 'N/A')}\n  Snippet: {item.get('snippet', 'N/A')}\n  Link: {item.get('link', 'N/A')}\n")
-        else:
-            prompt_parts.append("No specific news found. Synthesize general info.")
+        prompt_parts.extend(self._format_news_data(news_data))
 
-        prompt_parts.append("""
+        prompt_parts.append(f"""
         Provide the output in a JSON format with the following keys:
-        {
-            "name": "Competitor Name",
-            "website": "Optional Website URL (extract from links if prominent, otherwise null)",
-            "product_description": "Brief description of their product/service.",
-            "value_proposition": "Key value proposition they offer.",
-            "target_market": "Their primary target market.",
-            "funding_rounds": ["Round X: $Y from Z"],
-            "press_mentions_summary": ["Summary of key news mentions"],
-            "hiring_surge_indication": "High|Medium|Low|No indication" (based on mentions of growth, hiring, expansion),
-            "overall_summary": "Concise overview of recent activity."
-        }
+        {_COMPETITOR_INFO_SCHEMA}
         If no information is found for a field, provide an empty list, null, or "No indication".
         """)
 
         try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, "".join(prompt_parts))
+            response = await self.gemini_client.generate_content("".join(prompt_parts), stage="competitor_radar.analyze")
             gemini_output_text = response.text.strip()
             if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
                 gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
             
             gemini_data = json.loads(gemini_output_text)
             
-            return CompetitorInfo(
-                name=gemini_data.get("name", competitor_name),
-                website=gemini_data.get("website"),
-                product_description=gemini_data.get("product_description"),
-                value_proposition=gemini_data.get("value_proposition"),
-                target_market=gemini_data.get("target_market"),
-                funding_rounds=gemini_data.get("funding_rounds", []),
-                press_mentions_summary=gemini_data.get("press_mentions_summary", []),
-                hiring_surge_indication=gemini_data.get("hiring_surge_indication", "No indication"),
-                overall_summary=gemini_data.get("overall_summary", "Could not generate detailed summary.")
-            )
+            return self._parse_competitor_info(competitor_name, gemini_data)
         except Exception as e:
-            print(f"ERROR(Gemini): Competitor analysis failed for '{competitor_name}': {e}")
+            logger.error("Competitor analysis failed for '%s': %s", competitor_name, e)
             return CompetitorInfo(
                 name=competitor_name,
                 website=None,
@@ -113,64 +131,187 @@ class CompetitorRadarService:
             )
 
 
-    async def track_competitors(self, input_data: CompetitorRadarInput) -> CompetitorRadarOutput:
+    async def _analyze_competitors_with_gemini(self, competitors: List[Tuple[str, List[Dict[str, Any]]]], industry: str) -> Dict[str, CompetitorInfo]:
+        """
+        Analyzes several competitors in a single Gemini call. Returns the validated results
+        keyed by the requested competitor name; competitors missing from or invalid in the
+        response are left out so the caller can analyze them individually.
+        """
+        prompt_parts = [
+            f"Analyze the following news and search results for {len(competitors)} competitors in the '{industry}' industry, each independently. ",
+            "For each competitor, extract key information regarding their product/service description, value proposition, target market, recent funding rounds, press mentions, and any indications of hiring surges. ",
+            "Provide a concise overall summary of their recent activity.",
+        ]
+        for competitor_name, news_data in competitors:
+            prompt_parts.append(f"\n\nCompetitor: {competitor_name}\nNews Data:\n")
+            prompt_parts.extend(self._format_news_data(news_data))
+
+        prompt_parts.append(f"""
+        Provide the output as a JSON array with exactly one object per competitor, each with the following keys:
+        {_COMPETITOR_INFO_SCHEMA}
+        Use each competitor's name exactly as given above for "name".
+        If no information is found for a field, provide an empty list, null, or "No indication".
+        """)
+
+        try:
+            response = await self.gemini_client.generate_content("".join(prompt_parts), stage="competitor_radar.analyze_combined")
+            gemini_output_text = response.text.strip()
+            if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
+                gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
+
+            gemini_data = json.loads(gemini_output_text)
+            if not isinstance(gemini_data, list):
+                raise ValueError("Expected a JSON array of competitors.")
+        except Exception as e:
+            logger.error("Combined competitor analysis failed: %s", e)
+            return {}
+
+        requested_names = {competitor_name.casefold(): competitor_name for competitor_name, _ in competitors}
+        results: Dict[str, CompetitorInfo] = {}
+        for entry in gemini_data:
+            competitor_name = requested_names.get(str(entry.get("name", "")).casefold()) if isinstance(entry, dict) else None
+            if competitor_name is None or competitor_name in results:
+                continue
+            try:
+                results[competitor_name] = self._parse_competitor_info(competitor_name, entry)
+            except Exception as e:
+                logger.error("Combined analysis returned an invalid entry for '%s': %s", competitor_name, e)
+        return results
+
+    async def _search_google_organic(self, query: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """
+        Runs one candidate search. Returns an empty result on failure, so one failed query
+        does not fail the request.
+        """
+        async with semaphore:
+            try:
+                return await self.search_client.search({"engine": "google", "q": query, "gl": "us", "hl": "en"}, stage="competitor_radar.organic_search")
+            except Exception as e:
+                logger.error("Organic search failed for '%s': %s", query, e)
+                return {}
+
+    async def _track_single_competitor(self, comp_name: str, comp_link: Optional[str], input_data: CompetitorRadarInput, semaphore: asyncio.Semaphore) -> Tuple[CompetitorInfo, List[Dict[str, Any]]]:
+        """
+        Runs the news lookup and Gemini analysis chain for one competitor.
+        Returns the competitor info together with the news used, for trend synthesis.
+        """
+        async with semaphore:
+            comp_news = await self._search_competitor_news(comp_name, input_data)
+            competitor_info = await self._analyze_competitor_with_gemini(comp_name, input_data.your_industry, comp_news)
+
+        if comp_link and not competitor_info.website:
+            competitor_info.website = HttpUrl(comp_link)
+
+        return competitor_info, comp_news
+
+    async def _search_competitor_news(self, comp_name: str, input_data: CompetitorRadarInput) -> List[Dict[str, Any]]:
+        return await self._search_google_news(f"{comp_name} {input_data.your_industry} {input_data.your_product_service_description} news funding hiring")
+
+    async def _track_competitors_combined(self, competitor_names: List[str], competitor_name_to_link: Dict[str, Optional[str]], input_data: CompetitorRadarInput, semaphore: asyncio.Semaphore) -> List[Tuple[CompetitorInfo, List[Dict[str, Any]]]]:
+        """
+        Same result as running _track_single_competitor for every competitor, but with one
+        Gemini call for all of them. Competitors the combined call does not return get
+        their own call.
+        """
+        async def search_news(comp_name: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._search_competitor_news(comp_name, input_data)
+
+        all_news = await asyncio.gather(*[search_news(comp_name) for comp_name in competitor_names])
+        competitor_infos = await self._analyze_competitors_with_gemini(list(zip(competitor_names, all_news)), input_data.your_industry)
+
+        missing = [(comp_name, comp_news) for comp_name, comp_news in zip(competitor_names, all_news) if comp_name not in competitor_infos]
+        if missing:
+            logger.debug("Falling back to per-competitor analysis for %s of %s competitors.", len(missing), len(competitor_names))
+            fallback_infos = await asyncio.gather(*[
+                self._analyze_competitor_with_gemini(comp_name, input_data.your_industry, comp_news)
+                for comp_name, comp_news in missing
+            ])
+            competitor_infos.update(zip([comp_name for comp_name, _ in missing], fallback_infos))
+
+        competitor_chains = []
+        for comp_name, comp_news in zip(competitor_names, all_news):
+            competitor_info = competitor_infos[comp_name]
+            comp_link = competitor_name_to_link.get(comp_name)
+            if comp_link and not competitor_info.website:
+                competitor_info.website = HttpUrl(comp_link)
+            competitor_chains.append((competitor_info, comp_news))
+        return competitor_chains
+
+    def _collect_candidates(self, google_results: Dict[str, Any], input_data: CompetitorRadarInput, candidates: Set[Tuple[str, Optional[str]]]):
+        """
+        Adds the (name, link) candidates found in one organic search result to `candidates`.
+        """
+        if "knowledge_graph" in google_results:
+            name = google_results["knowledge_graph"].get("title")
+            if name and input_data.startup_name.lower() not in name.lower():
+                candidates.add((name, google_results["knowledge_graph"].get("website")))
+
+        for organic_result in google_results.get("organic_results", []):
+            title = organic_result.get("title", "")
+            link = organic_result.get("link", "")
+            snippet = organic_result.get("snippet", "")
+
+            candidate_name = ""
+            if " - " in title:
+                candidate_name = title.split(" - ")[0].strip()
+            elif " | " in title:
+                candidate_name = title.split(" | ")[0].strip()
+            elif link and ('.com' in link or '.io' in link or '.co' in link or '.tech' in link):
+                domain_match = re.search(r'https?://(?:www\.)?([a-zA-Z0-9-]+)\.(?:com|io|co|tech)', link)
+                if domain_match:
+                    candidate_name = domain_match.group(1).replace('-', ' ').title()
+                    if len(candidate_name) > 3 and "company" not in candidate_name.lower():
+                        candidates.add((candidate_name, link))
+                        continue
+
+            if candidate_name and len(candidate_name) > 3 and input_data.startup_name.lower() not in candidate_name.lower():
+                if not any(kw in title.lower() for kw in ["best", "top", "list", "vs", "review", "news"]) and \
+                   not any(kw in snippet.lower() for kw in ["compare", "guide"]):
+                    candidates.add((candidate_name, link))
+
+    async def _select_competitors(self, input_data: CompetitorRadarInput, semaphore: asyncio.Semaphore) -> Tuple[List[str], Dict[str, Optional[str]]]:
+        """
+        Finds candidate companies via organic search and lets Gemini pick up to 5 real competitors.
+        Returns the selected names and a name -> link mapping of all candidates.
+        """
         search_queries = [
             f"'{input_data.your_industry}' companies for '{input_data.your_product_service_description}'",
             f"competitors of '{input_data.startup_name}' {input_data.your_industry}",
             f"top '{input_data.your_industry}' startups with '{input_data.your_product_service_description}'"
         ]
-        
-        potential_competitor_candidates = set()
-        for query in search_queries:
-            google_results = await asyncio.to_thread(GoogleSearch({"api_key": self.serpapi_key, "q": query, "gl": "us", "hl": "en"}).get_dict)
-            if "knowledge_graph" in google_results:
-                name = google_results["knowledge_graph"].get("title")
-                if name and input_data.startup_name.lower() not in name.lower():
-                    potential_competitor_candidates.add((name, google_results["knowledge_graph"].get("website")))
-
-            for organic_result in google_results.get("organic_results", []):
-                title = organic_result.get("title", "")
-                link = organic_result.get("link", "")
-                snippet = organic_result.get("snippet", "")
-
-                candidate_name = ""
-                if " - " in title:
-                    candidate_name = title.split(" - ")[0].strip()
-                elif " | " in title:
-                    candidate_name = title.split(" | ")[0].strip()
-                elif link and ('.com' in link or '.io' in link or '.co' in link or '.tech' in link):
-                    domain_match = re.search(r'https?://(?:www\.)?([a-zA-Z0-9-]+)\.(?:com|io|co|tech)', link)
-                    if domain_match:
-                        candidate_name = domain_match.group(1).replace('-', ' ').title()
-                        if len(candidate_name) > 3 and "company" not in candidate_name.lower():
-                            potential_competitor_candidates.add((candidate_name, link))
-                            continue
-
-                if candidate_name and len(candidate_name) > 3 and input_data.startup_name.lower() not in candidate_name.lower():
-                    if not any(kw in title.lower() for kw in ["best", "top", "list", "vs", "review", "news"]) and \
-                       not any(kw in snippet.lower() for kw in ["compare", "guide"]):
-                        potential_competitor_candidates.add((candidate_name, link))
-            
-            if len(potential_competitor_candidates) >= 10:
-                break
-
-        print(f"DEBUG(SerpAPI): Found {len(potential_competitor_candidates)} raw competitor candidates.")
+        # The first query usually yields enough candidates; the others only run when it does not.
+        potential_competitor_candidates: Set[Tuple[str, Optional[str]]] = set()
+        self._collect_candidates(await self._search_google_organic(search_queries[0], semaphore), input_data, potential_competitor_candidates)
+        if len(potential_competitor_candidates) < 10:
+            remaining_results = await asyncio.gather(*[self._search_google_organic(query, semaphore) for query in search_queries[1:]])
+            for google_results in remaining_results:
+                self._collect_candidates(google_results, input_data, potential_competitor_candidates)
+                if len(potential_competitor_candidates) >= 10:
+                    break
 
-        competitor_filter_prompt = f"""
-        From the following list of potential company names and their associated URLs, identify and select up to 5 actual, distinct competitor companies for a startup in the '{input_data.your_industry}' industry that offers '{input_data.your_product_service_description}'.
-        Exclude generic terms, news articles, lists, and irrelevant entries.
-        Only include names that appear to be real companies directly competing or offering similar products/services.
+        logger.debug("Found %s raw competitor candidates.", len(potential_competitor_candidates))
 
-        Potential Candidates (Name, URL):
-        {json.dumps(list(potential_competitor_candidates), indent=2)}
+        competitor_filter_prompt = (
+            PromptBuilder("competitor_filter")
+            .add_text(f"""
+            From the following list of potential company names and their associated URLs, identify and select up to 5 actual, distinct competitor companies for a startup in the '{input_data.your_industry}' industry that offers '{input_data.your_product_service_description}'.
+            Exclude generic terms, news articles, lists, and irrelevant entries.
+            Only include names that appear to be real companies directly competing or offering similar products/services.
 
-        Provide the output as a JSON array of selected competitor names (strings), exactly as they appear in the input list.
-        Do not include any preamble, just the JSON array.
-        """
+            Potential Candidates (Name, URL):
+            """)
+            .add_json_items(sorted(potential_competitor_candidates, key=lambda candidate: (candidate[0], candidate[1] or "")))
+            .add_text("""
+            Provide the output as a JSON array of selected competitor names (strings), exactly as they appear in the input list.
+            Do not include any preamble, just the JSON array.
+            """)
+            .build()
+        )
         
         filtered_competitor_names: List[str] = []
         try:
-            gemini_filter_response = await asyncio.to_thread(self.gemini_model.generate_content, competitor_filter_prompt)
+            gemini_filter_response = await self.gemini_client.generate_content(competitor_filter_prompt, stage="competitor_radar.filter")
             gemini_filter_text = gemini_filter_response.text.strip()
             if gemini_filter_text.startswith("```json") and gemini_filter_text.endswith("```"):
                 gemini_filter_text = gemini_filter_text[len("```json"): -len("```")].strip()
@@ -178,54 +319,100 @@ class CompetitorRadarService:
             filtered_competitor_names = json.loads(gemini_filter_text)
             if not isinstance(filtered_competitor_names, list):
                 filtered_competitor_names = []
-            print(f"DEBUG(Gemini): Filtered down to {len(filtered_competitor_names)} actual competitors.")
+            logger.debug("Filtered down to %s actual competitors.", len(filtered_competitor_names))
 
         except Exception as e:
-            print(f"ERROR(Gemini): Competitor filtering failed: {e}. Using raw candidates (less accurate).")
+            logger.error("Competitor filtering failed: %s. Using raw candidates (less accurate).", e)
             filtered_competitor_names = [name for name, _ in list(potential_competitor_candidates)[:5]]
 
 
-        tracked_competitors: List[CompetitorInfo] = []
-        general_market_trends: List[str] = []
-
         competitor_name_to_link = {name: link for name, link in potential_competitor_candidates}
+        return filtered_competitor_names[:5], competitor_name_to_link
 
-        for comp_name in filtered_competitor_names[:5]:
-            comp_link = competitor_name_to_link.get(comp_name)
-            
-            comp_news = await self._search_google_news(f"{comp_name} {input_data.your_industry} {input_data.your_product_service_description} news funding hiring")
-            competitor_info = await self._analyze_competitor_with_gemini(comp_name, input_data.your_industry, comp_news)
-            
-            if comp_link and not competitor_info.website:
-                competitor_info.website = HttpUrl(comp_link)
-            
-            tracked_competitors.append(competitor_info)
-
-            for news_item in comp_news[:5]:
-                general_market_trends.append(news_item.get("snippet", ""))
+    async def _synthesize_market_trends(self, input_data: CompetitorRadarInput, competitor_news: List[List[Dict[str, Any]]]) -> List[str]:
+        general_market_trends: List[str] = clean_snippets(
+            news_item.get("snippet") for comp_news in competitor_news for news_item in comp_news[:5]
+        )
 
         if general_market_trends:
-            trend_prompt = f"""
-            Analyze the following snippets related to competitors in the {input_data.your_industry} industry, specifically concerning products/services like: "{input_data.your_product_service_description}".
-            Synthesize 3-5 key emerging market trends, challenges, or opportunities.
-            Do not include any preamble, just a JSON array of strings.
-
-            Snippets: {'; '.join(general_market_trends)}
-            """
+            trend_prompt = (
+                PromptBuilder("competitor_trends")
+                .add_text(f"""
+                Analyze the following snippets related to competitors in the {input_data.your_industry} industry, specifically concerning products/services like: "{input_data.your_product_service_description}".
+                Synthesize 3-5 key emerging market trends, challenges, or opportunities.
+                Do not include any preamble, just a JSON array of strings.
+                """)
+                .add_items(general_market_trends, separator="; ", prefix="Snippets: ", min_items=1)
+                .build()
+            )
             try:
-                trend_response = await asyncio.to_thread(self.gemini_model.generate_content, trend_prompt)
+                trend_response = await self.gemini_client.generate_content(trend_prompt, stage="competitor_radar.trends")
                 trend_text = trend_response.text.strip()
                 if trend_text.startswith("```json") and trend_text.endswith("```"):
                     trend_text = trend_text[len("```json"): -len("```")].strip()
                 
                 general_market_trends = json.loads(trend_text)
             except Exception as e:
-                print(f"ERROR(Gemini): Market trend analysis failed: {e}")
+                logger.error("Market trend analysis failed: %s", e)
                 general_market_trends = ["Could not generate market trends due to AI error."]
 
+        return general_market_trends
+
+    @cached_result("competitor_radar", CompetitorRadarOutput, ttl=3600)
+    async def track_competitors(self, input_data: CompetitorRadarInput) -> CompetitorRadarOutput:
+        semaphore = asyncio.Semaphore(settings.COMPETITOR_RADAR_MAX_PARALLEL)
+        competitor_names, competitor_name_to_link = await self._select_competitors(input_data, semaphore)
+
+        if settings.COMPETITOR_RADAR_COMBINED_ANALYSIS and len(competitor_names) > 1:
+            competitor_chains = await self._track_competitors_combined(competitor_names, competitor_name_to_link, input_data, semaphore)
+        else:
+            competitor_chains = await asyncio.gather(*[
+                self._track_single_competitor(comp_name, competitor_name_to_link.get(comp_name), input_data, semaphore)
+                for comp_name in competitor_names
+            ])
 
         return CompetitorRadarOutput(
             startup_name=input_data.startup_name,
-            tracked_competitors=tracked_competitors,
-            general_market_trends=general_market_trends
+            tracked_competitors=[competitor_info for competitor_info, _ in competitor_chains],
+            general_market_trends=await self._synthesize_market_trends(input_data, [comp_news for _, comp_news in competitor_chains])
         )
+
+    @degradation_tracked
+    async def stream_competitors(self, input_data: CompetitorRadarInput) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Progressive variant of track_competitors. Yields ("competitor", CompetitorInfo) as soon as each
+        competitor's news lookup and analysis finish, then ("market_trends", List[str]).
+        Shares the competitor_radar result cache with track_competitors.
+        """
+        cached_output = await get_cached_model(self.cache, "competitor_radar", CompetitorRadarOutput, input_data)
+        if cached_output is not None:
+            for competitor_info in cached_output.tracked_competitors:
+                yield "competitor", competitor_info
+            yield "market_trends", cached_output.general_market_trends
+            return
+
+        semaphore = asyncio.Semaphore(settings.COMPETITOR_RADAR_MAX_PARALLEL)
+        competitor_names, competitor_name_to_link = await self._select_competitors(input_data, semaphore)
+
+        async def run_chain(index: int, comp_name: str):
+            return index, await self._track_single_competitor(comp_name, competitor_name_to_link.get(comp_name), input_data, semaphore)
+
+        tasks = [asyncio.ensure_future(run_chain(index, comp_name)) for index, comp_name in enumerate(competitor_names)]
+        competitor_chains: List[Optional[Tuple[CompetitorInfo, List[Dict[str, Any]]]]] = [None] * len(tasks)
+        try:
+            for completed in asyncio.as_completed(tasks):
+                index, chain = await completed
+                competitor_chains[index] = chain
+                yield "competitor", chain[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        general_market_trends = await self._synthesize_market_trends(input_data, [comp_news for _, comp_news in competitor_chains])
+        yield "market_trends", general_market_trends
+
+        await store_cached_model(self.cache, "competitor_radar", CompetitorRadarOutput, input_data, CompetitorRadarOutput(
+            startup_name=input_data.startup_name,
+            tracked_competitors=[competitor_info for competitor_info, _ in competitor_chains],
+            general_market_trends=general_market_trends
+        ))
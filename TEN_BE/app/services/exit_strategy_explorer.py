@@ -1,18 +1,22 @@
 import json
-import redis.asyncio as redis
-import google.generativeai as genai
-import asyncio
-import hashlib
-from typing import List, Dict, Any, Optional
+from app.core.cache import TwoTierCache
+from app.core.degradation import degradation_tracked
+from app.core.result_cache import cached_result, get_cached_model, store_cached_model
+from app.core.gemini_client import GeminiClient
+from app.core.json_stream import stream_gemini_json
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 
 from app.models.schemas import ExitStrategyExplorerInput, ExitStrategyExplorerOutput, ExitStrategy, AcquirerType, ActionItem
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ExitStrategyExplorerService:
-    def __init__(self, redis_client: redis.Redis, gemini_model: genai.GenerativeModel):
-        self.redis_client = redis_client
-        self.gemini_model = gemini_model
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient):
+        self.cache = cache
+        self.gemini_client = gemini_client
 
-    async def explore_exit_strategies(self, input_data: ExitStrategyExplorerInput) -> ExitStrategyExplorerOutput:
+    def _build_prompt(self, input_data: ExitStrategyExplorerInput) -> str:
         optional_details = []
         if input_data.current_revenue_usd is not None:
             optional_details.append(f"Current Revenue: ${input_data.current_revenue_usd:,.2f} USD.")
@@ -29,7 +33,7 @@ class ExitStrategyExplorerService:
 
         optional_details_str = "\n" + "\n".join(optional_details) if optional_details else ""
 
-        prompt = f"""
+        return f"""
         You are an AI strategic advisor helping startup founders plan for long-term growth and potential exit strategies.
         Analyze the startup '{input_data.startup_name}' in the '{input_data.industry}' industry.
         Their business model is summarized as: "{input_data.business_model_summary}".
@@ -61,11 +65,37 @@ class ExitStrategyExplorerService:
         }}
         """
 
+    def _parse_strategy(self, s: Dict[str, Any]) -> ExitStrategy:
+        # Ensure nested lists are correctly parsed and handle potential non-list types
+        common_acquirer_types_list = s.get("common_acquirer_types", [])
+        if not isinstance(common_acquirer_types_list, list):
+            common_acquirer_types_list = [str(common_acquirer_types_list)] # Wrap in list if not already
+
+        attractiveness_metrics_list = s.get("attractiveness_metrics", [])
+        if not isinstance(attractiveness_metrics_list, list):
+            attractiveness_metrics_list = [str(attractiveness_metrics_list)]
+
+        action_items_list = s.get("action_items", [])
+        if not isinstance(action_items_list, list):
+            action_items_list = [str(action_items_list)]
+
+        return ExitStrategy(
+            strategy_name=s.get("strategy_name", "Unknown Strategy"),
+            description=s.get("description", "N/A"),
+            common_acquirer_types=[AcquirerType(type_name=t) for t in common_acquirer_types_list],
+            attractiveness_metrics=attractiveness_metrics_list,
+            action_items=[ActionItem(item=i) for i in action_items_list]
+        )
+
+    @cached_result("exit_strategy", ExitStrategyExplorerOutput, ttl=3600)
+    async def explore_exit_strategies(self, input_data: ExitStrategyExplorerInput) -> ExitStrategyExplorerOutput:
+        prompt = self._build_prompt(input_data)
+
         relevant_exit_strategies: List[ExitStrategy] = []
         strategic_planning_tips: List[str] = []
 
         try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            response = await self.gemini_client.generate_content(prompt, stage="exit_strategy_explorer.explore")
             gemini_output_text = response.text.strip()
 
             # Clean up the JSON string if it's wrapped in markdown
@@ -76,32 +106,13 @@ class ExitStrategyExplorerService:
             
             strategies_raw = gemini_data.get("relevant_exit_strategies", [])
             for s in strategies_raw:
-                # Ensure nested lists are correctly parsed and handle potential non-list types
-                common_acquirer_types_list = s.get("common_acquirer_types", [])
-                if not isinstance(common_acquirer_types_list, list):
-                    common_acquirer_types_list = [str(common_acquirer_types_list)] # Wrap in list if not already
-
-                attractiveness_metrics_list = s.get("attractiveness_metrics", [])
-                if not isinstance(attractiveness_metrics_list, list):
-                    attractiveness_metrics_list = [str(attractiveness_metrics_list)]
-                
-                action_items_list = s.get("action_items", [])
-                if not isinstance(action_items_list, list):
-                    action_items_list = [str(action_items_list)]
-
-                relevant_exit_strategies.append(ExitStrategy(
-                    strategy_name=s.get("strategy_name", "Unknown Strategy"),
-                    description=s.get("description", "N/A"),
-                    common_acquirer_types=[AcquirerType(type_name=t) for t in common_acquirer_types_list],
-                    attractiveness_metrics=attractiveness_metrics_list,
-                    action_items=[ActionItem(item=i) for i in action_items_list]
-                ))
+                relevant_exit_strategies.append(self._parse_strategy(s))
             
             strategic_planning_tips = gemini_data.get("strategic_planning_tips", [])
 
         except json.JSONDecodeError as e:
-            print(f"ERROR(Gemini JSON Parse): Exit Strategy Explorer failed to parse AI response: {e}")
-            print(f"Faulty AI Output:\n{gemini_output_text}")
+            logger.error("Exit Strategy Explorer failed to parse AI response: %s", e)
+            logger.debug("Faulty AI Output:\n%s", gemini_output_text)
             relevant_exit_strategies = [
                 ExitStrategy(
                     strategy_name="AI Response Error",
@@ -113,7 +124,7 @@ class ExitStrategyExplorerService:
             ]
             strategic_planning_tips = ["AI response format error."]
         except Exception as e:
-            print(f"ERROR(Gemini General): Exit Strategy Explorer failed: {e}")
+            logger.error("Exit Strategy Explorer failed: %s", e)
             relevant_exit_strategies = [
                 ExitStrategy(
                     strategy_name="AI Service Error",
@@ -130,3 +141,31 @@ class ExitStrategyExplorerService:
             relevant_exit_strategies=relevant_exit_strategies,
             strategic_planning_tips=strategic_planning_tips
         )
+
+    @degradation_tracked
+    async def stream_exit_strategies(self, input_data: ExitStrategyExplorerInput) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of explore_exit_strategies. Yields ("exit_strategy", ExitStrategy) as soon as
+        each strategy is complete in the Gemini output, then ("result", ExitStrategyExplorerOutput).
+        Shares the exit_strategy result cache with explore_exit_strategies.
+        """
+        cached_output = await get_cached_model(self.cache, "exit_strategy", ExitStrategyExplorerOutput, input_data)
+        if cached_output is not None:
+            for strategy in cached_output.relevant_exit_strategies:
+                yield "exit_strategy", strategy
+            yield "result", cached_output
+            return
+
+        async with stream_gemini_json(self.gemini_client, self._build_prompt(input_data), ["relevant_exit_strategies"], stage="exit_strategy_explorer.explore") as events:
+            async for array_key, gemini_data in events:
+                if array_key is not None:
+                    yield "exit_strategy", self._parse_strategy(gemini_data)
+                    continue
+                output = ExitStrategyExplorerOutput(
+                    startup_name=input_data.startup_name,
+                    relevant_exit_strategies=[self._parse_strategy(s) for s in gemini_data.get("relevant_exit_strategies", [])],
+                    strategic_planning_tips=gemini_data.get("strategic_planning_tips", [])
+                )
+
+        await store_cached_model(self.cache, "exit_strategy", ExitStrategyExplorerOutput, input_data, output)
+        yield "result", output
@@ -1,20 +1,27 @@
 import json
 from typing import List, Dict, Any, Optional
-import redis.asyncio as redis
+from app.core.cache import TwoTierCache
+from app.core.result_cache import cached_result, build_query_cache_key
+from app.core.cache_codec import dumps_compact, project_fields
+from app.core.prompt_builder import PromptBuilder, truncate_text
 from app.models.schemas import InvestorMatchInput, InvestorMatchOutput, MatchDetail, InvestorProfile, RiskOutput, ReputationOutput
-import google.generativeai as genai
+from app.core.gemini_client import GeminiClient
+from app.core.search_client import SearchClient, get_search_client
 import asyncio
 import hashlib
-from serpapi import GoogleSearch
 from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 class InvestorMatcherService:
-    def __init__(self, redis_client: redis.Redis, gemini_model: genai.GenerativeModel):
-        self.redis_client = redis_client
-        self.gemini_model = gemini_model
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient, search_client: Optional[SearchClient] = None):
+        self.cache = cache
+        self.gemini_client = gemini_client
+        self.search_client = search_client or get_search_client()
         self.serpapi_key = settings.SERPAPI_API_KEY
         if not self.serpapi_key:
-            print("WARNING: SerpAPI key not configured for InvestorMatcher. Investor search will be limited or fail.")
+            logger.warning("SerpAPI key not configured for InvestorMatcher. Investor search will be limited or fail.")
 
 
     async def _generate_investor_search_queries(self, input_data: InvestorMatchInput) -> List[str]:
@@ -32,7 +39,7 @@ class InvestorMatcherService:
         Provide the output as a JSON array of strings: ["query1", "query2", "query3"]
         """
         try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            response = await self.gemini_client.generate_content(prompt, stage="investor_matcher.generate_queries")
             gemini_output_text = response.text.strip()
             if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
                 gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
@@ -40,10 +47,10 @@ class InvestorMatcherService:
             queries = json.loads(gemini_output_text)
             if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
                 raise ValueError("Gemini did not return a valid list of queries.")
-            print(f"DEBUG(Matching): Generated queries: {queries}")
+            logger.debug("Generated queries: %s", queries)
             return queries
         except Exception as e:
-            print(f"ERROR(Matching): Gemini failed to generate investor search queries: {e}")
+            logger.error("Gemini failed to generate investor search queries: %s", e)
             return [
                 f"{input_data.industry} angel investors",
                 f"seed stage {input_data.industry} VC firms",
@@ -56,30 +63,35 @@ class InvestorMatcherService:
         Extracts relevant snippets and titles.
         """
         if not self.serpapi_key:
-            print("SerpAPI key not configured. Skipping investor search via SerpAPI.")
+            logger.debug("SerpAPI key not configured. Skipping investor search via SerpAPI.")
             return []
 
-        cache_key_serp = f"investor_serp_raw:{hashlib.sha256(query.encode('utf-8')).hexdigest()}"
-        cached_results_json = await self.redis_client.get(cache_key_serp)
-        if cached_results_json:
-            print(f"DEBUG(Matching): Cache hit for investor SerpAPI raw results: '{query}'")
-            return json.loads(cached_results_json)
+        cached_results_json = await self.cache.get_or_revalidate(
+            build_query_cache_key("investor_serp_raw", query),
+            loader=lambda: self._load_investors_from_serpapi(query),
+            soft_ttl=3600,
+            hard_ttl=settings.SEARCH_CACHE_HARD_TTL_SECONDS,
+        )
+        return json.loads(cached_results_json) if cached_results_json else []
 
+    async def _load_investors_from_serpapi(self, query: str) -> Optional[str]:
+        """
+        Runs the SerpAPI investor search, serialized for caching.
+        Returns None when there is nothing worth caching (errors or no organic results).
+        """
         params = {
-            "api_key": self.serpapi_key,
             "engine": "google",
             "q": query,
             "num": 10
         }
         results_data = []
         try:
-            print(f"DEBUG(Matching): Calling SerpAPI for investor query '{query}' with params: {params}")
-            search = GoogleSearch(params)
-            raw_results = await asyncio.to_thread(search.get_dict)
+            logger.debug("Calling SerpAPI for investor query '%s'.", query)
+            raw_results = await self.search_client.search(params, timeout=settings.INVESTOR_SEARCH_TIMEOUT_SECONDS, stage="investor_matcher.search")
             
             if "error" in raw_results:
-                print(f"ERROR(Matching): SerpAPI returned an error for investor query '{query}': {raw_results['error']}")
-                return []
+                logger.error("SerpAPI returned an error for investor query '%s': %s", query, raw_results['error'])
+                return None
 
             if "organic_results" in raw_results:
                 for res in raw_results["organic_results"]:
@@ -90,14 +102,35 @@ class InvestorMatcherService:
                     })
             
             if results_data:
-                await self.redis_client.setex(cache_key_serp, 3600, json.dumps(results_data))
-                print(f"DEBUG(Matching): Cached {len(results_data)} raw search results for '{query}'.")
-            else:
-                print(f"DEBUG(Matching): No organic results found for investor query '{query}'. Not caching.")
+                logger.debug("Fetched %s raw search results for '%s'.", len(results_data), query)
+                return dumps_compact(results_data)
+            logger.debug("No organic results found for investor query '%s'. Not caching.", query)
 
         except Exception as e:
-            print(f"ERROR(Matching): Exception during SerpAPI investor call for query '{query}': {type(e).__name__}: {e}")
-        return results_data
+            logger.error("Exception during SerpAPI investor call for query '%s': %s: %s", query, type(e).__name__, e)
+        return None
+
+    async def _fetch_all_investor_results(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Runs the investor searches concurrently (at most INVESTOR_SEARCH_MAX_PARALLEL at a time)
+        and merges them in query order, deduplicated by link or title, so the curation prompt
+        does not depend on which search finished first. A failed search contributes no results.
+        """
+        semaphore = asyncio.Semaphore(settings.INVESTOR_SEARCH_MAX_PARALLEL)
+
+        async def fetch_bounded(query: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._fetch_investors_from_serpapi(query)
+
+        deduplicated_results: Dict[str, Dict[str, Any]] = {}
+        for search_results in await asyncio.gather(*[fetch_bounded(q) for q in queries]):
+            for res in search_results:
+                if res.get("link"):
+                    deduplicated_results[res["link"]] = res
+                elif res.get("title"):
+                    deduplicated_results[res["title"]] = res
+
+        return list(deduplicated_results.values())
 
     async def _curate_investors_with_gemini(self, startup_info: Dict[str, Any], raw_investor_results: List[Dict[str, Any]]) -> List[MatchDetail]:
         """
@@ -114,54 +147,47 @@ class InvestorMatcherService:
                ("investor" in res.get("snippet", "").lower() or "fund" in res.get("snippet", "").lower() or "capital" in res.get("title", "").lower() or "vc" in res.get("title", "").lower() or "angel" in res.get("title", "").lower()): # Added more keywords for filtering
                 clean_results.append(res)
         
-        top_n_results = clean_results[:10]
+        top_n_results = [
+            {**result, "snippet": truncate_text(result.get("snippet", ""), settings.PROMPT_SNIPPET_MAX_CHARS)}
+            for result in project_fields(clean_results[:10], ("title", "link", "snippet"))
+        ]
 
-        prompt = f"""
-        You are an expert in startup funding. Given the following startup's profile and a list of Google search results,
-        identify the 3 MOST RELEVANT and ACTUAL investors (can be a specific firm, an angel investor, or an accelerator) that would be a good match for this startup.
-        For each identified investor, provide:
-        - Their specific name (firm or individual).
-        - Their website link (if available from results).
-        - A match score (0-100).
-        - Concise reasons for the match.
-        - Any significant gaps (why they might NOT be a perfect fit or what the startup needs to do).
-        - Their inferred risk tolerance (low, medium, high).
-        - Their inferred preferred industries (list of strings).
-        - Their inferred typical min/max investment in USD (integer).
-        - Their inferred feedback focus (list of strings).
-
-        Startup Profile:
-        {json.dumps(startup_info, indent=2)}
+        prompt = (
+            PromptBuilder("investor_curation")
+            .add_text(f"""
+            You are an expert in startup funding. Given the following startup's profile and a list of Google search results,
+            identify the 3 MOST RELEVANT and ACTUAL investors (can be a specific firm, an angel investor, or an accelerator) that would be a good match for this startup.
+            For each identified investor, provide:
+            - Their specific name (firm or individual).
+            - Their website link (if available from results).
+            - A match score (0-100).
+            - Concise reasons for the match.
+            - Any significant gaps (why they might NOT be a perfect fit or what the startup needs to do).
+            - Their inferred risk tolerance (low, medium, high).
+            - Their inferred preferred industries (list of strings).
+            - Their inferred typical min/max investment in USD (integer).
+            - Their inferred feedback focus (list of strings).
 
-        Google Search Results:
-        ```json
-        {json.dumps(top_n_results, indent=2)}
-        ```
+            Startup Profile:
+            {dumps_compact(startup_info)}
 
-        Provide the output in a JSON array of matched investor objects, strictly adhering to the MatchDetail schema (with InvestorProfile embedded).
-        Only include investors you can confidently identify and assign values to. Max 3 investors.
-        Example of expected output structure for one investor:
-        {{
-            "investor": {{
-                "id": "firm_xyz",
-                "name": "Firm XYZ Ventures",
-                "link": "https://firmxyz.com",
-                "risk_tolerance": "high",
-                "preferred_industries": ["AI", "SaaS"],
-                "min_investment_usd": 1000000,
-                "max_investment_usd": 10000000,
-                "feedback_focus": ["Traction", "Team"]
-            }},
-            "match_score": 90,
-            "match_reasons": ["Strong focus on AI startups", "Matches funding stage"],
-            "gaps": ["Prefers later stage, need more revenue"]
-        }}
-        Do not include any preamble, just the JSON array.
-        """
+            Google Search Results:
+            """)
+            .add_json_items(top_n_results, prefix="```json\n[", suffix="]\n```", min_items=1)
+            .add_text("""
+            Provide the output in a JSON array of matched investor objects, strictly adhering to the MatchDetail schema (with InvestorProfile embedded).
+            Only include investors you can confidently identify and assign values to. Max 3 investors.
+            Example of expected output structure for one investor:
+            {"investor": {"id": "firm_xyz", "name": "Firm XYZ Ventures", "link": "https://firmxyz.com", "risk_tolerance": "high", "preferred_industries": ["AI", "SaaS"], "min_investment_usd": 1000000, "max_investment_usd": 10000000, "feedback_focus": ["Traction", "Team"]},
+             "match_score": 90, "match_reasons": ["Strong focus on AI startups", "Matches funding stage"], "gaps": ["Prefers later stage, need more revenue"]}
+            Do not include any preamble, just the JSON array.
+            """)
+            .build()
+        )
         
         matched_details: List[MatchDetail] = []
         try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            response = await self.gemini_client.generate_content(prompt, stage="investor_matcher.curate")
             gemini_output_text = response.text.strip()
             if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
                 gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
@@ -197,41 +223,28 @@ class InvestorMatcherService:
             return matched_details
 
         except Exception as e:
-            print(f"ERROR(Matching): Gemini failed to curate investors: {e}")
+            logger.error("Gemini failed to curate investors: %s", e)
             return []
 
 
+    @cached_result("investor_matching", InvestorMatchOutput, ttl=3600, coalesce=True)
     async def match_investors(self, input_data: InvestorMatchInput) -> InvestorMatchOutput:
-        input_hash = hashlib.sha256(input_data.json().encode('utf-8')).hexdigest()
-        cache_key_matching = f"investor_matching:{input_hash}"
-
-        cached_matching_json = await self.redis_client.get(cache_key_matching)
-        if cached_matching_json:
-            print(f"DEBUG(Matching): Cache hit for investor matching: {cache_key_matching}")
-            return InvestorMatchOutput.parse_raw(cached_matching_json)
-
         queries = await self._generate_investor_search_queries(input_data)
-        
-        all_raw_investor_results = []
-        for q in queries:
-            raw_results = await self._fetch_investors_from_serpapi(q)
-            all_raw_investor_results.extend(raw_results)
-        
-        deduplicated_results = {}
-        for res in all_raw_investor_results:
-            if res.get("link"):
-                deduplicated_results[res["link"]] = res
-            elif res.get("title"):
-                deduplicated_results[res["title"]] = res
-        
-        final_raw_results = list(deduplicated_results.values())
+        final_raw_results = await self._fetch_all_investor_results(queries)
 
+        # Only the parts of the risk and reputation profiles that bear on investor fit are sent;
+        # mitigation suggestions, recommendations and reputation insights are left out.
         startup_info = {
             "startup_name": input_data.startup_name,
             "industry": input_data.industry,
             "funding_sought_usd": input_data.funding_sought_usd,
-            "risk_profile": input_data.risk_profile.model_dump(),
-            "reputation_profile": input_data.reputation_profile.model_dump()
+            "risk_profile": {
+                "overall_risk_score": input_data.risk_profile.overall_risk_score,
+                "risk_factors": [f"{f.name} ({f.level})" for f in input_data.risk_profile.risk_factors],
+            },
+            "reputation_profile": input_data.reputation_profile.model_dump(include={
+                "overall_sentiment_score", "positive_themes", "negative_themes", "overall_reputation_review"
+            }),
         }
         matched_investors_list = await self._curate_investors_with_gemini(startup_info, final_raw_results)
         
@@ -255,8 +268,4 @@ class InvestorMatcherService:
             ]
 
 
-        result = InvestorMatchOutput(startup_name=input_data.startup_name, matched_investors=matched_investors_list)
-        await self.redis_client.setex(cache_key_matching, 3600, result.json())
-        print(f"DEBUG(Matching): Cached final investor matching result: {cache_key_matching}")
-
-        return result
+        return InvestorMatchOutput(startup_name=input_data.startup_name, matched_investors=matched_investors_list)
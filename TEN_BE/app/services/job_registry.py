@@ -0,0 +1,76 @@
+from app.core.container import ServiceContainer
+from pydantic import BaseModel
+from typing import Awaitable, Callable, Dict, NamedTuple, Type
+
+from app.models.schemas import (
+    RiskInput,
+    ReputationInput,
+    InvestorMatchInput,
+    PitchFeedbackRequest,
+    CompetitorRadarInput,
+    TractionEstimatorInput,
+    BuzzBuilderInput,
+    LegalAssistanceInput,
+    ExitStrategyExplorerInput,
+    TalentNavigatorInput,
+    NavigatorInput,
+)
+from app.services.risk_analyzer import RiskAnalyzerService
+from app.services.reputation_scanner import ReputationScannerService
+from app.services.investor_matcher import InvestorMatcherService
+from app.services.pitch_feedback_generator import PitchFeedbackGeneratorService
+from app.services.competitor_radar import CompetitorRadarService
+from app.services.traction_estimator import TractionEstimatorService
+from app.services.buzz_builder import BuzzBuilderService
+from app.services.legal_advisor import LegalAdvisorService
+from app.services.exit_strategy_explorer import ExitStrategyExplorerService
+from app.services.talent_navigator import TalentNavigatorService
+from app.services.navigator import NavigatorService
+
+
+class JobType(NamedTuple):
+    input_model: Type[BaseModel]
+    service_class: type
+    method_name: str
+
+
+# Job type names mirror the synchronous endpoint paths.
+JOB_TYPES: Dict[str, JobType] = {
+    "analyze-risk": JobType(RiskInput, RiskAnalyzerService, "analyze_risk"),
+    "scan-reputation": JobType(ReputationInput, ReputationScannerService, "scan_reputation"),
+    "match-investors": JobType(InvestorMatchInput, InvestorMatcherService, "match_investors"),
+    "pitch-feedback": JobType(PitchFeedbackRequest, PitchFeedbackGeneratorService, "generate_feedback"),
+    "competitor-radar": JobType(CompetitorRadarInput, CompetitorRadarService, "track_competitors"),
+    "traction-estimator": JobType(TractionEstimatorInput, TractionEstimatorService, "estimate_traction"),
+    "buzz-builder": JobType(BuzzBuilderInput, BuzzBuilderService, "generate_buzz"),
+    "legal-assistance": JobType(LegalAssistanceInput, LegalAdvisorService, "get_legal_assistance"),
+    "exit-strategy-explorer": JobType(ExitStrategyExplorerInput, ExitStrategyExplorerService, "explore_exit_strategies"),
+    "talent-navigator": JobType(TalentNavigatorInput, TalentNavigatorService, "get_talent_guidance"),
+    "navigator": JobType(NavigatorInput, NavigatorService, "run_navigator"),
+}
+
+
+def build_job_handlers(container: ServiceContainer) -> Dict[str, Callable[[str], Awaitable[str]]]:
+    """
+    Returns one handler per job type that takes the serialized input and returns the serialized output.
+    Handlers call the same cached service methods as the synchronous endpoints.
+    """
+    handlers: Dict[str, Callable[[str], Awaitable[str]]] = {}
+    for job_type, definition in JOB_TYPES.items():
+        service = container.get(definition.service_class)
+
+        def make_handler(definition: JobType, service) -> Callable[[str], Awaitable[str]]:
+            method = getattr(service, definition.method_name)
+
+            async def handler(payload: str) -> str:
+                input_data = definition.input_model.parse_raw(payload)
+                result = await method(input_data, raw_response=True)
+                # Cache hits come back pre-serialized; fresh results are models.
+                if isinstance(result, BaseModel):
+                    return result.json()
+                return result.body.decode("utf-8")
+
+            return handler
+
+        handlers[job_type] = make_handler(definition, service)
+    return handlers
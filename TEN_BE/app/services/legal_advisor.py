@@ -1,27 +1,23 @@
-import redis.asyncio as redis
-import google.generativeai as genai
-import asyncio
+from app.core.cache import TwoTierCache
+from app.core.degradation import degradation_tracked
+from app.core.result_cache import cached_result, get_cached_model, store_cached_model
+from app.core.gemini_client import GeminiClient
+from app.core.json_stream import stream_gemini_json
 import json
-import hashlib
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Tuple
 
 from app.models.schemas import LegalAssistanceInput, LegalAssistanceOutput, LegalDocument, LicenseCertification, LegalRisk
+import logging
 
-class LegalAdvisorService:
-    def __init__(self, redis_client: redis.Redis, gemini_model: genai.GenerativeModel):
-        self.redis_client = redis_client
-        self.gemini_model = gemini_model
-
-    async def get_legal_assistance(self, input_data: LegalAssistanceInput) -> LegalAssistanceOutput:
-        input_hash = hashlib.sha256(input_data.json().encode('utf-8')).hexdigest()
-        cache_key = f"legal_assistance:{input_hash}"
+logger = logging.getLogger(__name__)
 
-        cached_result_json = await self.redis_client.get(cache_key)
-        if cached_result_json:
-            print(f"Cache hit for legal assistance: {cache_key}")
-            return LegalAssistanceOutput.parse_raw(cached_result_json)
+class LegalAdvisorService:
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient):
+        self.cache = cache
+        self.gemini_client = gemini_client
 
-        prompt = f"""
+    def _build_prompt(self, input_data: LegalAssistanceInput) -> str:
+        return f"""
         You are an AI legal assistant specializing in startup law. Based on the following startup profile,
         identify essential legal documents, required industry-specific licenses/certifications, and key legal risks with prevention strategies.
         Provide general legal advice relevant to their stage.
@@ -53,25 +49,32 @@ class LegalAdvisorService:
         Do not include any preamble, just the JSON.
         """
 
+    def _parse_output(self, input_data: LegalAssistanceInput, gemini_data: Dict[str, Any]) -> LegalAssistanceOutput:
+        return LegalAssistanceOutput(
+            startup_name=gemini_data.get("startup_name", input_data.startup_name),
+            essential_documents=[LegalDocument(**d) for d in gemini_data.get("essential_documents", [])],
+            industry_licenses_certs=[LicenseCertification(**lc) for lc in gemini_data.get("industry_licenses_certs", [])],
+            key_legal_risks=[LegalRisk(**lr) for lr in gemini_data.get("key_legal_risks", [])],
+            general_legal_advice=gemini_data.get("general_legal_advice", [])
+        )
+
+    @cached_result("legal_assistance", LegalAssistanceOutput, ttl=3600)
+    async def get_legal_assistance(self, input_data: LegalAssistanceInput) -> LegalAssistanceOutput:
+        prompt = self._build_prompt(input_data)
+
         result = None
         try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            response = await self.gemini_client.generate_content(prompt, stage="legal_advisor.advise")
             gemini_output_text = response.text.strip()
             if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
                 gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
             
             gemini_data = json.loads(gemini_output_text)
             
-            result = LegalAssistanceOutput(
-                startup_name=gemini_data.get("startup_name", input_data.startup_name),
-                essential_documents=[LegalDocument(**d) for d in gemini_data.get("essential_documents", [])],
-                industry_licenses_certs=[LicenseCertification(**lc) for lc in gemini_data.get("industry_licenses_certs", [])],
-                key_legal_risks=[LegalRisk(**lr) for lr in gemini_data.get("key_legal_risks", [])],
-                general_legal_advice=gemini_data.get("general_legal_advice", [])
-            )
+            result = self._parse_output(input_data, gemini_data)
             
         except Exception as e:
-            print(f"Gemini API call failed for legal assistance: {e}. Falling back to simplified output.")
+            logger.error("Gemini API call failed for legal assistance: %s. Falling back to simplified output.", e)
             result = LegalAssistanceOutput(
                 startup_name=input_data.startup_name,
                 essential_documents=[],
@@ -80,7 +83,39 @@ class LegalAdvisorService:
                 general_legal_advice=["Could not generate detailed legal assistance due to AI service error."]
             )
 
-        await self.redis_client.setex(cache_key, 3600, result.json())
-        print(f"Cached Gemini-driven legal assistance result for: {cache_key}")
+        return result
+
+    @degradation_tracked
+    async def stream_legal_assistance(self, input_data: LegalAssistanceInput) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of get_legal_assistance. Yields ("legal_document", LegalDocument),
+        ("license_certification", LicenseCertification) and ("legal_risk", LegalRisk) as soon as
+        each entry is complete in the Gemini output, then ("result", LegalAssistanceOutput).
+        Shares the legal_assistance result cache with get_legal_assistance.
+        """
+        cached_output = await get_cached_model(self.cache, "legal_assistance", LegalAssistanceOutput, input_data)
+        if cached_output is not None:
+            for document in cached_output.essential_documents:
+                yield "legal_document", document
+            for license_cert in cached_output.industry_licenses_certs:
+                yield "license_certification", license_cert
+            for legal_risk in cached_output.key_legal_risks:
+                yield "legal_risk", legal_risk
+            yield "result", cached_output
+            return
+
+        item_events = {
+            "essential_documents": ("legal_document", LegalDocument),
+            "industry_licenses_certs": ("license_certification", LicenseCertification),
+            "key_legal_risks": ("legal_risk", LegalRisk),
+        }
+        async with stream_gemini_json(self.gemini_client, self._build_prompt(input_data), item_events, stage="legal_advisor.advise") as events:
+            async for array_key, gemini_data in events:
+                if array_key is not None:
+                    event, item_model = item_events[array_key]
+                    yield event, item_model(**gemini_data)
+                    continue
+                output = self._parse_output(input_data, gemini_data)
 
-        return result
\ No newline at end of file
+        await store_cached_model(self.cache, "legal_assistance", LegalAssistanceOutput, input_data, output)
+        yield "result", output
@@ -0,0 +1,120 @@
+from app.core.cache import TwoTierCache
+from app.core.degradation import degradation_tracked
+from app.core.result_cache import cached_result, get_cached_model, store_cached_model
+from app.core.gemini_client import GeminiClient
+from app.core.search_client import SearchClient
+from app.models.schemas import (
+    NavigatorInput, NavigatorOutput,
+    RiskInput, ReputationInput, InvestorMatchInput, PitchFeedbackRequest,
+)
+from app.services.risk_analyzer import RiskAnalyzerService
+from app.services.reputation_scanner import ReputationScannerService
+from app.services.investor_matcher import InvestorMatcherService
+from app.services.pitch_feedback_generator import PitchFeedbackGeneratorService
+import asyncio
+from typing import Any, AsyncIterator, Optional, Tuple
+
+
+class NavigatorService:
+    """
+    Runs the risk -> reputation -> investor matching -> pitch feedback pipeline in one request.
+    Risk and reputation run concurrently; matching starts once both are done and pitch
+    feedback runs last. Every stage goes through its own service, so stage results are
+    shared with (and served from) the single-endpoint caches.
+    """
+
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient, search_client: Optional[SearchClient] = None):
+        self.cache = cache
+        self.gemini_client = gemini_client
+        self.risk_analyzer = RiskAnalyzerService(cache=cache, gemini_client=gemini_client)
+        self.reputation_scanner = ReputationScannerService(cache=cache, gemini_client=gemini_client, search_client=search_client)
+        self.investor_matcher = InvestorMatcherService(cache=cache, gemini_client=gemini_client, search_client=search_client)
+        self.pitch_feedback_generator = PitchFeedbackGeneratorService(cache=cache, gemini_client=gemini_client)
+
+    async def _run_stages(self, input_data: NavigatorInput) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Yields (stage name, stage output) as each stage finishes, then ("result", NavigatorOutput).
+        """
+        risk_input: RiskInput = input_data.risk
+        reputation_input = ReputationInput(
+            startup_name=risk_input.startup_name,
+            founder_twitter_handle=input_data.founder_twitter_handle,
+            initial_pitch_text=input_data.pitch_text,
+        )
+
+        async def run_stage(stage: str, stage_call) -> Tuple[str, Any]:
+            return stage, await stage_call
+
+        tasks = [
+            asyncio.ensure_future(run_stage("risk", self.risk_analyzer.analyze_risk(risk_input))),
+            asyncio.ensure_future(run_stage("reputation", self.reputation_scanner.scan_reputation(reputation_input))),
+        ]
+        results = {}
+        try:
+            for completed in asyncio.as_completed(tasks):
+                stage, result = await completed
+                results[stage] = result
+                yield stage, result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        investor_matches = await self.investor_matcher.match_investors(InvestorMatchInput(
+            startup_name=risk_input.startup_name,
+            industry=risk_input.industry,
+            funding_sought_usd=input_data.funding_sought_usd or risk_input.initial_funding_needed_usd,
+            risk_profile=results["risk"],
+            reputation_profile=results["reputation"],
+        ))
+        yield "investor_matches", investor_matches
+
+        pitch_feedback = await self.pitch_feedback_generator.generate_feedback(PitchFeedbackRequest(
+            startup_name=risk_input.startup_name,
+            pitch_text=input_data.pitch_text,
+            risk_profile=results["risk"],
+            reputation_profile=results["reputation"],
+            investor_match_results=investor_matches,
+        ))
+        yield "pitch_feedback", pitch_feedback
+
+        yield "result", NavigatorOutput(
+            startup_name=risk_input.startup_name,
+            risk=results["risk"],
+            reputation=results["reputation"],
+            investor_matches=investor_matches,
+            pitch_feedback=pitch_feedback,
+        )
+
+    @cached_result("navigator", NavigatorOutput, ttl=3600)
+    async def run_navigator(self, input_data: NavigatorInput) -> NavigatorOutput:
+        stages = self._run_stages(input_data)
+        try:
+            async for stage, result in stages:
+                if stage == "result":
+                    return result
+        finally:
+            await stages.aclose()
+        raise RuntimeError("Navigator workflow finished without a result.")
+
+    @degradation_tracked
+    async def stream_navigator(self, input_data: NavigatorInput) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of run_navigator. Yields ("risk" | "reputation" | "investor_matches" |
+        "pitch_feedback", stage output) as each stage finishes, then ("result", NavigatorOutput).
+        Shares the navigator result cache with run_navigator.
+        """
+        cached_output = await get_cached_model(self.cache, "navigator", NavigatorOutput, input_data)
+        if cached_output is not None:
+            for stage in ("risk", "reputation", "investor_matches", "pitch_feedback"):
+                yield stage, getattr(cached_output, stage)
+            yield "result", cached_output
+            return
+
+        stages = self._run_stages(input_data)
+        try:
+            async for stage, result in stages:
+                if stage == "result":
+                    await store_cached_model(self.cache, "navigator", NavigatorOutput, input_data, result)
+                yield stage, result
+        finally:
+            await stages.aclose()
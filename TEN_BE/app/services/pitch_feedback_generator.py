@@ -1,60 +1,52 @@
 import json
 from typing import List, Optional
-import redis.asyncio as redis
+from app.core.cache import TwoTierCache
+from app.core.result_cache import cached_result
 from app.models.schemas import PitchFeedbackRequest, PitchFeedbackResponse, RiskOutput, ReputationOutput, InvestorMatchOutput
-import google.generativeai as genai
-import asyncio
-import hashlib
+from app.core.gemini_client import GeminiClient
+from app.core.prompt_builder import PromptBuilder
+import logging
+
+logger = logging.getLogger(__name__)
 
 class PitchFeedbackGeneratorService:
-    def __init__(self, redis_client: redis.Redis, gemini_model: genai.GenerativeModel):
-        self.redis_client = redis_client
-        self.gemini_model = gemini_model
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient):
+        self.cache = cache
+        self.gemini_client = gemini_client
 
+    @cached_result("pitch_feedback", PitchFeedbackResponse, ttl=3600)
     async def generate_feedback(self, request: PitchFeedbackRequest) -> PitchFeedbackResponse:
-        input_hash = hashlib.sha256(request.json().encode('utf-8')).hexdigest()
-        cache_key_feedback = f"pitch_feedback:{input_hash}"
-
-        cached_feedback_json = await self.redis_client.get(cache_key_feedback)
-        if cached_feedback_json:
-            print(f"DEBUG(Feedback): Cache hit for pitch feedback: {cache_key_feedback}")
-            return PitchFeedbackResponse.parse_raw(cached_feedback_json)
-
         risk_info = request.risk_profile.model_dump_json() if request.risk_profile else "Not provided."
         reputation_info = request.reputation_profile.model_dump_json() if request.reputation_profile else "Not provided."
         investor_match_info = request.investor_match_results.model_dump_json() if request.investor_match_results else "Not provided."
 
-        prompt = f"""
-        You are an AI startup advisor. Analyze the following pitch for "{request.startup_name}" and provide constructive feedback and actionable suggestions for improvement.
-        Focus on clarity, completeness, investor appeal, and addressing potential concerns.
-        Consider the following additional context if provided:
-
-        --- Pitch Text ---
-        {request.pitch_text}
-        --- End Pitch Text ---
-
-        --- Risk Profile (Optional Context) ---
-        {risk_info}
-        --- End Risk Profile ---
-
-        --- Reputation Profile (Optional Context) ---
-        {reputation_info}
-        --- End Reputation Profile ---
-
-        --- Investor Match Results (Optional Context) ---
-        {investor_match_info}
-        --- End Investor Match Results ---
-
-        Provide the output in a JSON format with two keys: "feedback" (list of general observations/strengths) and "suggestions_for_improvement" (list of actionable steps).
-        Ensure the suggestions are specific and directly related to the pitch and provided contexts.
-        Do not include any preamble, just the JSON.
-        """
+        prompt = (
+            PromptBuilder("pitch_feedback")
+            .add_text(f"""
+            You are an AI startup advisor. Analyze the following pitch for "{request.startup_name}" and provide constructive feedback and actionable suggestions for improvement.
+            Focus on clarity, completeness, investor appeal, and addressing potential concerns.
+            Consider the following additional context if provided:
+
+            --- Pitch Text ---
+            {request.pitch_text}
+            --- End Pitch Text ---
+            """)
+            .add_items([risk_info], prefix="--- Risk Profile (Optional Context) ---\n", suffix="\n--- End Risk Profile ---", min_items=1)
+            .add_items([reputation_info], prefix="--- Reputation Profile (Optional Context) ---\n", suffix="\n--- End Reputation Profile ---", min_items=1)
+            .add_items([investor_match_info], prefix="--- Investor Match Results (Optional Context) ---\n", suffix="\n--- End Investor Match Results ---", min_items=1)
+            .add_text("""
+            Provide the output in a JSON format with two keys: "feedback" (list of general observations/strengths) and "suggestions_for_improvement" (list of actionable steps).
+            Ensure the suggestions are specific and directly related to the pitch and provided contexts.
+            Do not include any preamble, just the JSON.
+            """)
+            .build()
+        )
 
         feedback_list: List[str] = []
         suggestions: List[str] = []
 
         try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            response = await self.gemini_client.generate_content(prompt, stage="pitch_feedback.generate")
             gemini_output_text = response.text.strip()
 
             if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
@@ -66,17 +58,12 @@ class PitchFeedbackGeneratorService:
             suggestions = gemini_data.get("suggestions_for_improvement", ["Gemini did not provide specific suggestions. Check prompt or response."])
 
         except Exception as e:
-            print(f"Gemini API call failed for pitch feedback: {e}")
+            logger.error("Gemini API call failed for pitch feedback: %s", e)
             feedback_list = ["Could not generate detailed pitch feedback due to AI service error."]
             suggestions = [f"Please check your Google API key or the Gemini service status. Error: {e}"]
 
-        result = PitchFeedbackResponse(
+        return PitchFeedbackResponse(
             startup_name=request.startup_name,
             feedback=feedback_list,
             suggestions_for_improvement=suggestions
         )
-
-        await self.redis_client.setex(cache_key_feedback, 3600, result.json())
-        print(f"DEBUG(Feedback): Cached final pitch feedback result: {cache_key_feedback}")
-
-        return result
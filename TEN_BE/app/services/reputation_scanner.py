@@ -1,65 +1,71 @@
-import redis.asyncio as redis
+from app.core.cache import TwoTierCache
+from app.core.result_cache import cached_result, build_query_cache_key
+from app.core.cache_codec import dumps_compact
+from app.core.prompt_builder import PromptBuilder, clean_snippets
 from app.models.schemas import ReputationInput, ReputationOutput
 import re
 from typing import List, Dict, Any, Optional
-from serpapi import GoogleSearch
 from app.core.config import settings
-import asyncio
 import json
-import hashlib
-import google.generativeai as genai
+from app.core.gemini_client import GeminiClient
+from app.core.search_client import SearchClient, get_search_client
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ReputationScannerService:
-    def __init__(self, redis_client: redis.Redis, gemini_model: genai.GenerativeModel):
-        self.redis_client = redis_client
-        self.gemini_model = gemini_model
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient, search_client: Optional[SearchClient] = None):
+        self.cache = cache
+        self.gemini_client = gemini_client
+        self.search_client = search_client or get_search_client()
         self.serpapi_key = settings.SERPAPI_API_KEY
-        print(f"DEBUG(SerpAPI): Key loaded status: {bool(self.serpapi_key)}")
-        if self.serpapi_key:
-            print(f"DEBUG(SerpAPI): Key prefix: {self.serpapi_key[:5]}...")
+        if not self.serpapi_key:
+            logger.warning("SerpAPI key not configured for ReputationScanner. Twitter data will be skipped.")
 
 
     async def _fetch_twitter_data(self, query: str) -> List[str]:
         if not self.serpapi_key:
-            print("SerpAPI key not configured. Skipping Twitter data fetch.")
+            logger.debug("SerpAPI key not configured. Skipping Twitter data fetch.")
             return []
 
-        print(f"DEBUG(SerpAPI): Attempting to fetch Twitter data for query: '{query}'")
+        logger.debug("Attempting to fetch Twitter data for query: '%s'", query)
 
-        cache_key_serp = f"twitter_search:{hashlib.sha256(query.encode('utf-8')).hexdigest()}"
-        cached_tweets_json = await self.redis_client.get(cache_key_serp)
-        if cached_tweets_json:
-            print(f"DEBUG(SerpAPI): Cache hit for Twitter search: '{query}'")
-            return json.loads(cached_tweets_json)
+        cached_tweets_json = await self.cache.get_or_revalidate(
+            build_query_cache_key("twitter_search", query),
+            loader=lambda: self._load_twitter_data(query),
+            soft_ttl=3600,
+            hard_ttl=settings.SEARCH_CACHE_HARD_TTL_SECONDS,
+        )
+        return json.loads(cached_tweets_json) if cached_tweets_json else []
 
+    async def _load_twitter_data(self, query: str) -> Optional[str]:
+        """
+        Runs the SerpAPI Twitter/X search, serialized for caching.
+        Returns None when no relevant tweets were found or the call failed.
+        """
         params = {
-            "api_key": self.serpapi_key,
             "engine": "google",
             "q": f"{query} site:twitter.com OR site:x.com",
             "num": 20
         }
         tweets = []
         try:
-            print(f"DEBUG(SerpAPI): Calling SerpAPI for query '{query}' with params: {params}")
-            search = GoogleSearch(params)
-            
-            results = await asyncio.to_thread(search.get_dict)
-            
-            print(f"DEBUG(SerpAPI): Raw SerpAPI response for '{query}': {json.dumps(results, indent=2)[:1000]}{'...' if len(json.dumps(results)) > 1000 else ''}")
+            logger.debug("Calling SerpAPI for query '%s'.", query)
+            results = await self.search_client.search(params, stage="reputation_scanner.twitter_search")
 
             if "error" in results:
-                print(f"ERROR(SerpAPI): API returned an error for query '{query}': {results['error']}")
-                return []
+                logger.error("API returned an error for query '%s': %s", query, results['error'])
+                return None
 
             if "latest_posts" in results:
-                print(f"DEBUG(SerpAPI): Found 'latest_posts' key in response for '{query}'.")
+                logger.debug("Found 'latest_posts' key in response for '%s'.", query)
                 for post in results["latest_posts"]:
                     tweet_text = post.get("title", "").strip()
                     if tweet_text:
                         tweets.append(tweet_text)
             
             if "organic_results" in results:
-                print(f"DEBUG(SerpAPI): Found 'organic_results' key in response for '{query}'.")
+                logger.debug("Found 'organic_results' key in response for '%s'.", query)
                 for result_data in results["organic_results"]:
                     link = result_data.get("link", "")
                     snippet = result_data.get("snippet", "").strip()
@@ -70,25 +76,17 @@ class ReputationScannerService:
             tweets = [t for t in tweets if t and t.lower() != "no information is available for this page."]
 
             if tweets:
-                await self.redis_client.setex(cache_key_serp, 3600, json.dumps(tweets))
-                print(f"DEBUG(SerpAPI): Cached {len(tweets)} tweets for '{query}'.")
-            else:
-                print(f"DEBUG(SerpAPI): No relevant tweets extracted for '{query}'. Not caching.")
+                logger.debug("Fetched %s tweets for '%s'.", len(tweets), query)
+                return dumps_compact(tweets)
+            logger.debug("No relevant tweets extracted for '%s'. Not caching.", query)
 
         except Exception as e:
-            print(f"ERROR(SerpAPI): Exception during SerpAPI call for query '{query}': {type(e).__name__}: {e}")
-        return tweets
+            logger.error("Exception during SerpAPI call for query '%s': %s: %s", query, type(e).__name__, e)
+        return None
 
 
+    @cached_result("reputation_analysis", ReputationOutput, ttl=3600)
     async def scan_reputation(self, input_data: ReputationInput) -> ReputationOutput:
-        input_hash = hashlib.sha256(input_data.json().encode('utf-8')).hexdigest()
-        cache_key_reputation = f"reputation_analysis:{input_hash}"
-
-        cached_reputation_json = await self.redis_client.get(cache_key_reputation)
-        if cached_reputation_json:
-            print(f"DEBUG(Reputation): Cache hit for reputation analysis: {cache_key_reputation}")
-            return ReputationOutput.parse_raw(cached_reputation_json)
-
         all_text_sources: List[str] = [input_data.initial_pitch_text]
 
         if input_data.founder_twitter_handle:
@@ -101,50 +99,48 @@ class ReputationScannerService:
         
         twitter_queries_to_fetch.append(f"{input_data.startup_name}")
 
+        fetched_tweets: List[str] = []
         for query in twitter_queries_to_fetch:
-            fetched_tweets = await self._fetch_twitter_data(query)
-            all_text_sources.extend(fetched_tweets)
+            fetched_tweets.extend(await self._fetch_twitter_data(query))
+        # The handle and name queries often return the same posts.
+        all_text_sources.extend(clean_snippets(fetched_tweets))
         
-        combined_text = " ".join(all_text_sources).strip()
-
-        if not combined_text:
-            combined_text = "No substantial public data found for analysis. Analyzing only provided pitch text."
-
-        prompt = f"""
-        Analyze the overall sentiment and public reputation of the following text related to a startup and its public perception.
-        Provide an overall sentiment score (from -1.0 for extremely negative to +1.0 for extremely positive, 0.0 for neutral).
-        Identify key positive, negative, and neutral themes discussed.
-        Suggest actionable insights for reputation management based on the sentiment.
-        Finally, provide a concise (1-2 sentences) overall qualitative review of the startup's/person's reputation.
-
-        Text to Analyze:
-        ---
-        {combined_text}
-        ---
-
-        Output in JSON format with the following structure:
-        {{
-            "overall_sentiment_score": <float -1.0 to 1.0>,
-            "positive_themes": ["theme1", "theme2"],
-            "negative_themes": ["theme1", "theme2"],
-            "neutral_themes": ["theme1", "theme2"],
-            "actionable_insights": ["insight1", "insight2"],
-            "overall_reputation_review": "Concise review here."
-        }}
-        """
+        all_text_sources = [text.strip() for text in all_text_sources if text and text.strip()]
+
+        if not all_text_sources:
+            all_text_sources = ["No substantial public data found for analysis. Analyzing only provided pitch text."]
+
+        prompt = (
+            PromptBuilder("reputation_analysis")
+            .add_text("""
+            Analyze the overall sentiment and public reputation of the following text related to a startup and its public perception.
+            Provide an overall sentiment score (from -1.0 for extremely negative to +1.0 for extremely positive, 0.0 for neutral).
+            Identify key positive, negative, and neutral themes discussed.
+            Suggest actionable insights for reputation management based on the sentiment.
+            Finally, provide a concise (1-2 sentences) overall qualitative review of the startup's/person's reputation.
+
+            Text to Analyze:
+            """)
+            .add_items(all_text_sources, separator=" ", prefix="---\n", suffix="\n---", min_items=1)
+            .add_text("""
+            Output in JSON format with the following structure:
+            {"overall_sentiment_score": <float -1.0 to 1.0>, "positive_themes": ["theme1", "theme2"], "negative_themes": ["theme1", "theme2"], "neutral_themes": ["theme1", "theme2"], "actionable_insights": ["insight1", "insight2"], "overall_reputation_review": "Concise review here."}
+            """)
+            .build()
+        )
         
         sentiment_data = {}
         try:
-            gemini_response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            gemini_response = await self.gemini_client.generate_content(prompt, stage="reputation_scanner.sentiment")
             gemini_output_text = gemini_response.text.strip()
             if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
                 gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
             
             sentiment_data = json.loads(gemini_output_text)
-            print(f"DEBUG(Gemini Sentiment): Raw Gemini Response: {sentiment_data}")
+            logger.debug("Raw Gemini Response: %s", sentiment_data)
 
         except Exception as e:
-            print(f"ERROR(Gemini Sentiment): Gemini sentiment analysis failed: {e}. Falling back to default/simplified output.")
+            logger.error("Gemini sentiment analysis failed: %s. Falling back to default/simplified output.", e)
             sentiment_data = {
                 "overall_sentiment_score": 0.0,
                 "positive_themes": ["AI service unavailable"],
@@ -154,7 +150,7 @@ class ReputationScannerService:
                 "overall_reputation_review": "Reputation review unavailable due to AI service error."
             }
 
-        result = ReputationOutput(
+        return ReputationOutput(
             startup_name=input_data.startup_name,
             overall_sentiment_score=float(sentiment_data.get("overall_sentiment_score", 0.0)),
             positive_themes=sentiment_data.get("positive_themes", []),
@@ -163,7 +159,3 @@ class ReputationScannerService:
             actionable_insights=sentiment_data.get("actionable_insights", []),
             overall_reputation_review=sentiment_data.get("overall_reputation_review", "Review not generated.")
         )
-        await self.redis_client.setex(cache_key_reputation, 3600, result.json())
-        print(f"DEBUG(Reputation): Cached final reputation analysis result: {cache_key_reputation}")
-
-        return result
@@ -1,30 +1,27 @@
 import json
-from typing import List, Dict, Any
-import redis.asyncio as redis
+from typing import List, Dict, Any, Optional
+from app.core.cache import TwoTierCache
+from app.core.config import settings
+from app.core.result_cache import cached_result
+from app.core.batch import cached_batch, parse_indexed_results
+from app.core.prompt_builder import PromptBuilder, truncate_text
 from app.models.schemas import RiskInput, RiskOutput, RiskFactor
-import hashlib
-import google.generativeai as genai
-import asyncio
+from app.core.gemini_client import GeminiClient
+import logging
 
-class RiskAnalyzerService:
-    def __init__(self, redis_client: redis.Redis, gemini_model: genai.GenerativeModel):
-        self.redis_client = redis_client
-        self.gemini_model = gemini_model
-
-    async def analyze_risk(self, input_data: RiskInput) -> RiskOutput:
-        input_hash = hashlib.sha256(input_data.json(exclude_none=True).encode('utf-8')).hexdigest()
-        cache_key = f"risk_analysis:{input_hash}"
+logger = logging.getLogger(__name__)
 
-        cached_result_json = await self.redis_client.get(cache_key)
-        if cached_result_json:
-            print(f"Cache hit for risk analysis: {cache_key}")
-            return RiskOutput.parse_raw(cached_result_json)
+class RiskAnalyzerService:
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient):
+        self.cache = cache
+        self.gemini_client = gemini_client
 
+    def _build_profile(self, input_data: RiskInput) -> str:
+        max_chars = settings.PROMPT_FIELD_MAX_CHARS
         prompt_parts = [
-            f"Analyze the following startup's profile and identify its key risk factors, assign a severity level (low, medium, high) to each, and provide actionable mitigation suggestions. Finally, give an overall risk score (0-100, where 100 is extremely high risk) and general recommendations. Be very critical and realistic.\n",
             f"Startup Name: {input_data.startup_name}",
             f"Industry: {input_data.industry}",
-            f"Specific Product/Service: {input_data.specific_product_service}",
+            f"Specific Product/Service: {truncate_text(input_data.specific_product_service, max_chars)}",
             f"Estimated Market Size (USD): {input_data.market_size_usd:,}",
             f"Founder Experience (Years): {input_data.founder_experience_years}",
             f"Initial Funding Needed (USD): {input_data.initial_funding_needed_usd:,}"
@@ -33,13 +30,13 @@ class RiskAnalyzerService:
         if input_data.has_mvp is not None:
             prompt_parts.append(f"Has MVP: {'Yes' if input_data.has_mvp else 'No'}")
             if input_data.has_mvp and input_data.mvp_stage_description:
-                prompt_parts.append(f"MVP Stage Description: {input_data.mvp_stage_description}")
+                prompt_parts.append(f"MVP Stage Description: {truncate_text(input_data.mvp_stage_description, max_chars)}")
         
         if input_data.intellectual_property_status:
-            prompt_parts.append(f"Intellectual Property Status: {input_data.intellectual_property_status}")
+            prompt_parts.append(f"Intellectual Property Status: {truncate_text(input_data.intellectual_property_status, max_chars)}")
             
         if input_data.regulatory_environment:
-            prompt_parts.append(f"Regulatory Environment: {input_data.regulatory_environment}")
+            prompt_parts.append(f"Regulatory Environment: {truncate_text(input_data.regulatory_environment, max_chars)}")
 
         if input_data.burn_rate_usd_per_month is not None:
             prompt_parts.append(f"Estimated Monthly Burn Rate (USD): {input_data.burn_rate_usd_per_month:,}")
@@ -51,27 +48,42 @@ class RiskAnalyzerService:
             prompt_parts.append(f"Number of Direct Competitors: {input_data.num_direct_competitors}")
         
         if input_data.competitive_advantage:
-            prompt_parts.append(f"Competitive Advantage: {input_data.competitive_advantage}")
+            prompt_parts.append(f"Competitive Advantage: {truncate_text(input_data.competitive_advantage, max_chars)}")
 
-        prompt_parts.append("\nConsider how these additional details influence the risk profile, particularly the MVP status (market validation), IP (defensibility), regulatory environment (operational hurdles), financials (sustainability), and competitive landscape (market viability).")
+        return "\n".join(prompt_parts)
 
-        prompt_parts.append(f"""
-        Provide the output in a JSON format with the following structure:
-        {{
-            "startup_name": "...",
-            "overall_risk_score": <float, 0-100>,
-            "risk_factors": [
-                {{"name": "...", "level": "low|medium|high", "mitigation_suggestion": "..."}}
-            ],
-            "recommendations": ["...", "..."]
-        }}
-        """)
-        
-        prompt = "\n".join(prompt_parts)
+    def _parse_risk_output(self, input_data: RiskInput, gemini_data: Dict[str, Any]) -> RiskOutput:
+        return RiskOutput(
+            startup_name=gemini_data.get("startup_name", input_data.startup_name),
+            overall_risk_score=float(gemini_data.get("overall_risk_score", 50.0)),
+            risk_factors=[RiskFactor(**f) for f in gemini_data.get("risk_factors", [])],
+            recommendations=gemini_data.get("recommendations", [])
+        )
+
+    @cached_result("risk_analysis", RiskOutput, ttl=3600, coalesce=True)
+    async def analyze_risk(self, input_data: RiskInput) -> RiskOutput:
+        prompt = (
+            PromptBuilder("risk_analysis")
+            .add_text("Analyze the following startup's profile and identify its key risk factors, assign a severity level (low, medium, high) to each, and provide actionable mitigation suggestions. Finally, give an overall risk score (0-100, where 100 is extremely high risk) and general recommendations. Be very critical and realistic.")
+            .add_items([self._build_profile(input_data)], min_items=1)
+            .add_text("Consider how these additional details influence the risk profile, particularly the MVP status (market validation), IP (defensibility), regulatory environment (operational hurdles), financials (sustainability), and competitive landscape (market viability).")
+            .add_text("""
+            Provide the output in a JSON format with the following structure:
+            {
+                "startup_name": "...",
+                "overall_risk_score": <float, 0-100>,
+                "risk_factors": [
+                    {"name": "...", "level": "low|medium|high", "mitigation_suggestion": "..."}
+                ],
+                "recommendations": ["...", "..."]
+            }
+            """)
+            .build()
+        )
 
         result = None
         try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            response = await self.gemini_client.generate_content(prompt, stage="risk_analyzer.analyze")
             
             gemini_output_text = response.text.strip()
             if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
@@ -79,15 +91,10 @@ class RiskAnalyzerService:
             
             gemini_data = json.loads(gemini_output_text)
             
-            result = RiskOutput(
-                startup_name=gemini_data.get("startup_name", input_data.startup_name),
-                overall_risk_score=float(gemini_data.get("overall_risk_score", 50.0)),
-                risk_factors=[RiskFactor(**f) for f in gemini_data.get("risk_factors", [])],
-                recommendations=gemini_data.get("recommendations", [])
-            )
+            result = self._parse_risk_output(input_data, gemini_data)
             
         except Exception as e:
-            print(f"Gemini API call failed for risk analysis: {e}. Falling back to simplified output.")
+            logger.error("Gemini API call failed for risk analysis: %s. Falling back to simplified output.", e)
             result = RiskOutput(
                 startup_name=input_data.startup_name,
                 overall_risk_score=50.0,
@@ -95,7 +102,66 @@ class RiskAnalyzerService:
                 recommendations=["Could not generate detailed risk analysis due to AI service error."]
             )
 
-        await self.redis_client.setex(cache_key, 3600, result.json())
-        print(f"Cached Gemini-driven risk analysis result for: {cache_key}")
-
         return result
+
+    async def _analyze_risk_chunk(self, chunk: List[RiskInput]) -> List[Optional[RiskOutput]]:
+        """
+        Analyzes several startups with a single Gemini call. Items missing from or
+        malformed in the response come back as None.
+        """
+        # Every profile is kept (truncated if needed): a dropped one would only fall back to a single call.
+        prompt = (
+            PromptBuilder("risk_analysis_batch")
+            .add_text(f"Analyze each of the following {len(chunk)} startup profiles independently. For each one, identify its key risk factors, assign a severity level (low, medium, high) to each, and provide actionable mitigation suggestions. Finally, give an overall risk score (0-100, where 100 is extremely high risk) and general recommendations. Be very critical and realistic.")
+            .add_text("Consider the MVP status (market validation), IP (defensibility), regulatory environment (operational hurdles), financials (sustainability), and competitive landscape (market viability) where provided.")
+            .add_items(
+                (f"--- Startup {index} ---\n{self._build_profile(input_data)}" for index, input_data in enumerate(chunk)),
+                min_items=len(chunk),
+            )
+            .add_text("""
+            Provide the output as a JSON array with exactly one object per startup, in the following structure:
+            [
+                {
+                    "index": <startup number>,
+                    "startup_name": "...",
+                    "overall_risk_score": <float, 0-100>,
+                    "risk_factors": [
+                        {"name": "...", "level": "low|medium|high", "mitigation_suggestion": "..."}
+                    ],
+                    "recommendations": ["...", "..."]
+                }
+            ]
+            """)
+            .build()
+        )
+
+        response = await self.gemini_client.generate_content(prompt, stage="risk_analyzer.analyze_batch")
+        gemini_output_text = response.text.strip()
+        if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
+            gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
+
+        gemini_results = parse_indexed_results(json.loads(gemini_output_text), len(chunk))
+        outputs: List[Optional[RiskOutput]] = []
+        for index, input_data in enumerate(chunk):
+            if index not in gemini_results:
+                logger.warning("Packed risk analysis response is missing item %s (%s).", index, input_data.startup_name)
+                outputs.append(None)
+                continue
+            try:
+                outputs.append(self._parse_risk_output(input_data, gemini_results[index]))
+            except Exception as e:
+                logger.warning("Packed risk analysis returned no usable result for item %s (%s): %s", index, input_data.startup_name, e)
+                outputs.append(None)
+        return outputs
+
+    async def analyze_risk_batch(self, items: List[RiskInput]) -> List[RiskOutput]:
+        return await cached_batch(
+            self.cache,
+            "risk_analysis",
+            RiskOutput,
+            items,
+            compute_chunk=self._analyze_risk_chunk,
+            compute_single=self.analyze_risk,
+            chunk_size=settings.BATCH_ITEMS_PER_PROMPT,
+            max_parallel=settings.BATCH_MAX_PARALLEL_PROMPTS,
+        )
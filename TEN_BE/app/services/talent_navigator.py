@@ -1,19 +1,23 @@
 import json
-import redis.asyncio as redis
-import google.generativeai as genai
-import asyncio
-import hashlib
-from typing import List, Dict, Any, Optional
+from app.core.cache import TwoTierCache
+from app.core.degradation import degradation_tracked
+from app.core.result_cache import cached_result, get_cached_model, store_cached_model
+from app.core.gemini_client import GeminiClient
+from app.core.json_stream import stream_gemini_json
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 
 from app.models.schemas import TalentNavigatorInput, TalentNavigatorOutput, RecommendedRole, InterviewQuestion, TalentTip
+import logging
+
+logger = logging.getLogger(__name__)
 
 class TalentNavigatorService:
-    def __init__(self, redis_client: redis.Redis, gemini_model: genai.GenerativeModel):
-        self.redis_client = redis_client
-        self.gemini_model = gemini_model
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient):
+        self.cache = cache
+        self.gemini_client = gemini_client
 
-    async def get_talent_guidance(self, input_data: TalentNavigatorInput) -> TalentNavigatorOutput:
-        prompt = f"""
+    def _build_prompt(self, input_data: TalentNavigatorInput) -> str:
+        return f"""
         You are an AI talent advisor specializing in startup team building.
         Analyze the startup '{input_data.startup_name}' in the '{input_data.your_industry}' industry, currently at the '{input_data.funding_stage}' funding stage with {input_data.current_team_size} team members.
         Their key challenge is: '{input_data.key_challenge}'.
@@ -37,11 +41,26 @@ class TalentNavigatorService:
         }}
         """
 
+    def _parse_role(self, r: Dict[str, Any]) -> RecommendedRole:
+        interview_q_list = r.get("interview_questions", [])
+        if not isinstance(interview_q_list, list):
+            interview_q_list = [str(interview_q_list)]
+
+        return RecommendedRole(
+            role_name=r.get("role_name", "Unknown Role"),
+            ideal_candidate_profile=r.get("ideal_candidate_profile", "N/A"),
+            interview_questions=[InterviewQuestion(question=q) for q in interview_q_list]
+        )
+
+    @cached_result("talent_navigator", TalentNavigatorOutput, ttl=3600)
+    async def get_talent_guidance(self, input_data: TalentNavigatorInput) -> TalentNavigatorOutput:
+        prompt = self._build_prompt(input_data)
+
         recommended_roles: List[RecommendedRole] = []
         team_building_tips: List[TalentTip] = []
 
         try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            response = await self.gemini_client.generate_content(prompt, stage="talent_navigator.guide")
             gemini_output_text = response.text.strip()
             if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
                 gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
@@ -50,20 +69,12 @@ class TalentNavigatorService:
             
             roles_raw = gemini_data.get("recommended_roles", [])
             for r in roles_raw:
-                interview_q_list = r.get("interview_questions", [])
-                if not isinstance(interview_q_list, list):
-                    interview_q_list = [str(interview_q_list)]
-
-                recommended_roles.append(RecommendedRole(
-                    role_name=r.get("role_name", "Unknown Role"),
-                    ideal_candidate_profile=r.get("ideal_candidate_profile", "N/A"),
-                    interview_questions=[InterviewQuestion(question=q) for q in interview_q_list]
-                ))
+                recommended_roles.append(self._parse_role(r))
             
             team_building_tips = [TalentTip(tip=t) for t in gemini_data.get("team_building_tips", [])]
 
         except Exception as e:
-            print(f"ERROR(Gemini): Talent Navigator failed: {e}")
+            logger.error("Talent Navigator failed: %s", e)
             recommended_roles = [
                 RecommendedRole(
                     role_name="AI Error",
@@ -78,3 +89,31 @@ class TalentNavigatorService:
             recommended_roles=recommended_roles,
             team_building_tips=team_building_tips
         )
+
+    @degradation_tracked
+    async def stream_talent_guidance(self, input_data: TalentNavigatorInput) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of get_talent_guidance. Yields ("role", RecommendedRole) as soon as
+        each role is complete in the Gemini output, then ("result", TalentNavigatorOutput).
+        Shares the talent_navigator result cache with get_talent_guidance.
+        """
+        cached_output = await get_cached_model(self.cache, "talent_navigator", TalentNavigatorOutput, input_data)
+        if cached_output is not None:
+            for role in cached_output.recommended_roles:
+                yield "role", role
+            yield "result", cached_output
+            return
+
+        async with stream_gemini_json(self.gemini_client, self._build_prompt(input_data), ["recommended_roles"], stage="talent_navigator.guide") as events:
+            async for array_key, gemini_data in events:
+                if array_key is not None:
+                    yield "role", self._parse_role(gemini_data)
+                    continue
+                output = TalentNavigatorOutput(
+                    startup_name=input_data.startup_name,
+                    recommended_roles=[self._parse_role(r) for r in gemini_data.get("recommended_roles", [])],
+                    team_building_tips=[TalentTip(tip=t) for t in gemini_data.get("team_building_tips", [])]
+                )
+
+        await store_cached_model(self.cache, "talent_navigator", TalentNavigatorOutput, input_data, output)
+        yield "result", output
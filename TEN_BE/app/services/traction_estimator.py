@@ -1,18 +1,27 @@
 import json
-import redis.asyncio as redis
-import google.generativeai as genai
-import asyncio
-import hashlib
-from typing import List, Dict, Any, Optional
+from app.core.cache import TwoTierCache
+from app.core.config import settings
+from app.core.result_cache import cached_result
+from app.core.batch import cached_batch, parse_indexed_results
+from app.core.gemini_client import GeminiClient
+from app.core.cache_codec import dumps_compact
+from app.core.prompt_builder import PromptBuilder
+from typing import List, Dict, Any, Optional, Tuple
 
 from app.models.schemas import TractionEstimatorInput, TractionEstimatorOutput, TractionBenchmark
+import logging
+
+logger = logging.getLogger(__name__)
 
 class TractionEstimatorService:
-    def __init__(self, redis_client: redis.Redis, gemini_model: genai.GenerativeModel):
-        self.redis_client = redis_client
-        self.gemini_model = gemini_model
+    def __init__(self, cache: TwoTierCache, gemini_client: GeminiClient):
+        self.cache = cache
+        self.gemini_client = gemini_client
 
-    async def estimate_traction(self, input_data: TractionEstimatorInput) -> TractionEstimatorOutput:
+    def _compute_benchmarks(self, input_data: TractionEstimatorInput) -> Tuple[List[TractionBenchmark], float]:
+        """
+        Compares the startup's metrics with industry averages. Returns the benchmarks and the growth health score.
+        """
         industry_benchmarks = {
             "SaaS": {
                 "monthly_active_users": 10000, "monthly_recurring_revenue_usd": 50000,
@@ -89,21 +98,27 @@ class TractionEstimatorService:
         else:
             growth_health_score = 50.0
 
-        prompt = f"""
+        return benchmarks, round(growth_health_score, 2)
+
+    @cached_result("traction_estimation", TractionEstimatorOutput, ttl=3600)
+    async def estimate_traction(self, input_data: TractionEstimatorInput) -> TractionEstimatorOutput:
+        benchmarks, growth_health_score = self._compute_benchmarks(input_data)
+
+        prompt = PromptBuilder("traction_insights").add_text(f"""
         Analyze the following growth metrics and benchmarks for the startup '{input_data.startup_name}' in the '{input_data.your_industry}' industry.
         Provide 3-5 actionable insights and tips for improving their traction based on these numbers.
         If a metric is missing, suggest what insight it could provide.
 
         --- Metrics & Benchmarks ---
-        {json.dumps([b.model_dump() for b in benchmarks], indent=2)}
+        {dumps_compact([b.model_dump() for b in benchmarks])}
         --- End Metrics & Benchmarks ---
 
         Provide the output in a JSON array of strings, with each string being an actionable insight.
         Do not include any preamble, just the JSON array.
-        """
+        """).build()
         ai_insights: List[str] = []
         try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            response = await self.gemini_client.generate_content(prompt, stage="traction_estimator.estimate")
             gemini_output_text = response.text.strip()
             if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
                 gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
@@ -112,13 +127,78 @@ class TractionEstimatorService:
             if not isinstance(ai_insights, list):
                 ai_insights = [str(ai_insights)]
         except Exception as e:
-            print(f"ERROR(Gemini): Traction estimator insights failed: {e}")
+            logger.error("Traction estimator insights failed: %s", e)
             ai_insights = ["Could not generate traction insights due to AI error."]
 
 
         return TractionEstimatorOutput(
             startup_name=input_data.startup_name,
-            growth_health_score=round(growth_health_score, 2),
+            growth_health_score=growth_health_score,
             benchmarks=benchmarks,
             ai_insights=ai_insights
-        )
\ No newline at end of file
+        )
+
+    async def _estimate_traction_chunk(self, chunk: List[TractionEstimatorInput]) -> List[Optional[TractionEstimatorOutput]]:
+        """
+        Generates insights for several startups with a single Gemini call. Benchmarks and
+        scores are computed locally as in estimate_traction. Items missing from or malformed
+        in the response come back as None.
+        """
+        computed = [self._compute_benchmarks(input_data) for input_data in chunk]
+        # Every profile is kept (truncated if needed): a dropped one would only fall back to a single call.
+        prompt = (
+            PromptBuilder("traction_insights_batch")
+            .add_text(f"""
+            Analyze the following growth metrics and benchmarks for {len(chunk)} startups independently.
+            For each startup, provide 3-5 actionable insights and tips for improving their traction based on these numbers.
+            If a metric is missing, suggest what insight it could provide.
+            """)
+            .add_items(
+                (
+                    f"--- Startup {index} ---\n"
+                    f"Name: {input_data.startup_name}\n"
+                    f"Industry: {input_data.your_industry}\n"
+                    f"Metrics & Benchmarks: {dumps_compact([b.model_dump() for b in benchmarks])}"
+                    for index, (input_data, (benchmarks, _)) in enumerate(zip(chunk, computed))
+                ),
+                min_items=len(chunk),
+            )
+            .add_text("""
+            Provide the output as a JSON array with exactly one object per startup: [{"index": <startup number>, "insights": ["...", "..."]}]
+            Do not include any preamble, just the JSON array.
+            """)
+            .build()
+        )
+
+        response = await self.gemini_client.generate_content(prompt, stage="traction_estimator.estimate_batch")
+        gemini_output_text = response.text.strip()
+        if gemini_output_text.startswith("```json") and gemini_output_text.endswith("```"):
+            gemini_output_text = gemini_output_text[len("```json"): -len("```")].strip()
+
+        gemini_results = parse_indexed_results(json.loads(gemini_output_text), len(chunk))
+        outputs: List[Optional[TractionEstimatorOutput]] = []
+        for index, (input_data, (benchmarks, growth_health_score)) in enumerate(zip(chunk, computed)):
+            ai_insights = gemini_results.get(index, {}).get("insights")
+            if not isinstance(ai_insights, list) or not ai_insights:
+                logger.warning("Packed traction insights missing for item %s (%s).", index, input_data.startup_name)
+                outputs.append(None)
+                continue
+            outputs.append(TractionEstimatorOutput(
+                startup_name=input_data.startup_name,
+                growth_health_score=growth_health_score,
+                benchmarks=benchmarks,
+                ai_insights=[str(insight) for insight in ai_insights]
+            ))
+        return outputs
+
+    async def estimate_traction_batch(self, items: List[TractionEstimatorInput]) -> List[TractionEstimatorOutput]:
+        return await cached_batch(
+            self.cache,
+            "traction_estimation",
+            TractionEstimatorOutput,
+            items,
+            compute_chunk=self._estimate_traction_chunk,
+            compute_single=self.estimate_traction,
+            chunk_size=settings.BATCH_ITEMS_PER_PROMPT,
+            max_parallel=settings.BATCH_MAX_PARALLEL_PROMPTS,
+        )
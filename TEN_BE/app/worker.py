@@ -0,0 +1,142 @@
+"""
+Job worker process. Consumes analysis jobs submitted through /api/v1/jobs and runs them
+with the same service classes as the API.
+
+Run with `python -m app.worker`; start more processes to scale out.
+"""
+from app.core.config import settings
+from app.core.redis import connect_redis, disconnect_redis
+from app.core.cache import init_cache, close_cache
+from app.core.cassette import init_cassette, close_cassette
+from app.core.gemini_client import init_gemini_model
+from app.core.search_client import init_search_client, close_search_client
+from app.core.jobs import JobQueue, init_job_queue, close_job_queue
+from app.core.container import init_container, close_container
+from app.core.logging import setup_logging, shutdown_logging, request_id_var
+from app.core.tracing import init_tracing, close_tracing, start_trace
+from app.services.job_registry import build_job_handlers
+from pydantic import ValidationError
+import asyncio
+import os
+import signal
+import socket
+from typing import Awaitable, Callable, Dict, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """
+    Runs up to `concurrency` jobs at a time from the queue, extending each job's lease
+    while it runs so long analyses are not handed to another worker.
+    """
+
+    def __init__(self, queue: JobQueue, handlers: Dict[str, Callable[[str], Awaitable[str]]], concurrency: int, consumer_name: str):
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.consumer_name = consumer_name
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def run(self, stop_event: asyncio.Event):
+        logger.info("Job worker %s started (concurrency: %s).", self.consumer_name, self.concurrency)
+        while not stop_event.is_set():
+            free_slots = self.concurrency - len(self._tasks)
+            if free_slots <= 0:
+                await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            try:
+                messages = await self.queue.claim(self.consumer_name, count=free_slots, block_ms=1000)
+            except Exception as e:
+                logger.error("Could not read from job queue: %s", e)
+                await asyncio.sleep(1)
+                continue
+            for message_id, job_id in messages:
+                task = asyncio.create_task(self._process(message_id, job_id))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        if self._tasks:
+            logger.info("Job worker %s draining %s running job(s)...", self.consumer_name, len(self._tasks))
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info("Job worker %s stopped.", self.consumer_name)
+
+    async def _keep_lease(self, message_id: str):
+        interval = max(self.queue.visibility_timeout / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.queue.extend_lease(self.consumer_name, message_id)
+            except Exception as e:
+                logger.error("Could not extend lease for %s: %s", message_id, e)
+
+    async def _process(self, message_id: str, job_id: str):
+        # Each job runs in its own task, so this only tags this job's log records.
+        request_id_var.set(job_id)
+        job = await self.queue.start(message_id, job_id)
+        if job is None:
+            return
+
+        handler = self.handlers.get(job["job_type"])
+        if handler is None:
+            await self.queue.fail(message_id, job_id, f"Unknown job type '{job['job_type']}'.", retry=False)
+            return
+
+        logger.debug("Running %s job %s (attempt %s).", job['job_type'], job_id, job['attempts'])
+        lease_task = asyncio.create_task(self._keep_lease(message_id))
+        try:
+            with start_trace(f"job {job['job_type']}", request_id=job_id, attempt=job['attempts']):
+                result = await handler(job["input"])
+            await self.queue.complete(message_id, job_id, result)
+            logger.debug("Completed %s job %s.", job['job_type'], job_id)
+        except ValidationError as e:
+            await self.queue.fail(message_id, job_id, f"Invalid job input: {e}", retry=False)
+        except Exception as e:
+            logger.error("%s job %s failed: %s", job['job_type'], job_id, e)
+            await self.queue.fail(message_id, job_id, str(e))
+        finally:
+            lease_task.cancel()
+
+
+async def main():
+    setup_logging()
+    await init_tracing()
+    await connect_redis()
+    await init_cache()
+    init_cassette()
+    init_gemini_model()
+    await init_search_client()
+    queue = await init_job_queue()
+    container = await init_container()
+    if queue is None or container is None:
+        await close_tracing()
+        shutdown_logging()
+        raise SystemExit("Job worker requires Redis and Gemini. Check REDIS_URL and GOOGLE_API_KEY.")
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    worker = JobWorker(
+        queue,
+        build_job_handlers(container),
+        concurrency=settings.JOB_WORKER_CONCURRENCY,
+        consumer_name=f"{socket.gethostname()}-{os.getpid()}",
+    )
+    try:
+        await worker.run(stop_event)
+    finally:
+        await close_container()
+        close_job_queue()
+        await close_search_client()
+        close_cassette()
+        await close_cache()
+        await disconnect_redis()
+        await close_tracing()
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
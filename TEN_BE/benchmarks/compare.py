@@ -0,0 +1,106 @@
+"""
+Compares two benchmark result files written by `benchmarks.run`:
+
+    python -m benchmarks.compare results/base.json results/head.json --threshold 0.1
+
+Prints the change in throughput and latency percentiles per endpoint and exits with
+status 1 when any endpoint regressed by more than the threshold.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# (label, path in the endpoint summary, True if higher is better)
+_COMPARED_FIELDS: Tuple[Tuple[str, Tuple[str, ...], bool], ...] = (
+    ("rps", ("throughput_rps",), True),
+    ("p50", ("latency_ms", "p50"), False),
+    ("p95", ("latency_ms", "p95"), False),
+    ("p99", ("latency_ms", "p99"), False),
+    ("errors", ("error_rate",), False),
+)
+
+# Config keys that make two runs incomparable when they differ.
+_CONFIG_KEYS = ("requests", "concurrency", "distinct_inputs", "batch_size", "redis", "gemini", "serpapi")
+
+
+def _lookup(summary: Dict[str, Any], path: Tuple[str, ...]) -> Optional[float]:
+    value: Any = summary
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def relative_change(base: Optional[float], head: Optional[float]) -> Optional[float]:
+    if base is None or head is None:
+        return None
+    if base == 0:
+        return 0.0 if head == 0 else float("inf")
+    return (head - base) / base
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any], threshold: float) -> Tuple[List[str], List[str]]:
+    """
+    Returns (report lines, regressions). An endpoint regresses when a field gets worse by
+    more than `threshold` (relative), or its error rate rises at all.
+    """
+    lines: List[str] = []
+    regressions: List[str] = []
+
+    for key in _CONFIG_KEYS:
+        if base["config"].get(key) != head["config"].get(key):
+            lines.append(f"warning: config '{key}' differs: {base['config'].get(key)} -> {head['config'].get(key)}")
+
+    header = f"{'endpoint':<48}" + "".join(f" {label:>25}" for label, _, _ in _COMPARED_FIELDS)
+    lines.append(header)
+    for name in sorted(set(base["endpoints"]) | set(head["endpoints"])):
+        base_summary = base["endpoints"].get(name)
+        head_summary = head["endpoints"].get(name)
+        if base_summary is None or head_summary is None:
+            lines.append(f"{name:<48} only in {'head' if base_summary is None else 'base'}")
+            continue
+
+        cells = []
+        for label, path, higher_is_better in _COMPARED_FIELDS:
+            old, new = _lookup(base_summary, path), _lookup(head_summary, path)
+            change = relative_change(old, new)
+            if change is None:
+                cells.append(f" {'n/a':>25}")
+                continue
+            worse = -change if higher_is_better else change
+            regressed = new > old if label == "errors" else worse > threshold
+            if regressed:
+                regressions.append(f"{name} {label}: {old} -> {new}")
+            cell = f"{old:g} -> {new:g} ({change:+.0%}){'!' if regressed else ''}"
+            cells.append(f" {cell:>25}")
+        lines.append(f"{name:<48}" + "".join(cells))
+    return lines, regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("base", help="Result file of the baseline run.")
+    parser.add_argument("head", help="Result file of the run to check.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown counted as a regression (default 0.10).")
+    args = parser.parse_args(argv)
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    print(f"base: {base['git'].get('commit')} ({base['timestamp']})")
+    print(f"head: {head['git'].get('commit')} ({head['timestamp']})")
+    lines, regressions = compare(base, head, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+        print("\n".join(f"  {regression}" for regression in regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+Local stand-ins for the upstream services used by the load tests: a Gemini model object
+that answers every prompt of the app with schema-valid JSON, a SerpAPI-compatible HTTP
+server and in-memory Redis clients. Latency and failures are drawn from configurable
+distributions so runs are repeatable for a given seed.
+"""
+from aiohttp import web
+import asyncio
+import json
+import math
+import random
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyDistribution:
+    """
+    Log-normal latency around a median, the usual shape of remote API latencies:
+    `sigma` 0 gives a constant latency, 0.5 a moderate tail, 1.0 a heavy one.
+    """
+
+    def __init__(self, median_ms: float, sigma: float = 0.0, rng: Optional[random.Random] = None):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.rng = rng or random.Random()
+
+    def sample(self) -> float:
+        """
+        Returns one latency in seconds.
+        """
+        if self.median_ms <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return self.median_ms / 1000
+        return self.median_ms * math.exp(self.rng.gauss(0.0, self.sigma)) / 1000
+
+    def describe(self) -> Dict[str, float]:
+        return {"median_ms": self.median_ms, "sigma": self.sigma}
+
+
+class FakeUpstreamError(RuntimeError):
+    """
+    Raised by the fake Gemini model for injected failures.
+    """
+
+
+_STARTUP_MARKER_RE = re.compile(r"--- Startup (\d+) ---")
+_COMPETITOR_MARKER_RE = re.compile(r"^Competitor: (.+)$", re.MULTILINE)
+_CANDIDATE_RE = re.compile(r'\["([^"]+)",')
+
+
+def _risk_output(startup_name: str) -> Dict[str, Any]:
+    return {
+        "startup_name": startup_name,
+        "overall_risk_score": 42.0,
+        "risk_factors": [
+            {"name": "Market Competition", "level": "medium", "mitigation_suggestion": "Differentiate on workflow integrations."},
+            {"name": "Runway", "level": "high", "mitigation_suggestion": "Raise a bridge round or cut burn."},
+        ],
+        "recommendations": ["Validate pricing with design partners.", "Extend runway to 18 months."],
+    }
+
+
+def _competitor_info(name: str) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "product_description": f"{name} sells workflow software.",
+        "value_proposition": "Faster onboarding.",
+        "target_market": "Mid-market teams",
+        "funding_rounds": ["Series A: $12M"],
+        "press_mentions_summary": [f"{name} launches a new product line."],
+        "hiring_surge_indication": "Medium",
+        "overall_summary": f"{name} is expanding its sales team.",
+    }
+
+
+def _investor_match(index: int) -> Dict[str, Any]:
+    return {
+        "investor": {
+            "id": f"bench_fund_{index}",
+            "name": f"Bench Fund {index}",
+            "link": f"https://benchfund{index}.vc",
+            "risk_tolerance": "high",
+            "preferred_industries": ["SaaS", "AI"],
+            "min_investment_usd": 250000,
+            "max_investment_usd": 3000000,
+            "feedback_focus": ["Traction", "Team"],
+        },
+        "match_score": 90 - index * 10,
+        "match_reasons": ["Invests at this stage."],
+        "gaps": ["Prefers more revenue."],
+    }
+
+
+def gemini_response(prompt: str) -> str:
+    """
+    Returns JSON text shaped like Gemini's answer to the given prompt. Prompts are recognized
+    by phrases from the services' prompt templates; unrecognized prompts get `{}`.
+    """
+    if "startup profiles independently" in prompt:
+        count = len(_STARTUP_MARKER_RE.findall(prompt))
+        return json.dumps([{"index": i, **_risk_output(f"Startup {i}")} for i in range(count)])
+    if "startups independently" in prompt:
+        count = len(_STARTUP_MARKER_RE.findall(prompt))
+        return json.dumps([{"index": i, "insights": ["Lower CAC through referrals.", "Reduce churn with onboarding."]} for i in range(count)])
+    if "overall risk score" in prompt:
+        return json.dumps(_risk_output("Startup"))
+    if "JSON array of strings: [\"query1\"" in prompt:
+        return json.dumps(["seed stage saas venture capital", "early stage b2b angel investors", "saas series a funds"])
+    if "identify the 3 MOST RELEVANT" in prompt:
+        return json.dumps([_investor_match(i) for i in range(3)])
+    if "select up to 5 actual" in prompt:
+        return json.dumps(_CANDIDATE_RE.findall(prompt)[:5])
+    if "Synthesize 3-5 key emerging" in prompt:
+        return json.dumps(["Consolidation of point tools.", "AI copilots in every workflow.", "Usage-based pricing."])
+    if "competitors in the" in prompt:
+        return json.dumps([_competitor_info(name.strip()) for name in _COMPETITOR_MARKER_RE.findall(prompt)])
+    if "competitor named" in prompt:
+        name = re.search(r"competitor named '([^']*)'", prompt)
+        return json.dumps(_competitor_info(name.group(1) if name else "Competitor"))
+    if "JSON array of strings, with each string being an actionable insight" in prompt:
+        return json.dumps(["Lower CAC through referrals.", "Reduce churn with onboarding.", "Track activation weekly."])
+    if "overall_sentiment_score" in prompt:
+        return json.dumps({
+            "overall_sentiment_score": 0.4,
+            "positive_themes": ["product quality"],
+            "negative_themes": ["pricing"],
+            "neutral_themes": ["hiring"],
+            "actionable_insights": ["Publish customer stories."],
+            "overall_reputation_review": "Generally positive early perception.",
+        })
+    if "AI startup advisor" in prompt:
+        return json.dumps({
+            "feedback": ["Clear problem statement.", "Market size is credible."],
+            "suggestions_for_improvement": ["Quantify traction.", "Name the competition."],
+        })
+    if "AI content strategist" in prompt:
+        return json.dumps({
+            "suggestions": [
+                {"platform": platform, "title": "We just launched", "content_points": ["Why we built it.", "What is next."],
+                 "hashtags": ["#startup", "#launch"], "call_to_action": "Join the beta."}
+                for platform in ("Twitter Thread", "LinkedIn Post", "Blog Post Idea")
+            ],
+            "ai_tips": ["Post consistently.", "Engage with replies.", "Share metrics."],
+        })
+    if "AI legal assistant" in prompt:
+        return json.dumps({
+            "essential_documents": [{"name": "Founders' Agreement", "description": "Equity and roles.", "relevance_reason": "Multiple founders."}],
+            "industry_licenses_certs": [{"name": "SOC 2", "description": "Security controls audit.", "relevance_reason": "Handles customer data."}],
+            "key_legal_risks": [{"name": "Data Breach", "description": "Leak of personal data.", "prevention_strategy": "Encrypt data at rest."}],
+            "general_legal_advice": ["Assign IP to the company.", "Use standard SAFE documents."],
+        })
+    if "AI strategic advisor" in prompt:
+        return json.dumps({
+            "relevant_exit_strategies": [{
+                "strategy_name": "Acquisition by Strategic Buyer",
+                "description": "Sale to a larger company in the space.",
+                "common_acquirer_types": ["Strategic Buyer"],
+                "attractiveness_metrics": ["Net revenue retention"],
+                "action_items": ["Build partner integrations."],
+            }],
+            "strategic_planning_tips": ["Keep clean books.", "Track cohort metrics."],
+        })
+    if "AI talent advisor" in prompt:
+        return json.dumps({
+            "recommended_roles": [{
+                "role_name": "Head of Sales",
+                "ideal_candidate_profile": "Has sold to mid-market before.",
+                "interview_questions": ["How did you build your last pipeline?"],
+            }],
+            "team_building_tips": ["Hire for ownership.", "Write down your values early."],
+        })
+    return "{}"
+
+
+class _FakeResponse:
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeStream:
+    """
+    Async iterator over response chunks, like the `stream=True` result of the real model.
+    """
+
+    def __init__(self, text: str, chunk_chars: int, chunk_interval: float):
+        self.chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or [""]
+        self.chunk_interval = chunk_interval
+
+    async def __aiter__(self) -> AsyncIterator[_FakeResponse]:
+        for index, chunk in enumerate(self.chunks):
+            if index and self.chunk_interval:
+                await asyncio.sleep(self.chunk_interval)
+            yield _FakeResponse(chunk)
+
+
+class FakeGeminiModel:
+    """
+    Drop-in for `genai.GenerativeModel` as used by GeminiClient. Each call sleeps for a
+    sampled latency (the time to the first chunk when streaming) and fails with
+    probability `error_rate`.
+    """
+
+    def __init__(self, latency: LatencyDistribution, error_rate: float = 0.0, rng: Optional[random.Random] = None,
+                 stream_chunk_chars: int = 64, stream_chunk_interval_ms: float = 20.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = rng or random.Random()
+        self.stream_chunk_chars = stream_chunk_chars
+        self.stream_chunk_interval = stream_chunk_interval_ms / 1000
+        self.calls = 0
+        self.failures = 0
+
+    async def generate_content_async(self, prompt: str, stream: bool = False, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency.sample())
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.failures += 1
+            raise FakeUpstreamError("Injected Gemini failure.")
+        text = gemini_response(prompt)
+        if stream:
+            return _FakeStream(text, self.stream_chunk_chars, self.stream_chunk_interval)
+        return _FakeResponse(text)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "failures": self.failures}
+
+
+def _organic_results(query: str) -> List[Dict[str, str]]:
+    if "twitter.com" in query or "x.com" in query:
+        return [
+            {"title": "Post on X", "link": "https://twitter.com/bench/status/1", "snippet": f"Loving the new release from {query[:40]}"},
+            {"title": "Post on X", "link": "https://x.com/bench/status/2", "snippet": "Pricing is a bit steep but the product is solid."},
+        ]
+    return [
+        {"title": "Northwind Capital - Seed investors", "link": "https://northwind.vc", "snippet": "Northwind Capital is a seed fund for SaaS startups."},
+        {"title": "Contoso Ventures | Early stage VC", "link": "https://contoso.io", "snippet": "Contoso Ventures invests in B2B software; investor in 40 companies."},
+        {"title": "Fabrikam - Workflow automation", "link": "https://fabrikam.com", "snippet": "Fabrikam automates approvals for finance teams."},
+        {"title": "Tailspin - Team analytics", "link": "https://tailspin.co", "snippet": "Tailspin builds analytics for growing teams."},
+        {"title": "Adatum Angels | Angel network", "link": "https://adatum.tech", "snippet": "Angel investor network backing early founders."},
+    ]
+
+
+def _news_results(query: str) -> List[Dict[str, str]]:
+    return [
+        {"title": f"{query[:40]} raises Series A", "link": "https://news.example.com/a", "snippet": f"{query[:40]} raised $12M to expand.", "source": "Example News", "date": "2 days ago"},
+        {"title": f"{query[:40]} is hiring", "link": "https://news.example.com/b", "snippet": "The company plans to double its team.", "source": "Example News", "date": "1 week ago"},
+    ]
+
+
+def serpapi_response(params: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Returns a response shaped like SerpAPI's JSON for the given query parameters.
+    """
+    query = params.get("q", "")
+    if params.get("tbm") == "nws":
+        return {"search_metadata": {"status": "Success"}, "news_results": _news_results(query)}
+    return {"search_metadata": {"status": "Success"}, "organic_results": _organic_results(query)}
+
+
+class FakeSerpAPIServer:
+    """
+    SerpAPI-compatible HTTP endpoint on localhost. Injected failures answer 503 with an
+    error body, which SearchClient retries like a real SerpAPI outage.
+    """
+
+    def __init__(self, latency: LatencyDistribution, error_rate: float = 0.0, rng: Optional[random.Random] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = rng or random.Random()
+        self.requests = 0
+        self.failures = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency.sample())
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.failures += 1
+            return web.json_response({"error": "Injected SerpAPI failure."}, status=503)
+        return web.json_response(serpapi_response(dict(request.query)))
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/search", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}/search"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "failures": self.failures}
+
+
+def fake_redis_clients() -> Tuple[Any, Any]:
+    """
+    Returns (text client, binary client) backed by one in-memory fakeredis server, matching
+    the two clients app.core.redis keeps for the same Redis database.
+    """
+    try:
+        import fakeredis
+    except ImportError as e:
+        raise RuntimeError("fakeredis is required without --redis-url: pip install -r benchmarks/requirements.txt") from e
+    server = fakeredis.FakeServer()
+    return (
+        fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+        fakeredis.aioredis.FakeRedis(server=server, decode_responses=False),
+    )
@@ -0,0 +1,200 @@
+"""
+Request bodies for every routed endpoint. Each builder takes a variant number that is
+worked into the startup name, so the number of distinct variants controls the cache hit
+rate of a run.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+_PITCH = (
+    "We help finance teams at mid-market companies close their books in days instead of weeks. "
+    "Our platform connects to existing ERPs, reconciles transactions automatically and flags anomalies "
+    "for review. Twelve paying customers after a six-month pilot program."
+)
+_PRODUCT = "Automated month-end close software for mid-market finance teams"
+
+
+def risk_input(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "industry": "FinTech",
+        "specific_product_service": _PRODUCT,
+        "market_size_usd": 5_000_000_000,
+        "founder_experience_years": 8,
+        "initial_funding_needed_usd": 1_500_000,
+        "has_mvp": True,
+        "mvp_stage_description": "Core features live, 12 paying customers",
+        "burn_rate_usd_per_month": 60_000,
+        "runway_months": 14,
+        "num_direct_competitors": 6,
+        "competitive_advantage": "Native ERP integrations and anomaly detection",
+    }
+
+
+def risk_output(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "overall_risk_score": 42.0,
+        "risk_factors": [{"name": "Runway", "level": "high", "mitigation_suggestion": "Raise a bridge round."}],
+        "recommendations": ["Extend runway."],
+    }
+
+
+def reputation_input(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "founder_twitter_handle": "benchledger",
+        "initial_pitch_text": _PITCH,
+    }
+
+
+def reputation_output(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "overall_sentiment_score": 0.4,
+        "positive_themes": ["automation"],
+        "negative_themes": ["pricing"],
+        "neutral_themes": [],
+        "actionable_insights": ["Publish customer stories."],
+        "overall_reputation_review": "Generally positive.",
+    }
+
+
+def investor_match_input(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "industry": "FinTech",
+        "funding_sought_usd": 1_500_000,
+        "risk_profile": risk_output(variant),
+        "reputation_profile": reputation_output(variant),
+    }
+
+
+def pitch_feedback_input(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "pitch_text": _PITCH,
+        "risk_profile": risk_output(variant),
+    }
+
+
+def competitor_radar_input(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "your_industry": "FinTech",
+        "your_product_service_description": _PRODUCT,
+    }
+
+
+def traction_input(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "your_industry": "SaaS",
+        "monthly_active_users": 1200 + variant,
+        "monthly_recurring_revenue_usd": 18_000.0,
+        "customer_acquisition_cost_usd": 900.0,
+        "customer_lifetime_value_usd": 5400.0,
+        "churn_rate_percent": 3.5,
+        "conversion_rate_percent": 2.1,
+    }
+
+
+def buzz_input(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "your_industry": "FinTech",
+        "current_milestones": ["Launched MVP", "12 paying customers"],
+        "key_message": "Close your books in days, not weeks.",
+        "target_audience": "mid-market CFOs",
+    }
+
+
+def legal_input(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "industry": "FinTech",
+        "business_model_summary": "Subscription software that automates month-end close for finance teams.",
+        "funding_stage": "seed",
+        "num_founders": 2,
+        "num_employees": 6,
+        "handles_personal_data": True,
+        "sells_physical_products": False,
+    }
+
+
+def exit_strategy_input(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "industry": "FinTech",
+        "business_model_summary": "Subscription software that automates month-end close for finance teams.",
+        "funding_stage": "seed",
+        "current_revenue_usd": 216_000.0,
+        "monthly_active_users": 1200,
+        "founder_exit_goals": "maximize valuation",
+    }
+
+
+def talent_input(variant: int) -> Dict[str, Any]:
+    return {
+        "startup_name": f"Bench Ledger {variant}",
+        "your_industry": "FinTech",
+        "funding_stage": "seed",
+        "current_team_size": 8,
+        "key_challenge": "We need to build a repeatable sales motion for mid-market accounts.",
+    }
+
+
+def navigator_input(variant: int) -> Dict[str, Any]:
+    return {
+        "risk": risk_input(variant),
+        "pitch_text": _PITCH,
+        "founder_twitter_handle": "benchledger",
+    }
+
+
+def batch_of(builder: Callable[[int], Dict[str, Any]], size: int) -> Callable[[int], Dict[str, Any]]:
+    """
+    Builds a batch body of `size` items; a variant's items are distinct from other variants'.
+    """
+    def build(variant: int) -> Dict[str, Any]:
+        return {"items": [builder(variant * size + index) for index in range(size)]}
+    return build
+
+
+class Endpoint(NamedTuple):
+    name: str
+    method: str
+    path: str
+    body: Optional[Callable[[int], Dict[str, Any]]] = None
+    stream: bool = False
+
+
+def build_endpoints(batch_size: int) -> List[Endpoint]:
+    """
+    Every routed endpoint of the app. `GET /api/v1/jobs/{job_id}` polls a job submitted by
+    the runner; the job events stream is left out because it waits for a worker.
+    """
+    return [
+        Endpoint("GET /", "GET", "/"),
+        Endpoint("POST /api/v1/analyze-risk", "POST", "/api/v1/analyze-risk", risk_input),
+        Endpoint("POST /api/v1/analyze-risk/batch", "POST", "/api/v1/analyze-risk/batch", batch_of(risk_input, batch_size)),
+        Endpoint("POST /api/v1/scan-reputation", "POST", "/api/v1/scan-reputation", reputation_input),
+        Endpoint("POST /api/v1/match-investors", "POST", "/api/v1/match-investors", investor_match_input),
+        Endpoint("POST /api/v1/pitch-feedback", "POST", "/api/v1/pitch-feedback", pitch_feedback_input),
+        Endpoint("POST /api/v1/competitor-radar", "POST", "/api/v1/competitor-radar", competitor_radar_input),
+        Endpoint("POST /api/v1/competitor-radar/stream", "POST", "/api/v1/competitor-radar/stream", competitor_radar_input, stream=True),
+        Endpoint("POST /api/v1/traction-estimator", "POST", "/api/v1/traction-estimator", traction_input),
+        Endpoint("POST /api/v1/traction-estimator/batch", "POST", "/api/v1/traction-estimator/batch", batch_of(traction_input, batch_size)),
+        Endpoint("POST /api/v1/buzz-builder", "POST", "/api/v1/buzz-builder", buzz_input),
+        Endpoint("POST /api/v1/buzz-builder/stream", "POST", "/api/v1/buzz-builder/stream", buzz_input, stream=True),
+        Endpoint("POST /api/v1/legal-assistance", "POST", "/api/v1/legal-assistance", legal_input),
+        Endpoint("POST /api/v1/legal-assistance/stream", "POST", "/api/v1/legal-assistance/stream", legal_input, stream=True),
+        Endpoint("POST /api/v1/exit-strategy-explorer", "POST", "/api/v1/exit-strategy-explorer", exit_strategy_input),
+        Endpoint("POST /api/v1/exit-strategy-explorer/stream", "POST", "/api/v1/exit-strategy-explorer/stream", exit_strategy_input, stream=True),
+        Endpoint("POST /api/v1/talent-navigator", "POST", "/api/v1/talent-navigator", talent_input),
+        Endpoint("POST /api/v1/talent-navigator/stream", "POST", "/api/v1/talent-navigator/stream", talent_input, stream=True),
+        Endpoint("POST /api/v1/navigator", "POST", "/api/v1/navigator", navigator_input),
+        Endpoint("POST /api/v1/navigator/stream", "POST", "/api/v1/navigator/stream", navigator_input, stream=True),
+        Endpoint("POST /api/v1/jobs/{job_type}", "POST", "/api/v1/jobs/analyze-risk", risk_input),
+        Endpoint("GET /api/v1/jobs/{job_id}", "GET", "/api/v1/jobs/{job_id}"),
+        Endpoint("GET /api/v1/admin/traces", "GET", "/api/v1/admin/traces?limit=20"),
+    ]
@@ -0,0 +1,326 @@
+"""
+Load test for the API against local stand-ins for Gemini, SerpAPI and Redis.
+
+Boots the real application (lifespan, middlewares, services) in-process under uvicorn,
+drives each endpoint in turn at a fixed concurrency and writes per-endpoint throughput
+and latency percentiles as JSON:
+
+    python -m benchmarks.run --requests 200 --concurrency 20 --gemini-latency-ms 800
+
+Compare two result files with `python -m benchmarks.compare old.json new.json`.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_API_KEY = "benchmark-key"
+RESULT_FORMAT_VERSION = 1
+DEFAULT_RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load-test every API endpoint against fake upstreams.")
+    parser.add_argument("--requests", type=int, default=100, help="Requests sent to each endpoint.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight per endpoint.")
+    parser.add_argument("--warmup", type=int, default=0, help="Unrecorded requests sent to each endpoint first.")
+    parser.add_argument("--endpoints", default=None, help="Comma-separated substrings; only matching endpoint names run.")
+    parser.add_argument("--distinct-inputs", type=int, default=50, help="Distinct request bodies per endpoint. Lower values mean more cache hits.")
+    parser.add_argument("--batch-size", type=int, default=10, help="Items per request on the batch endpoints.")
+    parser.add_argument("--gemini-latency-ms", type=float, default=500.0, help="Median fake Gemini latency (time to first chunk when streaming).")
+    parser.add_argument("--gemini-latency-sigma", type=float, default=0.4, help="Log-normal sigma of the Gemini latency; 0 for constant.")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="Fraction of Gemini calls that fail.")
+    parser.add_argument("--gemini-chunk-interval-ms", type=float, default=20.0, help="Delay between streamed Gemini chunks.")
+    parser.add_argument("--search-latency-ms", type=float, default=300.0, help="Median fake SerpAPI latency.")
+    parser.add_argument("--search-latency-sigma", type=float, default=0.4, help="Log-normal sigma of the SerpAPI latency; 0 for constant.")
+    parser.add_argument("--search-error-rate", type=float, default=0.0, help="Fraction of SerpAPI requests answered with 503.")
+    parser.add_argument("--redis-url", default=None, help="Use this Redis server instead of an in-memory fake. It should be a scratch database.")
+    parser.add_argument("--request-timeout", type=float, default=120.0, help="Client timeout per request in seconds.")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for latencies, injected failures and input selection.")
+    parser.add_argument("--label", default=None, help="Free-form label stored with the results.")
+    parser.add_argument("--output", default=None, help=f"Result file. Defaults to {DEFAULT_RESULTS_DIR.name}/<timestamp>-<commit>.json.")
+    parser.add_argument("--no-metrics", action="store_true", help="Do not store a /metrics snapshot with the results.")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace):
+    """
+    Sets the settings the run needs before the app reads them at import time. Values
+    already in the environment win, except the API keys.
+    """
+    os.environ["API_KEY"] = BENCHMARK_API_KEY
+    os.environ["ADMIN_API_KEYS"] = json.dumps([BENCHMARK_API_KEY])
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+    os.environ.setdefault("SERPAPI_API_KEY", "benchmark")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if args.redis_url:
+        os.environ["REDIS_URL"] = args.redis_url
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an ascending list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+def summarize(latencies: List[float], first_byte: List[float], statuses: Counter, elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    first_byte = sorted(first_byte)
+    total = sum(statuses.values())
+    succeeded = sum(count for status, count in statuses.items() if isinstance(status, int) and status < 400)
+    return {
+        "requests": total,
+        "succeeded": succeeded,
+        "error_rate": round((total - succeeded) / total, 4) if total else 0.0,
+        "statuses": {str(status): count for status, count in sorted(statuses.items(), key=lambda item: str(item[0]))},
+        "duration_seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "mean": _ms(sum(latencies) / len(latencies)) if latencies else None,
+            "p50": _ms(percentile(latencies, 0.50)),
+            "p95": _ms(percentile(latencies, 0.95)),
+            "p99": _ms(percentile(latencies, 0.99)),
+            "max": _ms(latencies[-1]) if latencies else None,
+        },
+        "first_byte_ms": {
+            "p50": _ms(percentile(first_byte, 0.50)),
+            "p95": _ms(percentile(first_byte, 0.95)),
+        },
+    }
+
+
+async def _timed_request(session, base_url: str, endpoint, body: Optional[Dict[str, Any]], path: str) -> Tuple[Any, float, Optional[float]]:
+    """
+    Sends one request and reads the whole body. Returns (status or exception name,
+    seconds until the last byte, seconds until the first body byte).
+    """
+    import aiohttp
+
+    started_at = time.perf_counter()
+    first_byte_at = None
+    try:
+        async with session.request(endpoint.method, base_url + path, json=body) as response:
+            async for _ in response.content.iter_any():
+                if first_byte_at is None:
+                    first_byte_at = time.perf_counter()
+            status: Any = response.status
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        status = type(e).__name__
+    finished_at = time.perf_counter()
+    return status, finished_at - started_at, (first_byte_at - started_at) if first_byte_at else None
+
+
+async def run_endpoint(session, base_url: str, endpoint, args: argparse.Namespace, job_id: Optional[str], rng: random.Random) -> Dict[str, Any]:
+    """
+    Sends `args.requests` requests to one endpoint with `args.concurrency` in flight.
+    """
+    path = endpoint.path.replace("{job_id}", job_id or "missing")
+
+    def next_body() -> Optional[Dict[str, Any]]:
+        return endpoint.body(rng.randrange(args.distinct_inputs)) if endpoint.body else None
+
+    for _ in range(args.warmup):
+        await _timed_request(session, base_url, endpoint, next_body(), path)
+
+    latencies: List[float] = []
+    first_byte: List[float] = []
+    statuses: Counter = Counter()
+    remaining = args.requests
+
+    async def client():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            status, latency, ttfb = await _timed_request(session, base_url, endpoint, next_body(), path)
+            statuses[status] += 1
+            latencies.append(latency)
+            if ttfb is not None:
+                first_byte.append(ttfb)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(min(args.concurrency, args.requests))))
+    return summarize(latencies, first_byte, statuses, time.perf_counter() - started_at)
+
+
+def git_revision() -> Dict[str, Any]:
+    repo_dir = Path(__file__).resolve().parent.parent
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo_dir, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repo_dir, capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import aiohttp
+    import uvicorn
+    from benchmarks.fakes import FakeGeminiModel, FakeSerpAPIServer, LatencyDistribution, fake_redis_clients
+    from benchmarks.payloads import build_endpoints, risk_input
+    from app.main import app as fastapi_app
+    from app.core.config import settings
+    from app.core.cassette import init_cassette
+    from app.core.gemini_client import GeminiClient
+    from app.core.search_client import SearchClient
+    from app.core.metrics import render_metrics
+    import app.core.redis as redis_module
+    import app.core.gemini_client as gemini_module
+    import app.core.search_client as search_module
+
+    rng = random.Random(args.seed)
+    gemini_model = FakeGeminiModel(
+        LatencyDistribution(args.gemini_latency_ms, args.gemini_latency_sigma, random.Random(rng.random())),
+        error_rate=args.gemini_error_rate,
+        rng=random.Random(rng.random()),
+        stream_chunk_interval_ms=args.gemini_chunk_interval_ms,
+    )
+    serpapi = FakeSerpAPIServer(
+        LatencyDistribution(args.search_latency_ms, args.search_latency_sigma, random.Random(rng.random())),
+        error_rate=args.search_error_rate,
+        rng=random.Random(rng.random()),
+    )
+    serpapi_url = await serpapi.start()
+
+    # The app's init_* functions skip clients that already exist, so the lifespan below
+    # runs unchanged on top of the fakes.
+    if not args.redis_url:
+        redis_module._redis_client, redis_module._redis_binary_client = fake_redis_clients()
+    # CASSETTE_MODE=record/replay applies to the fakes as it would to the real upstreams.
+    cassette = init_cassette()
+    gemini_module._gemini_model = gemini_model
+    gemini_module._gemini_client = GeminiClient(gemini_model, settings.GEMINI_MAX_CONCURRENCY, settings.GEMINI_CALL_TIMEOUT_SECONDS, cassette=cassette)
+    search_client = SearchClient(
+        api_key=settings.SERPAPI_API_KEY,
+        pool_size=settings.SEARCH_POOL_SIZE,
+        timeout_seconds=settings.SEARCH_TIMEOUT_SECONDS,
+        max_retries=settings.SEARCH_MAX_RETRIES,
+        retry_backoff_seconds=settings.SEARCH_RETRY_BACKOFF_SECONDS,
+        dns_cache_ttl_seconds=settings.SEARCH_DNS_CACHE_TTL_SECONDS,
+        base_url=serpapi_url,
+        cassette=cassette,
+    )
+    await search_client.start()
+    search_module._search_client = search_client
+
+    endpoints = build_endpoints(args.batch_size)
+    if args.endpoints:
+        patterns = [pattern.strip() for pattern in args.endpoints.split(",") if pattern.strip()]
+        endpoints = [endpoint for endpoint in endpoints if any(pattern in endpoint.name for pattern in patterns)]
+
+    results: Dict[str, Any] = {}
+    metrics_text = None
+    # Port 0 picks a free port; the lifespan runs below, around the server.
+    server = uvicorn.Server(uvicorn.Config(fastapi_app, host="127.0.0.1", port=0, lifespan="off", log_level="warning", access_log=False))
+
+    try:
+        async with fastapi_app.router.lifespan_context(fastapi_app):
+            server_task = asyncio.create_task(server.serve())
+            while not server.started:
+                if server_task.done():
+                    server_task.result()
+                await asyncio.sleep(0.01)
+            base_url = f"http://127.0.0.1:{server.servers[0].sockets[0].getsockname()[1]}"
+
+            connector = aiohttp.TCPConnector(limit=0)
+            timeout = aiohttp.ClientTimeout(total=args.request_timeout)
+            headers = {"X-API-Key": BENCHMARK_API_KEY}
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+                job_id = None
+                async with session.post(f"{base_url}/api/v1/jobs/analyze-risk", json=risk_input(0)) as response:
+                    if response.status == 202:
+                        job_id = (await response.json())["job_id"]
+                    else:
+                        logger.warning("Could not submit the job polled by the jobs status benchmark: HTTP %s", response.status)
+
+                for endpoint in endpoints:
+                    gemini_calls, search_requests = gemini_model.calls, serpapi.requests
+                    summary = await run_endpoint(session, base_url, endpoint, args, job_id, random.Random(rng.random()))
+                    summary["stream"] = endpoint.stream
+                    summary["upstream_calls"] = {
+                        "gemini": gemini_model.calls - gemini_calls,
+                        "serpapi": serpapi.requests - search_requests,
+                    }
+                    results[endpoint.name] = summary
+                    print(_format_row(endpoint.name, summary), file=sys.stderr, flush=True)
+
+            if not args.no_metrics:
+                metrics_text = render_metrics()
+            server.should_exit = True
+            await server_task
+    finally:
+        await serpapi.stop()
+
+    return {
+        "format_version": RESULT_FORMAT_VERSION,
+        "label": args.label,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "distinct_inputs": args.distinct_inputs,
+            "batch_size": args.batch_size,
+            "seed": args.seed,
+            "redis": "server" if args.redis_url else "fakeredis",
+            "gemini": {**gemini_model.latency.describe(), "error_rate": args.gemini_error_rate, "chunk_interval_ms": args.gemini_chunk_interval_ms},
+            "serpapi": {**serpapi.latency.describe(), "error_rate": args.search_error_rate},
+        },
+        "upstream": {"gemini": gemini_model.stats(), "serpapi": serpapi.stats()},
+        "endpoints": results,
+        "metrics": metrics_text,
+    }
+
+
+def _format_row(name: str, summary: Dict[str, Any]) -> str:
+    latency = summary["latency_ms"]
+    return (
+        f"{name:<48} {summary['throughput_rps'] or 0:>8.1f} rps  "
+        f"p50 {latency['p50'] or 0:>9.1f}  p95 {latency['p95'] or 0:>9.1f}  p99 {latency['p99'] or 0:>9.1f} ms  "
+        f"errors {summary['error_rate']:.1%}"
+    )
+
+
+def default_output_path(report: Dict[str, Any]) -> Path:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    commit = (report["git"]["commit"] or "unknown")[:10]
+    return DEFAULT_RESULTS_DIR / f"{stamp}-{commit}.json"
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    configure_environment(args)
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    report = asyncio.run(run(args))
+    output = Path(args.output) if args.output else default_output_path(report)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()